@@ -10,60 +10,115 @@ from xlviews.config import rcParams
 from xlviews.style import set_font_api
 from xlviews.utils import suspend_screen_updates
 
+from .occupancy import get_occupancy
 from .series import Series
 from .style import (
     get_axis_label,
     get_axis_scale,
+    get_line_formats,
     get_ticks,
     set_area_format,
     set_axis_label,
     set_axis_scale,
     set_dimensions,
+    set_line_format,
     set_tick_labels,
     set_ticks,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
     from xlwings import Chart, Sheet
 
+    from .occupancy import Occupancy
+
 
 def chart_position(
     sheet: Sheet,
     left: float | None,
     top: float | None,
+    occ: Occupancy | None = None,
 ) -> tuple[float, float]:
-    """Return the position of the chart."""
+    """Return the position of the chart.
+
+    The positions of the existing charts are looked up in the occupancy
+    of the sheet, without iterating over the charts through COM. The
+    occupancy is got from the sheet if None.
+    """
     if left and left > 0 and top and top > 0:
         return left, top
 
-    if not sheet.charts:
+    if occ is None:
+        occ = get_occupancy(sheet)
+
+    if not occ:
         return left or rcParams["chart.left"], top or rcParams["chart.top"]
 
     if left == 0:
-        for chart in sheet.charts:
-            left = chart.left if left == 0 else min(left, chart.left)
         if top and top > 0:
-            return left, top
-        top = 0
-        for chart in sheet.charts:
-            top = max(top, chart.top + chart.height)
-        return left, top
+            return occ.left, top
+        return occ.left, occ.bottom
 
     if top == 0:
-        for chart in sheet.charts:
-            top = chart.top if top == 0 else min(top, chart.top)
         if left and left > 0:
-            return left, top
-        left = 0
-        for chart in sheet.charts:
-            left = max(left, chart.left + chart.width)
-        return left, top
+            return left, occ.top
+        return occ.right, occ.top
 
-    chart = sheet.charts[-1]
     if left is None and top is None:
-        return chart.left + chart.width, chart.top
+        return occ.next_right()
+
+    return occ.next_below()
+
+
+_legend_metrics: dict[int, dict[tuple[Any, ...], tuple[float, float]]] = {}
+
+MAX_LEGEND_METRICS = 256
+
+
+def get_legend_metrics(legend: Any, key: tuple[Any, ...]) -> tuple[float, float]:
+    """Return the maximum width and the total height of the legend entries.
+
+    The metrics are cached by the key of the font, the legend size, and
+    the entries, once per version of `rcParams`. The cache is cleared when it holds
+    `MAX_LEGEND_METRICS` keys.
+    """
+    version = rcParams.version
+
+    if (cache := _legend_metrics.get(version)) is None:
+        _legend_metrics.clear()
+        cache = _legend_metrics[version] = {}
+
+    if (metrics := cache.get(key)) is not None:
+        return metrics
+
+    if len(cache) >= MAX_LEGEND_METRICS:
+        cache.clear()
+
+    widths, heights = [0], [0]
+
+    for entry in legend.LegendEntries():
+        with suppress(Exception):
+            widths.append(entry.Width)
+            heights.append(entry.Height)
+
+    metrics = cache[key] = max(widths), sum(heights)
+    return metrics
 
-    return chart.left, chart.top + chart.height
+
+def get_entry_style(series: Series) -> tuple[Any, ...]:
+    """Return the chart type and the marker and line styles of the series.
+
+    The styles that xlviews has not set are None.
+    """
+    values = series.format.values
+    return (
+        series.chart_type,
+        values.get("MarkerStyle"),
+        values.get("MarkerSize"),
+        values.get("Border.LineStyle"),
+        values.get("Format.Line.Weight"),
+    )
 
 
 class Axes:
@@ -96,12 +151,14 @@ class Axes:
         if column:
             left = self.sheet.range(1, column).left
 
-        left, top = chart_position(self.sheet, left, top)
+        occ = get_occupancy(self.sheet)
+        left, top = chart_position(self.sheet, left, top, occ)
 
         width = width or rcParams["chart.width"]
         height = height or rcParams["chart.height"]
 
         self.chart = self.sheet.charts.add(left, top, width, height)
+        occ.add((left, top, left + width, top + height))
 
         self.chart_type = chart_type
         self.chart.api[1].ChartType = chart_type
@@ -128,11 +185,6 @@ class Axes:
         left: float | None = None,
         top: float | None = None,
     ) -> Self:
-        border_width = self.chart.api[0].Border.LineStyle
-        visible_only = self.chart.api[1].PlotVisibleOnly
-        has_legend = self.chart.api[1].HasLegend
-        include_in_layout = self.chart.api[1].Legend.IncludeInLayout
-
         if left == 0:
             left = self.chart.left + self.chart.width
             top = self.chart.top
@@ -141,20 +193,62 @@ class Axes:
             left = self.chart.left
             top = self.chart.top + self.chart.height
 
-        return self.__class__(
-            row=row,
-            column=column,
-            chart_type=self.chart_type,
-            sheet=self.sheet,
-            left=left,
-            top=top,
-            width=self.chart.width,
-            height=self.chart.height,
-            border_width=border_width,
-            visible_only=visible_only,
-            has_legend=has_legend,
-            include_in_layout=include_in_layout,
-        )
+        settings = self.settings()
+        return self.__class__(row=row, column=column, left=left, top=top, **settings)
+
+    def settings(self) -> dict[str, Any]:
+        """Return the keyword arguments to create an axes like this one."""
+        api = self.chart.api
+
+        return {
+            "chart_type": self.chart_type,
+            "sheet": self.sheet,
+            "width": self.chart.width,
+            "height": self.chart.height,
+            "border_width": api[0].Border.LineStyle,
+            "visible_only": api[1].PlotVisibleOnly,
+            "has_legend": api[1].HasLegend,
+            "include_in_layout": api[1].Legend.IncludeInLayout,
+        }
+
+    @suspend_screen_updates
+    def copies(self, positions: Sequence[tuple[float, float]]) -> list[Self]:
+        """Return the copies of the axes at the positions of (left, top).
+
+        A chart without series is duplicated as a whole and moved, so that
+        each copy costs a few COM calls instead of creating and setting up
+        a new chart. Otherwise, the settings are read once and new empty
+        charts are created with them.
+        """
+        if not positions:
+            return []
+
+        if self.chart.api[1].SeriesCollection().Count:
+            settings = self.settings()
+            return [self.__class__(left=x, top=y, **settings) for x, y in positions]
+
+        occ = get_occupancy(self.sheet)
+        api = self.chart.api[0]
+        width, height = api.Width, api.Height
+
+        axes = []
+        for left, top in positions:
+            dup = api.Duplicate()
+            dup.Left, dup.Top = left, top
+            occ.add((left, top, left + width, top + height))
+            chart = self.chart.__class__(impl=self.chart.impl.__class__(dup))
+            axes.append(self.from_chart(chart))
+
+        return axes
+
+    def from_chart(self, chart: Chart) -> Self:
+        """Return an axes of the chart created from this one."""
+        axes = self.__class__.__new__(self.__class__)
+        axes.sheet = self.sheet
+        axes.chart = chart
+        axes.chart_type = self.chart_type
+        axes.series_collection = []
+        return axes
 
     @property
     def xaxis(self) -> Any:
@@ -173,15 +267,54 @@ class Axes:
         y: Any | None = None,
         label: str | None = None,
         chart_type: int | None = None,
+        *,
+        downsample: int | None = None,
     ) -> Series:
         if chart_type is None:
             chart_type = self.chart_type
 
-        series = Series(self, x, y, label, chart_type)
+        series = Series(self, x, y, label, chart_type, downsample=downsample)
         self.series_collection.append(series)
 
         return series
 
+    @suspend_screen_updates
+    def add_series_batch(
+        self,
+        items: Iterable[tuple[Any, Any, str | None]],
+        chart_type: int | None = None,
+        *,
+        downsample: int | None = None,
+    ) -> list[Series]:
+        """Add the series of the items of (x, y, label) in one pass.
+
+        The series whose values are references to the cells of a sheet
+        are defined by their SERIES formulas, so that the name and the
+        values cost one COM call instead of three. If Excel rejects the
+        formula, the values are set one by one.
+
+        If `downsample` is given, the series of more points are reduced to
+        at most that many points on a hidden helper sheet.
+        """
+        if chart_type is None:
+            chart_type = self.chart_type
+
+        series_collection = [
+            Series(
+                self,
+                x,
+                y,
+                label,
+                chart_type,
+                formula=True,
+                downsample=downsample,
+            )
+            for x, y, label in items
+        ]
+
+        self.series_collection.extend(series_collection)
+        return series_collection
+
     @property
     def title(self) -> str | None:
         api = self.chart.api[1]
@@ -362,10 +495,13 @@ class Axes:
         legend = api.Legend
         legend.IncludeInLayout = False
 
+        labels = []
         legend_entries = list(legend.LegendEntries())
         it = zip(legend_entries, self.series_collection, strict=True)
         for entry, series in it:
-            if not series.label:
+            if label := series.label:
+                labels.append((label, *get_entry_style(series)))
+            else:
                 entry.Delete()
 
         # `api.HasLegend` may be `False` after deleting entries.
@@ -376,19 +512,12 @@ class Axes:
         size = size or rcParams["chart.legend.font.size"]
         set_font_api(legend, name, size=size)
 
-        if height is None:
-            heights = [0]
-            for entry in legend.LegendEntries():
-                with suppress(Exception):
-                    heights.append(entry.Height * entry_height_scale)
-            height = sum(heights)
-
-        if width is None:
-            widths = [0]
-            for entry in legend.LegendEntries():
-                with suppress(Exception):
-                    widths.append(entry.Width)
-            width = max(widths)
+        if height is None or width is None:
+            # The entries wrap by the size of the legend fit to the chart.
+            key = name, size, legend.Width, legend.Height, tuple(labels)
+            entry_width, entry_heights = get_legend_metrics(legend, key)
+            height = entry_height_scale * entry_heights if height is None else height
+            width = entry_width if width is None else width
 
         set_dimensions(legend, left, top, width, height)
 
@@ -457,23 +586,9 @@ class Axes:
         # msoElementPrimaryValueGridLinesMajor == 330
         api.SetElement(330)
 
-        plot_area = api.PlotArea
-        line = plot_area.Format.Line
-        line.Visible = True
-        line.ForeColor.RGB = 0
-        line.Weight = 1.2
-        line.Transparency = 0.5
-
-        line = self.xaxis.MajorGridlines.Format.Line
-        line.Visible = True
-        line.ForeColor.RGB = 0
-        line.Weight = 1
-        line.Transparency = 0.7
-
-        line = self.yaxis.MajorGridlines.Format.Line
-        line.Visible = True
-        line.ForeColor.RGB = 0
-        line.Weight = 1
-        line.Transparency = 0.7
+        formats = get_line_formats()
+        set_line_format(api.PlotArea, formats["plot-area"])
+        set_line_format(self.xaxis.MajorGridlines, formats["gridlines"])
+        set_line_format(self.yaxis.MajorGridlines, formats["gridlines"])
 
         return self
@@ -0,0 +1,255 @@
+"""Reduce the points of huge series before they are plotted.
+
+Excel charts become slow, or drop points, beyond tens of thousands of
+points per series. The reduced points are written to a hidden helper
+sheet and the series refers to them. Lines are reduced by the
+largest-triangle-three-buckets algorithm, which keeps the visual shape
+of the line, and markers by keeping one point per cell of a grid, which
+keeps the area covered by the points.
+
+Each series has a block of two columns on the helper sheet, headed by
+the key of the sheet, the chart and the position of the series. A
+series plotted again at the same position overwrites its block.
+`clear_helper_sheet` removes all the blocks of a book.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+import pandas as pd
+from xlwings import Range as RangeImpl
+from xlwings.constants import ChartType, Direction, SheetVisibility
+
+from xlviews.core.range import Range
+from xlviews.core.range_collection import RangeCollection
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+    from xlwings import Book, Sheet
+
+type Method = Literal["lttb", "grid"]
+
+HELPER_SHEET_NAME = "_xlviews"
+
+MARKER_CHART_TYPES = {ChartType.xlXYScatter}
+
+
+def lttb(x: NDArray[Any], y: NDArray[Any], n: int) -> NDArray[np.intp]:
+    """Return the indices of the points by largest-triangle-three-buckets.
+
+    The first and the last points are always kept. The other points are
+    divided into `n - 2` buckets, and the point of each bucket that forms
+    the largest triangle with the previous selected point and the mean of
+    the next bucket is selected.
+
+    Examples:
+        >>> x = np.arange(8.0)
+        >>> y = np.array([0, 1, 0, 0, 5, 0, 0, 1.0])
+        >>> lttb(x, y, 4).tolist()
+        [0, 3, 4, 7]
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    every = (size - 2) / (n - 2)
+    edges = np.r_[(np.arange(n - 1) * every).astype(np.intp) + 1, size]
+
+    selected = np.empty(n, dtype=np.intp)
+    selected[0], selected[-1] = 0, size - 1
+
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        mx = x[end : edges[i + 2]].mean()
+        my = y[end : edges[i + 2]].mean()
+
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - mx) * (by - y[a]) - (x[a] - bx) * (my - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def grid_bin(x: NDArray[Any], y: NDArray[Any], n: int) -> NDArray[np.intp]:
+    """Return the indices of the first point in each cell of a grid.
+
+    The grid has about `n - 4` cells, and the points of the minimum and
+    the maximum of x and y are kept too, so that at most `n` points in
+    their original order are returned.
+
+    Examples:
+        >>> x = np.array([0, 0.1, 0.2, 0.3, 5, 5.1, 5.2, 9.8, 9.9, 10])
+        >>> y = np.array([0, 0.1, 9.9, 0.2, 5, 5.1, 0.1, 9.8, 0.3, 10])
+        >>> grid_bin(x, y, 8).tolist()
+        [0, 2, 4, 6, 9]
+    """
+    size = len(x)
+    if n >= size:
+        return np.arange(size)
+
+    bins = max(int(np.sqrt(max(n - 4, 1))), 1)
+
+    def digitize(values: NDArray[Any]) -> NDArray[np.intp]:
+        lo, hi = values.min(), values.max()
+        if hi == lo:
+            return np.zeros(len(values), dtype=np.intp)
+        index = ((values - lo) / (hi - lo) * bins).astype(np.intp)
+        return np.minimum(index, bins - 1)
+
+    cells = digitize(x) * bins + digitize(y)
+    first = np.unique(cells, return_index=True)[1]
+    extremes = [x.argmin(), x.argmax(), y.argmin(), y.argmax()]
+    return np.unique(np.r_[first, extremes])
+
+
+def downsample(
+    x: NDArray[Any],
+    y: NDArray[Any],
+    n: int,
+    method: Method = "lttb",
+) -> NDArray[np.intp]:
+    """Return the indices of at most n points, ignoring non-finite points.
+
+    Examples:
+        >>> x = np.arange(6.0)
+        >>> y = np.array([0, np.nan, 1, 3, 1, 0])
+        >>> downsample(x, y, 3).tolist()
+        [0, 3, 5]
+    """
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    func = lttb if method == "lttb" else grid_bin
+    return finite[func(x[finite], y[finite], n)]
+
+
+def to_array(values: Any) -> NDArray[np.float64]:
+    """Return the values as a float array, with NaN for the others."""
+    values = pd.Series(list(np.ravel(np.asarray(values, dtype=object))))
+    return pd.to_numeric(values, errors="coerce").to_numpy(np.float64)
+
+
+def read_values(value: Any, book: Book) -> NDArray[np.float64] | None:
+    """Return the values of the series, or None if they cannot be read."""
+    if isinstance(value, RangeImpl):
+        value = Range.from_range(value)
+
+    if isinstance(value, Range | RangeCollection):
+        ranges = [value] if isinstance(value, Range) else value.ranges
+        impls = [r.impl for r in ranges]
+
+    elif isinstance(value, str):
+        impls = []
+        for address in value.removeprefix("=").split(","):
+            if "!" not in address:
+                return None
+            name, address_ = address.rsplit("!", 1)
+            impls.append(book.sheets[name.strip("'")].range(address_))
+
+    else:
+        return to_array(value)
+
+    values = [rng.options(ndim=1).value for rng in impls]
+    return to_array([v for vs in values for v in vs])
+
+
+def get_helper_sheet(book: Book) -> Sheet:
+    """Return the hidden sheet of the reduced points, adding it if missing."""
+    if HELPER_SHEET_NAME in [sheet.name for sheet in book.sheets]:
+        return book.sheets[HELPER_SHEET_NAME]
+
+    active = book.sheets.active
+    sheet = book.sheets.add(HELPER_SHEET_NAME, after=book.sheets[-1])
+    sheet.api.Visible = SheetVisibility.xlSheetHidden
+    active.activate()
+    return sheet
+
+
+def clear_helper_sheet(book: Book) -> None:
+    """Clear the reduced points of all the series of the book.
+
+    The series still refer to the helper sheet and become empty.
+    """
+    if HELPER_SHEET_NAME in [sheet.name for sheet in book.sheets]:
+        book.sheets[HELPER_SHEET_NAME].cells.clear_contents()
+
+
+def get_block_column(sheet: Sheet, key: str) -> int:
+    """Return the first column of the block of the key.
+
+    The block of the key is cleared if it exists. Otherwise, the next
+    free columns are returned.
+    """
+    end = sheet.api.Cells(1, sheet.api.Columns.Count).End(Direction.xlToLeft)
+    if end.Value is None:
+        return 1
+
+    keys = sheet.range((1, 1), (1, end.Column)).options(ndim=1).value
+    if key in keys:
+        column = keys.index(key) + 1
+        sheet.range((1, column), (1, column + 1)).api.EntireColumn.ClearContents()
+        return column
+
+    return end.Column + 1
+
+
+def write_points(
+    book: Book,
+    x: NDArray[Any],
+    y: NDArray[Any],
+    key: str,
+) -> tuple[Range, Range]:
+    """Write the points to the block of the key on the helper sheet."""
+    sheet = get_helper_sheet(book)
+    column = get_block_column(sheet, key)
+
+    sheet.range(1, column).value = [key, key]
+    sheet.range(2, column).value = np.column_stack([x, y])
+
+    n = len(x)
+    xrng = Range((2, column), (n + 1, column), sheet)
+    yrng = Range((2, column + 1), (n + 1, column + 1), sheet)
+    return xrng, yrng
+
+
+def downsample_series(
+    book: Book,
+    x: Any,
+    y: Any,
+    n: int,
+    chart_type: int | None = None,
+    key: str = "",
+) -> tuple[Range, Range] | None:
+    """Write the reduced points of the series to the helper sheet.
+
+    Args:
+        book (Book): The book of the chart.
+        x: The x values, or None for the positions of the y values.
+        y: The y values.
+        n (int): The maximum number of the points.
+        chart_type (int, optional): The chart type of the series. The
+            markers are reduced by a grid, and the lines by LTTB.
+        key (str): The key of the block of the series on the helper
+            sheet. The block of the same key is overwritten.
+
+    Returns:
+        The ranges of the reduced x and y values, or None if the series
+        has no more than n points or the values cannot be read.
+    """
+    ys = read_values(y, book)
+    if ys is None or len(ys) <= n:
+        return None
+
+    xs = (
+        np.arange(1, len(ys) + 1, dtype=np.float64)
+        if x is None
+        else read_values(x, book)
+    )
+    if xs is None or len(xs) != len(ys):
+        return None
+
+    method = "grid" if chart_type in MARKER_CHART_TYPES else "lttb"
+    index = downsample(xs, ys, n, method)
+    return write_points(book, xs[index], ys[index], key)
@@ -0,0 +1,201 @@
+"""Track the rectangles occupied by the charts of a sheet.
+
+`chart_position` places a new chart next to the existing ones. Instead
+of iterating over the charts of the sheet through COM for every new
+chart, the rectangles are kept in Python and the extremes are kept in
+sorted lists, so that a query costs a binary search.
+
+The occupancies are keyed by the sheet. The number of the charts and
+the rectangle of the last chart are compared with the sheet on every
+lookup, and the rectangles are read again from the sheet if either
+differs, e.g., after the charts have been deleted, added, or the last
+one moved outside xlviews. Only the last chart is checked: after moving
+or resizing any other chart, call `clear_occupancy`, or the new charts
+may overlap it.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, Any
+
+import xlwings
+
+from xlviews.format_state import sheet_key
+
+if TYPE_CHECKING:
+    from xlwings import Chart, Sheet
+
+    from xlviews.format_state import SheetKey
+
+type Rect = tuple[float, float, float, float]
+
+
+class Occupancy:
+    """The rectangles of the charts of a sheet in the order of creation.
+
+    A rectangle is a tuple of the left, top, right, and bottom positions
+    in points.
+
+    Examples:
+        >>> occ = Occupancy()
+        >>> a = occ.add((10, 20, 110, 220))
+        >>> b = occ.add((110, 20, 210, 220))
+        >>> occ.left, occ.top, occ.right, occ.bottom
+        (10, 20, 210, 220)
+        >>> occ.next_right(), occ.next_below()
+        ((210, 20), (110, 220))
+        >>> occ.move(a, (10, 220, 110, 420))
+        >>> occ.bottom
+        420
+        >>> occ.remove(b)
+        >>> occ.next_right()
+        (110, 220)
+    """
+
+    rects: dict[int, Rect]
+    edges: tuple[list[tuple[float, int]], ...]
+    count: int
+
+    def __init__(self) -> None:
+        self.rects = {}
+        self.edges = ([], [], [], [])
+        self.count = 0
+
+    def __repr__(self) -> str:
+        cls = self.__class__.__name__
+        return f"<{cls} rects={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def add(self, rect: Rect) -> int:
+        """Record the rectangle and return its key."""
+        key = self.count
+        self.count += 1
+        self.rects[key] = rect
+        self._insert(key, rect)
+        return key
+
+    def move(self, key: int, rect: Rect) -> None:
+        """Replace the rectangle, keeping its order of creation."""
+        self._delete(key, self.rects[key])
+        self.rects[key] = rect
+        self._insert(key, rect)
+
+    def remove(self, key: int) -> None:
+        self._delete(key, self.rects.pop(key))
+
+    def clear(self) -> None:
+        self.rects.clear()
+        for edge in self.edges:
+            edge.clear()
+
+    def _insert(self, key: int, rect: Rect) -> None:
+        for edge, value in zip(self.edges, rect, strict=True):
+            insort(edge, (value, key))
+
+    def _delete(self, key: int, rect: Rect) -> None:
+        for edge, value in zip(self.edges, rect, strict=True):
+            del edge[bisect_left(edge, (value, key))]
+
+    @property
+    def left(self) -> float:
+        """Return the leftmost position of the rectangles."""
+        return self.edges[0][0][0]
+
+    @property
+    def top(self) -> float:
+        """Return the topmost position of the rectangles."""
+        return self.edges[1][0][0]
+
+    @property
+    def right(self) -> float:
+        """Return the rightmost position of the rectangles."""
+        return self.edges[2][-1][0]
+
+    @property
+    def bottom(self) -> float:
+        """Return the bottommost position of the rectangles."""
+        return self.edges[3][-1][0]
+
+    @property
+    def last(self) -> Rect:
+        """Return the rectangle created last."""
+        return next(reversed(self.rects.values()))
+
+    def next_right(self) -> tuple[float, float]:
+        """Return the position on the right of the last rectangle."""
+        _, top, right, _ = self.last
+        return right, top
+
+    def next_below(self) -> tuple[float, float]:
+        """Return the position below the last rectangle."""
+        left, _, _, bottom = self.last
+        return left, bottom
+
+
+_occupancies: dict[SheetKey, Occupancy] = {}
+
+
+def get_api_rect(api: Any) -> Rect:
+    """Return the rectangle of the chart object in points."""
+    left, top = api.Left, api.Top
+    return left, top, left + api.Width, top + api.Height
+
+
+def get_rect(chart: Chart) -> Rect:
+    """Return the rectangle of the chart in points."""
+    return get_api_rect(chart.api[0])
+
+
+def is_close(a: Rect, b: Rect, tol: float = 1) -> bool:
+    """Return True if the rectangles are the same within the tolerance.
+
+    Excel rounds the positions of a chart to the screen pixels.
+
+    Examples:
+        >>> is_close((10, 20, 110, 70), (10.5, 20, 110.5, 70))
+        True
+        >>> is_close((10, 20, 110, 70), (10, 50, 110, 100))
+        False
+    """
+    return all(abs(x - y) <= tol for x, y in zip(a, b, strict=True))
+
+
+def is_stale(occ: Occupancy, sheet: Sheet) -> bool:
+    """Return True if the occupancy does not match the charts of the sheet.
+
+    Only the number of the charts and the rectangle of the last chart
+    are compared, so that the check costs a few COM calls.
+    """
+    count = sheet.api.ChartObjects().Count
+
+    if len(occ) != count:
+        return True
+
+    if count == 0:
+        return False
+
+    return not is_close(occ.last, get_api_rect(sheet.api.ChartObjects(count)))
+
+
+def get_occupancy(sheet: Sheet | None = None) -> Occupancy:
+    """Return the occupancy of the sheet, reading it again if out of date."""
+    sheet = sheet or xlwings.sheets.active
+    occ = _occupancies.setdefault(sheet_key(sheet), Occupancy())
+
+    if is_stale(occ, sheet):
+        occ.clear()
+        for chart in sheet.charts:
+            occ.add(get_rect(chart))
+
+    return occ
+
+
+def clear_occupancy(sheet: Sheet | None = None) -> None:
+    """Forget the occupancy of the sheet, or of all sheets if None."""
+    if sheet is None:
+        _occupancies.clear()
+    else:
+        _occupancies.pop(sheet_key(sheet), None)
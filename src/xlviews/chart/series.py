@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import re
 from typing import TYPE_CHECKING, Any, Self
 
+import pywintypes
 from xlwings import Range as RangeImpl
 from xlwings.constants import ChartType
 
@@ -9,15 +11,98 @@ from xlviews.colors import Color, rgb
 from xlviews.core.range import Range
 from xlviews.core.range_collection import RangeCollection
 
+from .downsample import downsample_series
 from .style import get_line_style, get_marker_style
 
 if TYPE_CHECKING:
     from .axes import Axes
 
+REFERENCE = re.compile(r"[^!,()=]+!\$?[A-Z]{1,3}\$?\d+(:\$?[A-Z]{1,3}\$?\d+)?")
+
+MISSING = object()
+
+# The values of a new series that need not be written.
+DEFAULTS = {"Format.Fill.Transparency": 0, "Format.Line.Transparency": 0}
+
+
+class SeriesFormat:
+    """The format properties written to a series through xlviews.
+
+    A property is written only if it differs from the last value written
+    or read, and the COM sub-objects, such as `Format.Fill`, are looked
+    up once per series. Formats changed outside xlviews are not seen.
+
+    Examples:
+        >>> from types import SimpleNamespace as NS
+        >>> api = NS(MarkerSize=5, Format=NS(Line=NS(Weight=1)))
+        >>> fmt = SeriesFormat(api)
+        >>> fmt.set("MarkerSize", 8)
+        >>> fmt.set("MarkerSize", 8)
+        >>> fmt.set("Format.Line.Weight", 2)
+        >>> api.MarkerSize, api.Format.Line.Weight
+        (8, 2)
+        >>> fmt
+        <SeriesFormat writes=2 skips=1>
+    """
+
+    api: Any
+    objects: dict[str, Any]
+    values: dict[str, Any]
+    writes: int
+    skips: int
+
+    def __init__(self, api: Any) -> None:
+        self.api = api
+        self.objects = {"": api}
+        self.values = DEFAULTS.copy()
+        self.writes = 0
+        self.skips = 0
+
+    def __repr__(self) -> str:
+        cls = self.__class__.__name__
+        return f"<{cls} writes={self.writes} skips={self.skips}>"
+
+    def obj(self, path: str) -> Any:
+        """Return the COM object of the path, e.g., 'Format.Fill'."""
+        if (obj := self.objects.get(path)) is not None:
+            return obj
+
+        parent, _, name = path.rpartition(".")
+        obj = self.objects[path] = getattr(self.obj(parent), name)
+        return obj
+
+    def get(self, path: str) -> Any:
+        """Return the value of the property, reading it only once."""
+        if (value := self.values.get(path, MISSING)) is not MISSING:
+            return value
+
+        parent, _, name = path.rpartition(".")
+        value = self.values[path] = getattr(self.obj(parent), name)
+        return value
+
+    def set(self, path: str, value: Any) -> None:
+        """Write the value of the property unless it is already set."""
+        if self.values.get(path, MISSING) == value:
+            self.skips += 1
+            return
+
+        parent, _, name = path.rpartition(".")
+        setattr(self.obj(parent), name, value)
+        self.writes += 1
+
+        if path == "ChartType":
+            self.values.clear()
+        elif path.startswith("Format.Line."):
+            # Writing the line format may reset the line style.
+            self.values.pop("Border.LineStyle", None)
+
+        self.values[path] = value
+
 
 class Series:
     axes: Axes
     api: Any
+    format: SeriesFormat
 
     def __init__(
         self,
@@ -26,20 +111,58 @@ class Series:
         y: Any | None = None,
         label: str | None = None,
         chart_type: int | None = None,
+        *,
+        formula: bool = False,
+        downsample: int | None = None,
     ) -> None:
+        if y is None:
+            x, y = None, x
+
+        if downsample:
+            sheet = axes.sheet
+            ct = axes.chart_type if chart_type is None else chart_type
+            index = axes.chart.api[1].SeriesCollection().Count + 1
+            key = f"{sheet.name}!{axes.chart.name}:{index}"
+            if points := downsample_series(sheet.book, x, y, downsample, ct, key):
+                x, y = points
+
         self.axes = axes
         self.api = axes.chart.api[1].SeriesCollection().NewSeries()
-        self.label = label
+        self.format = SeriesFormat(self.api)
 
         if chart_type is not None:
             self.chart_type = chart_type
 
-        if y is not None:
+        if formula and self.set_formula(x, y, label):
+            return
+
+        self.label = label
+
+        if x is not None:
             self.x = x
-            self.y = y
 
-        else:
-            self.y = x
+        self.y = y
+
+    def set_formula(self, x: Any, y: Any, label: str | None) -> bool:
+        """Define the series by its SERIES formula. Return False on failure.
+
+        The plot order is read from the series, since it counts within
+        the chart group of the chart type. Excel rejects some formulas,
+        e.g., too long or with sheet names that need quotes, and then
+        the values have to be set one by one.
+        """
+        if (refs := get_series_references(x, y)) is None:
+            return False
+
+        name = (label or "").replace('"', '""')
+        formula = f'=SERIES("{name}",{refs[0]},{refs[1]},{self.api.PlotOrder})'
+
+        try:
+            self.api.Formula = formula
+        except pywintypes.com_error:
+            return False
+
+        return True
 
     @property
     def label(self) -> str:
@@ -51,11 +174,11 @@ class Series:
 
     @property
     def chart_type(self) -> int:
-        return self.api.ChartType
+        return self.format.get("ChartType")
 
     @chart_type.setter
     def chart_type(self, chart_type: int) -> None:
-        self.api.ChartType = chart_type
+        self.format.set("ChartType", chart_type)
 
     @property
     def x(self) -> tuple[Any, ...]:
@@ -111,12 +234,12 @@ class Series:
         alpha: float | None = None,
         weight: float | None = None,
     ) -> Self:
-        set_marker(self.api, get_marker_style(style), size)
+        set_marker(self.format, get_marker_style(style), size)
 
         if color is not None:
-            set_fill(self.api, rgb(color), alpha)
+            set_fill(self.format, rgb(color), alpha)
             alpha = alpha / 2 if weight and alpha is not None else alpha
-            set_line(self.api, get_line_style(""), rgb(color), alpha, weight)
+            set_line(self.format, get_line_style(""), rgb(color), alpha, weight)
 
         return self
 
@@ -132,46 +255,92 @@ class Series:
         if color is not None:
             color = rgb(color)
 
-        set_line(self.api, get_line_style(style), color, alpha, weight)
+        set_line(self.format, get_line_style(style), color, alpha, weight)
 
         if marker:
-            set_marker(self.api, get_marker_style(marker), size)
+            set_marker(self.format, get_marker_style(marker), size)
             if color is not None:
-                set_fill(self.api, color, alpha)
+                set_fill(self.format, color, alpha)
 
         return self
 
 
-def set_marker(api: Any, style: int | None, size: int | None) -> None:
+def get_reference(value: Any) -> str | None:
+    """Return the reference to the values in a SERIES formula, or None.
+
+    Examples:
+        >>> get_reference("Sheet1!$A$1:$A$3")
+        'Sheet1!$A$1:$A$3'
+        >>> get_reference("=Sheet1!$A$1,Sheet1!$A$3:$A$4")
+        '(Sheet1!$A$1,Sheet1!$A$3:$A$4)'
+        >>> get_reference("AGGREGATE(1,7,Sheet1!$A$1:$A$3)") is None
+        True
+    """
+    if isinstance(value, Range | RangeCollection):
+        value = value.get_address(include_sheetname=True)
+
+    if not isinstance(value, str):
+        return None
+
+    value = value.removeprefix("=")
+    refs = value.split(",")
+
+    if not all(REFERENCE.fullmatch(ref) for ref in refs):
+        return None
+
+    return f"({value})" if len(refs) > 1 else value
+
+
+def get_series_references(x: Any, y: Any) -> tuple[str, str] | None:
+    """Return the references to the x and y values, or None if not references.
+
+    Examples:
+        >>> get_series_references("Sheet1!$A$1:$A$3", "Sheet1!$B$1:$B$3")
+        ('Sheet1!$A$1:$A$3', 'Sheet1!$B$1:$B$3')
+        >>> get_series_references(None, "Sheet1!$B$1:$B$3")
+        ('', 'Sheet1!$B$1:$B$3')
+        >>> get_series_references([1, 2], "Sheet1!$B$1:$B$2") is None
+        True
+    """
+    yref = get_reference(y)
+    xref = "" if x is None else get_reference(x)
+
+    if yref is None or xref is None:
+        return None
+
+    return xref, yref
+
+
+def set_marker(fmt: SeriesFormat, style: int | None, size: int | None) -> None:
     if style is not None:
-        api.MarkerStyle = style
+        fmt.set("MarkerStyle", style)
     if size is not None:
-        api.MarkerSize = size
+        fmt.set("MarkerSize", size)
 
 
-def set_fill(api: Any, color: int | None, alpha: float | None) -> None:
+def set_fill(fmt: SeriesFormat, color: int | None, alpha: float | None) -> None:
     if color is not None:
-        api.Format.Fill.BackColor.RGB = color
-        api.Format.Fill.ForeColor.RGB = color
+        fmt.set("Format.Fill.BackColor.RGB", color)
+        fmt.set("Format.Fill.ForeColor.RGB", color)
     if alpha is not None:
-        api.Format.Fill.Transparency = alpha
+        fmt.set("Format.Fill.Transparency", alpha)
 
 
 def set_line(
-    api: Any,
+    fmt: SeriesFormat,
     style: int | None,
     color: int | None,
     alpha: float | None,
     weight: float | None,
 ) -> None:
     if style is None:
-        style = api.Border.LineStyle
+        style = fmt.get("Border.LineStyle")
 
     if weight is not None:
-        api.Format.Line.Weight = weight
+        fmt.set("Format.Line.Weight", weight)
     if color is not None:
-        api.Format.Line.ForeColor.RGB = color
+        fmt.set("Format.Line.ForeColor.RGB", color)
     if alpha is not None:
-        api.Format.Line.Transparency = alpha
+        fmt.set("Format.Line.Transparency", alpha)
 
-    api.Border.LineStyle = style  # must be set after weight and color
+    fmt.set("Border.LineStyle", style)  # must be set after weight and color
@@ -36,6 +36,8 @@ MARKER_DICT: dict[str, int] = {
     "*": MarkerStyle.xlMarkerStyleStar,
 }
 
+type LineFormat = tuple[int, float, float]
+
 LINE_DICT: dict[str, int] = {
     "": LineStyle.xlLineStyleNone,
     "-": LineStyle.xlContinuous,
@@ -174,6 +176,36 @@ def set_axis_scale(axis: Any, scale: str) -> None:
     raise NotImplementedError
 
 
+def get_line_formats() -> dict[str, LineFormat]:
+    """Return the color, weight, and transparency of the chart lines.
+
+    Examples:
+        >>> get_line_formats()["gridlines"]
+        (0, 1, 0.7)
+    """
+    return {
+        "plot-area": (
+            rgb(rcParams["chart.plot-area.border.color"]),
+            rcParams["chart.plot-area.border.weight"],
+            rcParams["chart.plot-area.border.alpha"],
+        ),
+        "gridlines": (
+            rgb(rcParams["chart.gridlines.color"]),
+            rcParams["chart.gridlines.weight"],
+            rcParams["chart.gridlines.alpha"],
+        ),
+    }
+
+
+def set_line_format(api: Any, fmt: LineFormat) -> None:
+    color, weight, alpha = fmt
+    line = api.Format.Line
+    line.Visible = True
+    line.ForeColor.RGB = color
+    line.Weight = weight
+    line.Transparency = alpha
+
+
 def set_dimensions(
     api: Any,
     left: float | None = None,
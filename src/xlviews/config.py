@@ -3,14 +3,21 @@
 The configuration parameters are described in `xlviews.toml`
 located in the same directory.
 
-Custom settings can be made by directly modifying `xlviews.config.rcParams`.
+Custom settings can be made by assigning the dotted keys of
+`xlviews.config.rcParams`, e.g., `rcParams["chart.width"] = 300`, or by
+modifying its sections in place. Either way bumps `rcParams.version`.
 """
 
 from __future__ import annotations
 
+import copy
 import tomllib
+from collections.abc import Mapping, MutableMapping
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
 
 CONFIG_FILE = Path(__file__).parent / "xlviews.toml"
 
@@ -20,29 +27,155 @@ def load_config() -> dict[str, Any]:
         return tomllib.load(f)
 
 
+def flatten(params: Mapping[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten the nested parameters into a map of dotted keys.
+
+    The sections are included as well as the leaves.
+
+    Examples:
+        >>> flatten({"a": {"b": 1, "c": {"d": 2}}})
+        {'a': {'b': 1, 'c': {'d': 2}}, 'a.b': 1, 'a.c': {'d': 2}, 'a.c.d': 2}
+    """
+    flat = {}
+
+    for key, value in params.items():
+        flat[f"{prefix}{key}"] = value
+        if isinstance(value, Mapping):
+            flat.update(flatten(value, f"{prefix}{key}."))
+
+    return flat
+
+
+class Snapshot(Mapping[str, Any]):
+    """A frozen view of the parameters at a version of `Config`.
+
+    The sections are accessed by item, and the keys may be dotted.
+
+    Examples:
+        >>> s = Snapshot({"frame": {"wide-columns": {"fill": {"color": "red"}}}})
+        >>> s["frame"]["wide-columns"]["fill.color"]
+        'red'
+        >>> s["frame.wide-columns.fill.color"]
+        'red'
+    """
+
+    _flat: Mapping[str, Any]
+    _prefix: str
+    _keys: tuple[str, ...]
+
+    def __init__(self, params: Mapping[str, Any], prefix: str = "") -> None:
+        flat = params if prefix else flatten(params)
+        n = len(prefix)
+        keys = tuple(k[n:] for k in flat if k.startswith(prefix) and "." not in k[n:])
+
+        object.__setattr__(self, "_flat", flat)
+        object.__setattr__(self, "_prefix", prefix)
+        object.__setattr__(self, "_keys", keys)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        msg = "Snapshot is frozen"
+        raise AttributeError(msg)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._flat[self._prefix + key]
+        if isinstance(value, Mapping):
+            return Snapshot(self._flat, f"{self._prefix}{key}.")
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {list(self._keys)}>"
+
+
+class Params(MutableMapping[str, Any]):
+    """A view of a section of the parameters that reports the changes.
+
+    Examples:
+        >>> changes = []
+        >>> params = Params({"a": {"b": 1}}, lambda: changes.append(1))
+        >>> params["a"]["b"] = 2
+        >>> params, changes
+        ({'a': {'b': 2}}, [1])
+    """
+
+    _data: dict[str, Any]
+    _on_change: Callable[[], None]
+
+    def __init__(self, data: dict[str, Any], on_change: Callable[[], None]) -> None:
+        self._data = data
+        self._on_change = on_change
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._data[key]
+        if isinstance(value, dict):
+            return Params(value, self._on_change)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._on_change()
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        self._on_change()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+
 class Config:
-    params: dict[str, Any]
+    """The parameters read from the configuration file.
+
+    The dotted keys are resolved through a flat map. The parameters and
+    their sections are returned as `Params` views, so that every change,
+    by a dotted key or in place, rebuilds the flat map and increments
+    `version`. The caches derived from the parameters compare `version`
+    to tell when they are stale.
+    """
+
+    version: int
 
     def __init__(self) -> None:
-        self.params = load_config()
+        self._params = load_config()
+        self.version = 0
+        self._flat = flatten(self._params)
+        self._snapshot: Snapshot | None = None
 
-    def __getitem__(self, key: str) -> Any:
-        keys = key.split(".")
-        value = self.params
+    @property
+    def params(self) -> Params:
+        return Params(self._params, self._changed)
 
-        for k in keys:
-            value = value[k]
+    def _changed(self) -> None:
+        self._flat = flatten(self._params)
+        self._snapshot = None
+        self.version += 1
 
+    def __getitem__(self, key: str) -> Any:
+        value = self._flat[key]
+        if isinstance(value, dict):
+            return Params(value, self._changed)
         return value
 
     def __setitem__(self, key: str, value: Any) -> None:
         keys = key.split(".")
-        params = self.params
+        params = self._params
 
         for k in keys[:-1]:
             params = params[k]
 
         params[keys[-1]] = value
+        self._changed()
 
     def get(self, key: str, default: Any = None) -> Any:
         try:
@@ -50,5 +183,12 @@ class Config:
         except KeyError:
             return default
 
+    def snapshot(self) -> Snapshot:
+        """Return the frozen parameters of the current version."""
+        if self._snapshot is None:
+            self._snapshot = Snapshot(copy.deepcopy(self._params))
+
+        return self._snapshot
+
 
 rcParams = Config()  # noqa: N816
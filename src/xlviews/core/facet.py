@@ -0,0 +1,124 @@
+"""Enumerate the facets of a DataFrame by the values of index levels."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterator, Sequence
+
+    from numpy.typing import NDArray
+
+
+class FacetIndex:
+    """The keys and the positional rows of the facets of an index.
+
+    The levels are factorized once, and the rows of all the facets are
+    found by a single `groupby`. The facets are in the order of their
+    first appearance in the index.
+
+    Examples:
+        >>> index = pd.MultiIndex.from_arrays([[2, 1, 2, 1], list("xxyy")])
+        >>> fi = FacetIndex(index, 0)
+        >>> fi.keys
+        [{0: 2}, {0: 1}]
+        >>> [i.tolist() for i in fi.indices]
+        [[0, 2], [1, 3]]
+        >>> fi.get({0: 1}).tolist()
+        [1, 3]
+    """
+
+    levels: list[Hashable]
+    keys: list[dict[Hashable, Any]]
+    indices: list[NDArray[np.intp]]
+    _positions: dict[tuple[Any, ...], NDArray[np.intp]]
+
+    def __init__(
+        self,
+        index: pd.Index[Any],
+        levels: Hashable | Sequence[Hashable] | None,
+    ) -> None:
+        if levels is None:
+            self.levels = []
+            self.keys = [{}]
+            self.indices = [np.arange(len(index))]
+
+        else:
+            self.levels = [levels] if isinstance(levels, int | str) else list(levels)  # pyright: ignore[reportArgumentType]
+            self.keys, self.indices = _group(index, self.levels)
+
+        values = (tuple(key.values()) for key in self.keys)
+        self._positions = dict(zip(values, self.indices, strict=True))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[tuple[dict[Hashable, Any], NDArray[np.intp]]]:
+        yield from zip(self.keys, self.indices, strict=True)
+
+    def get(self, key: dict[Hashable, Any]) -> NDArray[np.intp] | None:
+        """Return the rows of the facet, or None if there is no such facet."""
+        return self._positions.get(tuple(key[level] for level in self.levels))
+
+
+def _group(
+    index: pd.Index[Any],
+    levels: list[Hashable],
+) -> tuple[list[dict[Hashable, Any]], list[NDArray[np.intp]]]:
+    if not levels:
+        return [], []
+
+    factorized = [
+        pd.factorize(index.get_level_values(lv), use_na_sentinel=False) for lv in levels
+    ]  # pyright: ignore[reportArgumentType]
+    codes = DataFrame({k: c for k, (c, _) in enumerate(factorized)})
+    uniques = [u.tolist() for _, u in factorized]
+
+    groups = codes.groupby(list(codes.columns), sort=False).indices
+    items = sorted(groups.items(), key=lambda item: item[1][0])
+
+    keys = []
+    for code, _ in items:
+        code_ = code if isinstance(code, tuple) else (code,)
+        values = (u[c] for u, c in zip(uniques, code_, strict=True))
+        keys.append(dict(zip(levels, values, strict=True)))
+
+    return keys, [indices for _, indices in items]
+
+
+def take(
+    df: DataFrame,
+    indices: NDArray[np.intp],
+    levels: Sequence[Hashable],
+    axis: int = 0,
+    *,
+    drop_level: bool = True,
+) -> DataFrame:
+    """Return the rows, or the columns, of a facet.
+
+    Args:
+        df (DataFrame): The DataFrame to slice.
+        indices (NDArray): The positions of the facet along the axis.
+        levels (list): The levels of the facet key.
+        axis (int): The axis to slice.
+        drop_level (bool): Whether to drop the levels of the facet key,
+            as `DataFrame.xs` does. The levels are kept if no other
+            level remains.
+
+    Examples:
+        >>> df = DataFrame({"a": [1, 2, 1], "b": [3, 4, 5], "c": [6, 7, 8]})
+        >>> df = df.set_index(["a", "b"])
+        >>> sub = take(df, FacetIndex(df.index, "a").indices[0], ["a"])
+        >>> sub.index.name, sub.index.tolist(), sub["c"].tolist()
+        ('b', [3, 5], [6, 8])
+    """
+    df = df.take(indices, axis=axis)
+
+    if drop_level and levels and df.axes[axis].nlevels > len(levels):
+        df = df.droplevel(list(levels), axis=axis)
+
+    return df
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
 from typing import TYPE_CHECKING, Any, TypeAlias
 
+import numpy as np
+import xlwings
 from xlwings import Range as RangeImpl
 
+from .address import index_to_column_name
 from .range import Range
 from .range_collection import RangeCollection
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Sequence
+
+    from numpy.typing import NDArray
+    from xlwings import Sheet
 
 # Used for `isinstance` in `sheet_frame.py`
 Func: TypeAlias = str | Range | RangeImpl | None  # noqa: UP040
@@ -111,6 +121,236 @@ def aggregate(
     return value
 
 
+def aggregate_grid(
+    func: Func,
+    runs: Sequence[Sequence[tuple[int, int]]],
+    columns: Sequence[int] | NDArray[np.integer],
+    option: int = 7,  # ignore hidden rows and error values
+    *,
+    row_absolute: bool = True,
+    column_absolute: bool = True,
+    include_sheetname: bool = False,
+    external: bool = False,
+    formula: bool = False,
+    sheet: Sheet | None = None,
+    n_jobs: int | None = None,
+) -> NDArray[np.str_]:
+    """Return the aggregation formulas for every group and column at once.
+
+    This is equivalent to calling `aggregate` with a `RangeCollection`
+    of the runs of each group for each column, but the formulas are
+    rendered with array string operations instead of one call per cell.
+
+    Args:
+        func: The aggregation function. "first" for the first cell of
+            each group.
+        runs: The row runs (start, end) of each group.
+        columns: The column indices.
+        option: The option of the AGGREGATE function.
+        sheet: The sheet, required for the sheet name prefix.
+        n_jobs: The number of worker processes. See `aggregate_grids`.
+
+    Returns:
+        The array of formulas with the shape (groups, columns).
+
+    Examples:
+        >>> runs = [[(3, 4)], [(5, 5), (8, 9)]]
+        >>> aggregate_grid("max", runs, [2, 3]).tolist()[1]
+        ['AGGREGATE(4,7,$B$5,$B$8:$B$9)', 'AGGREGATE(4,7,$C$5,$C$8:$C$9)']
+        >>> aggregate_grid("first", runs, [2], formula=True).tolist()
+        [['=$B$3'], ['=$B$5']]
+        >>> aggregate_grid("max", [], [2, 3]).shape
+        (0, 2)
+    """
+    return aggregate_grids(
+        [(func, columns)],
+        runs,
+        option,
+        row_absolute=row_absolute,
+        column_absolute=column_absolute,
+        include_sheetname=include_sheetname,
+        external=external,
+        formula=formula,
+        sheet=sheet,
+        n_jobs=n_jobs,
+    )[0]
+
+
+def aggregate_grids(
+    specs: Sequence[tuple[Func, Sequence[int] | NDArray[np.integer]]],
+    runs: Sequence[Sequence[tuple[int, int]]],
+    option: int = 7,  # ignore hidden rows and error values
+    *,
+    row_absolute: bool = True,
+    column_absolute: bool = True,
+    include_sheetname: bool = False,
+    external: bool = False,
+    formula: bool = False,
+    sheet: Sheet | None = None,
+    n_jobs: int | None = None,
+) -> list[NDArray[np.str_]]:
+    """Return the aggregation formulas for several functions at once.
+
+    Args:
+        specs: The pairs of the aggregation function and the column
+            indices. See `aggregate_grid`.
+        runs: The row runs (start, end) of each group.
+        option: The option of the AGGREGATE function.
+        sheet: The sheet, required for the sheet name prefix.
+        n_jobs: The number of worker processes. All the (function, column)
+            pairs are split into `n_jobs` shards rendered in one process
+            pool. None or 1 to render in the current process.
+
+    Returns:
+        The list of the arrays of formulas with the shape (groups, columns),
+        one for each spec.
+
+    Examples:
+        >>> runs = [[(3, 4)], [(5, 5), (8, 9)]]
+        >>> x, y = aggregate_grids([("max", [2]), ("min", [3, 4])], runs)
+        >>> x.tolist()[0], y.shape
+        (['AGGREGATE(4,7,$B$3:$B$4)'], (2, 2))
+    """
+    if not runs:
+        return [np.empty((0, len(columns)), dtype=np.str_) for _, columns in specs]
+
+    if external or include_sheetname:
+        sheet = sheet or xlwings.sheets.active
+
+    if external:
+        prefix = f"[{sheet.book.name}]{sheet.name}!"
+    elif include_sheetname:
+        prefix = f"{sheet.name}!"
+    else:
+        prefix = ""
+
+    counts = np.fromiter(map(len, runs), dtype=np.intp, count=len(runs))
+    array = np.array([run for rs in runs for run in rs], dtype=np.int64)
+    array = array.reshape(-1, 2)
+
+    rp = "$" if row_absolute else ""
+    cp = "$" if column_absolute else ""
+
+    jobs: list[tuple[int, str | None, str | None, str]] = []
+    for k, (func, columns) in enumerate(specs):
+        if func is None or isinstance(func, str):
+            func_, ref = func, None
+        else:
+            func_ = None
+            ref = func.get_address(column_absolute=False, row_absolute=False)
+
+        names = (f"{cp}{index_to_column_name(c)}{rp}" for c in columns)
+        jobs.extend((k, func_, ref, name) for name in names)
+
+    render = partial(
+        _render_grid,
+        counts,
+        array,
+        prefix,
+        option=option,
+        formula=formula,
+    )
+
+    if not n_jobs or n_jobs == 1 or len(jobs) < 2:
+        parts = _render_jobs(render, jobs)
+
+    else:
+        shards = np.array_split(np.arange(len(jobs)), min(n_jobs, len(jobs)))
+
+        with ProcessPoolExecutor(len(shards)) as executor:
+            it = ([jobs[i] for i in shard] for shard in shards)
+            futures = [executor.submit(_render_jobs, render, js) for js in it]
+            parts = [part for f in futures for part in f.result()]
+
+    grids: list[list[NDArray[np.str_]]] = [[] for _ in specs]
+    for k, values in parts:
+        grids[k].append(values)
+
+    empty = np.empty((len(runs), 0), dtype=np.str_)
+    return [np.concatenate(g, axis=1) if g else empty for g in grids]
+
+
+def _render_jobs(
+    render: Callable[..., NDArray[np.str_]],
+    jobs: list[tuple[int, str | None, str | None, str]],
+) -> list[tuple[int, NDArray[np.str_]]]:
+    parts = []
+
+    for k, group in groupby(jobs, key=itemgetter(0)):
+        group_ = list(group)
+        _, func, ref, _ = group_[0]
+        names = [name for *_, name in group_]
+        parts.append((k, render(func, ref, names)))
+
+    return parts
+
+
+def _render_grid(
+    counts: NDArray[np.intp],
+    array: NDArray[np.int64],
+    prefix: str,
+    func: str | None,
+    ref: str | None,
+    names: list[str],
+    *,
+    option: int,
+    formula: bool,
+) -> NDArray[np.str_]:
+    first = np.r_[0, np.cumsum(counts)[:-1]].astype(np.intp)
+
+    names_ = np.array(names, dtype=np.dtypes.StringDType())[np.newaxis, :]
+    starts = array[:, 0].astype(np.dtypes.StringDType())[:, np.newaxis]
+
+    if func == "first":
+        return _wrap(prefix + names_ + starts[first], formula)
+
+    ends = array[:, 1].astype(np.dtypes.StringDType())[:, np.newaxis]
+    single = (array[:, 0] == array[:, 1])[:, np.newaxis]
+    addresses = prefix + names_ + starts + np.where(single, "", ":" + names_ + ends)
+
+    column = addresses[first]
+    for k in range(1, int(counts.max(initial=1))):
+        index = counts > k
+        column[index] = column[index] + "," + addresses[first[index] + k]
+
+    return _wrap(_aggregate_grid(func, ref, column, option), formula)
+
+
+def _aggregate_grid(
+    func: str | None,
+    ref: str | None,
+    column: NDArray[Any],
+    option: int,
+) -> NDArray[Any]:
+    if ref is not None:
+        lookup = f"LOOKUP({ref},{{{AGG_FUNC_NAMES}}},{{{AGG_FUNC_INTS}}})"
+        soa = _aggregate_grid("soa", None, column, option)
+        agg = f"AGGREGATE({lookup},{option}," + column + ")"
+        return f'IF({ref}="soa",' + soa + "," + agg + ")"
+
+    if func is None:
+        return column
+
+    if func == "soa":
+        std = _aggregate_grid("std", None, column, option)
+        median = _aggregate_grid("median", None, column, option)
+        return std + "/" + median
+
+    if func in AGG_FUNCS:
+        return f"AGGREGATE({AGG_FUNCS[func]},{option}," + column + ")"
+
+    msg = f"Invalid aggregate function: {func}"
+    raise ValueError(msg)
+
+
+def _wrap(values: NDArray[Any], formula: bool) -> NDArray[np.str_]:
+    if formula:
+        values = "=" + values
+
+    width = int(np.strings.str_len(values).max(initial=1))
+    return values.astype(f"<U{width}")
+
+
 # def match_index(ref, sf, columns, column=None, na=False, null=False, error=False):
 #     """
 #     複数条件にマッチするインデックス(列番号 or 行番号、絶対)を返す数式文字列。
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Self
 
 from .range import Range, iter_addresses
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
 
     from xlwings import Sheet
 
@@ -22,6 +22,12 @@ class RangeCollection:
     ) -> None:
         self.ranges = list(_iter_ranges_from_index(row, column, sheet))
 
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[Range]) -> Self:
+        rc = cls.__new__(cls)
+        rc.ranges = list(ranges)
+        return rc
+
     def __repr__(self) -> str:
         cls = self.__class__.__name__
         addr = self.get_address(row_absolute=True, column_absolute=True)
@@ -69,20 +75,48 @@ class RangeCollection:
 
     @property
     def api(self) -> Any:
-        api = self.ranges[0].api
-
         if len(self.ranges) == 1:
-            return api
+            return self.ranges[0].api
 
         sheet = self.ranges[0].sheet
+        addresses = self.iter_addresses(row_absolute=False, column_absolute=False)
+        apis = [sheet.api.Range(a) for a in join_addresses(addresses)]
+
+        api = apis[0]
         union = sheet.book.app.api.Union
 
-        for r in self.ranges[1:]:
-            api = union(api, r.api)
+        for a in apis[1:]:
+            api = union(api, a)
 
         return api
 
 
+def join_addresses(addresses: Iterable[str], max_length: int = 255) -> Iterator[str]:
+    """Join the addresses by commas into strings up to the maximum length.
+
+    Excel refuses an address string longer than 255 characters, so that
+    a multi-area range is built from as few strings as possible and the
+    strings are combined by `Union`.
+
+    Examples:
+        >>> list(join_addresses(["A1", "B2:C3", "D4"], 8))
+        ['A1,B2:C3', 'D4']
+    """
+    chunk = ""
+
+    for addr in addresses:
+        if not chunk:
+            chunk = addr
+        elif len(chunk) + len(addr) + 1 <= max_length:
+            chunk = f"{chunk},{addr}"
+        else:
+            yield chunk
+            chunk = addr
+
+    if chunk:
+        yield chunk
+
+
 def _iter_ranges_from_index(
     row: int | Sequence[int | tuple[int, int]],
     column: int | Sequence[int | tuple[int, int]],
@@ -9,6 +9,7 @@ from xlviews.config import rcParams
 from xlviews.core.formula import aggregate
 from xlviews.core.range import Range
 from xlviews.style import (
+    delete_color_scale,
     set_alignment,
     set_border,
     set_color_scale,
@@ -16,6 +17,8 @@ from xlviews.style import (
     set_number_format,
 )
 
+from .style import bake_color_scale
+
 if TYPE_CHECKING:
     from xlwings import Sheet
 
@@ -122,18 +125,35 @@ class Colorbar:
         vmax = self.vmax.get_address()
 
         n = self.end - self.start - 1
-        for i in range(n):
-            value = f"={vmax}+{i + 1}*({vmin}-{vmax})/{n + 1}"
-            if self.orientation == "vertical":
-                rng = self.sheet.range(self.start + i + 1, self.offset)
-            else:
-                rng = self.sheet.range(self.offset, self.start + i + 1)
-
-            rng.value = value
-            set_font(rng, size=4)
-            set_number_format(rng, "0")
-
-    def apply(self, rng: Range) -> None:
+        if n <= 0:
+            return
+
+        values = [f"={vmax}+{i + 1}*({vmin}-{vmax})/{n + 1}" for i in range(n)]
+
+        if self.orientation == "vertical":
+            start, end = (self.start + 1, self.offset), (self.end - 1, self.offset)
+            values = [[value] for value in values]
+        else:
+            start, end = (self.offset, self.start + 1), (self.offset, self.end - 1)
+
+        rng = Range(start, end, self.sheet)
+        rng.value = values
+        set_font(rng, size=4)
+        set_number_format(rng, "0")
+
+    def apply(self, rng: Range, *, bake: bool = False) -> None:
+        """Apply the color scale of the colorbar to the range.
+
+        If bake is True, the cells are filled with static colors computed
+        from the current values and limits, replacing any color scale
+        conditions of the range.
+        """
+        if bake:
+            delete_color_scale(rng)
+            values = rng.impl.options(ndim=2).value
+            bake_color_scale(rng, values, self.vmin.value, self.vmax.value)
+            return
+
         set_color_scale(rng, self.vmin, self.vmax)
 
     def autofit(self) -> Self:
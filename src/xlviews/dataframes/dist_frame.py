@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from itertools import product
+from typing import TYPE_CHECKING, Literal
 
 import numpy as np
 from pandas import DataFrame, Index
 
+from xlviews.core.address import index_to_column_name
 from xlviews.core.range import Range
+from xlviews.style_plan import StylePlan
 from xlviews.utils import iter_columns, suspend_screen_updates
 
 from .sheet_frame import SheetFrame
+from .style import to_numeric
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import ArrayLike, NDArray
+    from xlwings import Sheet
 
 
 class DistFrame(SheetFrame):
@@ -21,7 +30,28 @@ class DistFrame(SheetFrame):
         columns: str | list[str] | None = None,
         by: str | list[str] | None = None,
         dist: str | dict[str, str] = "norm",
+        *,
+        mode: Literal["formula", "spill", "static"] = "formula",
     ) -> None:
+        """Create the cumulative distribution of the parent columns.
+
+        Args:
+            parent (SheetFrame): The frame of the values.
+            columns (str, list of str, optional): The columns of the parent
+                to create the distributions of. All the columns if None.
+            by (str, list of str, optional): The index names to group by.
+            dist (str, dict): The distribution, "norm" or "weibull", of
+                all the columns or of each column.
+            mode (str): "formula" to write live formulas that follow the
+                parent values. "spill" to write one dynamic array formula
+                per group and column, which needs Excel with dynamic
+                arrays. "static" to compute the ranks, sorted values,
+                and quantiles in NumPy and write plain values.
+        """
+        if mode not in {"formula", "spill", "static"}:
+            msg = f"Invalid mode: {mode}"
+            raise ValueError(msg)
+
         if columns is None:
             columns = parent.columns.to_list()
         elif isinstance(columns, str):
@@ -33,52 +63,65 @@ class DistFrame(SheetFrame):
         column = parent.column + parent.width + 1
         by = list(iter_columns(parent.index.names, by)) if by else []
         index = select_index(parent.index, by)
-        data = get_init_data(index, columns)
-
-        super().__init__(row, column, data, parent.sheet)
 
-        self.set_values(parent, columns, by)
+        runs = []
+        for run in parent.groupby(by).values():
+            if len(run) != 1:
+                msg = "group must be continuous"
+                raise ValueError(msg)
+            runs.append(run[0])
+
+        if mode == "static":
+            offset = parent.row + parent.columns.nlevels
+            runs = [(s - offset, e - offset) for s, e in runs]
+            values = parent.value.reset_index()[columns]
+            data = get_static_data(index, values, runs, self.dist_func)
+
+        else:
+            idx = parent.get_indexer(columns)
+            start = column + index.nlevels
+            get_data = get_spill_data if mode == "spill" else get_formula_data
+            data = get_data(index, columns, runs, idx, start, self.dist_func)
+
+        if mode == "spill":
+            empty = DataFrame(None, index=data.index, columns=data.columns)
+            super().__init__(row, column, empty, parent.sheet)
+            self.set_spill_formulas(data)
+
+        else:
+            super().__init__(row, column, data, parent.sheet)
+
+        self.set_number_formats(parent, columns)
         self.style()
         self.autofit()
 
-    def set_values(
-        self,
-        parent: SheetFrame,
-        columns: list[str],
-        by: list[str],
-    ) -> None:
-        group = parent.groupby(by)
-        parent_columns = parent.get_indexer(columns)
-        self_columns = self.get_indexer([c + "_n" for c in columns])
+    def set_spill_formulas(self, data: DataFrame) -> None:
+        """Write the dynamic array formulas of the values at once."""
+        row = self.row + self.columns.nlevels
+        column = self.column + self.index.nlevels
+        end = row + len(data) - 1, column + len(data.columns) - 1
+        rng = Range((row, column), end, self.sheet)
+        rng.api.Formula2 = data.to_numpy().tolist()
 
-        it = zip(parent_columns, self_columns, columns, strict=True)
-        for parent_column, self_column, column in it:
-            dist = self.dist_func[column]
+    def set_number_formats(self, parent: SheetFrame, columns: list[str]) -> None:
+        """Apply the number formats of the parent columns to the values.
 
-            for row in group.values():
-                if len(row) != 1:
-                    msg = "group must be continuous"
-                    raise ValueError(msg)
-
-                start = row[0][0]
-                length = row[0][1] - start + 1
-
-                parent_cell = Range((start, parent_column), sheet=parent.sheet)
-                self_cell = Range((start, self_column), sheet=self.sheet)
-
-                formula = counter(parent_cell)
-                set_formula(self_cell, length, formula)
+        The columns with the same number format are applied at once.
+        """
+        start = parent.row + parent.columns.nlevels
+        idx = parent.get_indexer(columns)
+        formats = get_number_formats(parent.sheet, start, idx)
 
-                formula = sorted_value(parent_cell, self_cell, length)
-                set_formula(self_cell.offset(0, 1), length, formula)
+        row = self.row + self.columns.nlevels
+        end = row + len(self) - 1
+        vs = self.get_indexer([f"{column}_v" for column in columns])
 
-                formula = sigma_value(self_cell, length, dist)
-                set_formula(self_cell.offset(0, 2), length, formula)
+        plan = StylePlan()
+        for v, fmt in zip(vs, formats, strict=True):
+            plan.number_format(Range((row, v), (end, v), self.sheet), fmt)
+            plan.number_format(Range((row, v + 1), (end, v + 1), self.sheet), "0.00")
 
-        idx = parent.get_indexer(columns)
-        for column, i in zip(columns, idx, strict=True):
-            fmt = parent.sheet.range(parent.row + 1, i).number_format
-            self.number_format({f"{column}_v": fmt, f"{column}_s": "0.00"})
+        plan.apply()
 
     # def plot(
     #     self,
@@ -192,10 +235,293 @@ def select_index(index: Index, names: list[str]) -> Index:
     return index
 
 
-def get_init_data(index: Index, columns: list[str]) -> DataFrame:
-    columns = [f"{c}_{suffix}" for c, suffix in product(columns, ["n", "v", "s"])]
-    array = np.zeros((len(index), len(columns)))
-    return DataFrame(array, index=index, columns=columns)
+def get_formula_data(
+    index: Index,
+    columns: list[str],
+    runs: Sequence[tuple[int, int]],
+    parent_columns: Sequence[int],
+    column: int,
+    dist: str | dict[str, str] = "norm",
+) -> DataFrame:
+    """Return the formulas of all the cells of a DistFrame.
+
+    The formulas are the same as `counter`, `sorted_value`, and
+    `sigma_value` filled down each run, with the relative row references
+    resolved for every cell, so that the block is written at once.
+
+    Args:
+        index (Index): The index of the DistFrame.
+        columns (list of str): The names of the parent columns.
+        runs (list of tuple): The first and last rows of the groups.
+        parent_columns (list of int): The columns of the parent values.
+        column (int): The first value column of the DistFrame.
+        dist (str, dict): The distribution of each column.
+
+    Examples:
+        >>> df = get_formula_data(Index([0, 1]), ["a"], [(3, 4)], [2], 5)
+        >>> df.columns.to_list()
+        ['a_n', 'a_v', 'a_s']
+        >>> df.iloc[1, 0]
+        '=AGGREGATE(3,1,$B$3:$B4)'
+        >>> df.iloc[1, 1]
+        '=IF($E4>0,AGGREGATE(15,1,$B$3:$B$4,$E4),NA())'
+        >>> df.iloc[1, 2]
+        '=IF($E4>0,NORM.S.INV($E4/($E$4+1)),NA())'
+    """
+    dist_func = get_dist_func(dist, columns)
+    runs = sorted(runs)
+
+    values = {}
+    for k, (name, pc) in enumerate(zip(columns, parent_columns, strict=True)):
+        p = index_to_column_name(pc)
+        c = index_to_column_name(column + 3 * k)
+        sigma = get_sigma_template(dist_func[name])
+        n, v, s = [], [], []
+
+        for first, last in runs:
+            start, end = f"${p}${first}", f"${p}${last}"
+
+            for row in range(first, last + 1):
+                small = f"${c}{row}"
+                n.append(COUNTER.format(start=start, end=f"${p}{row}"))
+                v.append(SORTED_VALUE.format(start=start, end=end, small=small))
+                s.append(sigma.format(small=small, end=f"${c}${last}"))
+
+        values.update({f"{name}_n": n, f"{name}_v": v, f"{name}_s": s})
+
+    return DataFrame(values, index=index)
+
+
+def get_static_data(
+    index: Index,
+    values: DataFrame,
+    runs: Sequence[tuple[int, int]],
+    dist: str | dict[str, str] = "norm",
+) -> DataFrame:
+    """Return the values that the formulas of a DistFrame evaluate to.
+
+    The count, the sorted value, and the quantile of each row are
+    computed in NumPy for all the groups at once. The missing values
+    are not counted, and the rows before the first value of a group
+    are #N/A as in the formula mode. Unlike `AGGREGATE`, hidden rows
+    are not ignored.
+
+    Args:
+        index (Index): The index of the DistFrame.
+        values (DataFrame): The parent values of the columns.
+        runs (list of tuple): The first and last positions of the groups
+            in the values.
+        dist (str, dict): The distribution of each column.
+
+    Examples:
+        >>> values = DataFrame({"a": [3, None, 1, 5, 4]})
+        >>> df = get_static_data(Index(range(5)), values, [(0, 2), (3, 4)])
+        >>> df["a_n"].to_list()
+        [1, 1, 2, 1, 2]
+        >>> df["a_v"].to_list()
+        [1.0, 1.0, 3.0, 4.0, 5.0]
+    """
+    columns = values.columns.to_list()
+    dist_func = get_dist_func(dist, columns)
+
+    runs = sorted(runs)
+    sizes = np.array([e - s + 1 for s, e in runs])
+    group = np.repeat(np.arange(len(runs)), sizes)
+    rows = np.concatenate([np.arange(s, e + 1) for s, e in runs])
+    offset = np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+    data = {}
+    for column in columns:
+        x = to_numeric(values[column].to_numpy())[rows]
+        valid = ~np.isnan(x)
+
+        count = np.cumsum(valid)
+        n = count - np.r_[0, count][offset]
+        total = n[np.cumsum(sizes) - 1][group]
+
+        key = np.where(valid, x, np.inf)
+        sorted_ = key[np.lexsort((key, group))]
+        value = np.where(n > 0, sorted_[offset + n - 1], np.nan)
+
+        p = np.where(n > 0, n / (total + 1), np.nan)
+        sigma = ppf(p, dist_func[column])
+
+        data[f"{column}_n"] = n
+        data[f"{column}_v"] = to_cells(value)
+        data[f"{column}_s"] = to_cells(sigma)
+
+    return DataFrame(data, index=index)
+
+
+def norm_ppf(p: ArrayLike) -> NDArray[np.float64]:
+    """Return the quantiles of the standard normal distribution.
+
+    Acklam's rational approximation with a relative error less than
+    1.15e-9, evaluated for all the probabilities at once.
+
+    Examples:
+        >>> norm_ppf([0.01, 0.5, 0.975]).round(6).tolist()
+        [-2.326348, 0.0, 1.959964]
+    """
+    p = np.asarray(p, dtype=float)
+    x = np.full(p.shape, np.nan)
+
+    low = (p > 0) & (p < P_LOW)
+    high = (p > 1 - P_LOW) & (p < 1)
+    mid = (p >= P_LOW) & (p <= 1 - P_LOW)
+
+    q = np.sqrt(-2 * np.log(np.where(low, p, 1.0)))
+    x[low] = _tail(q)[low]
+
+    q = np.sqrt(-2 * np.log(np.where(high, 1 - p, 1.0)))
+    x[high] = -_tail(q)[high]
+
+    q = p[mid] - 0.5
+    r = q * q
+    num = np.polyval(ACKLAM_A, r) * q
+    x[mid] = num / np.polyval([*ACKLAM_B, 1.0], r)
+
+    x[p == 0] = -np.inf
+    x[p == 1] = np.inf
+    return x
+
+
+P_LOW = 0.02425
+
+ACKLAM_A = [
+    -3.969683028665376e01,
+    2.209460984245205e02,
+    -2.759285104469687e02,
+    1.383577518672690e02,
+    -3.066479806614716e01,
+    2.506628277459239e00,
+]
+ACKLAM_B = [
+    -5.447609879822406e01,
+    1.615858368580409e02,
+    -1.556989798598866e02,
+    6.680131188771972e01,
+    -1.328068155288572e01,
+]
+ACKLAM_C = [
+    -7.784894002430293e-03,
+    -3.223964580411365e-01,
+    -2.400758277161838e00,
+    -2.549732539343734e00,
+    4.374664141464968e00,
+    2.938163982698783e00,
+]
+ACKLAM_D = [
+    7.784695709041462e-03,
+    3.224671290700398e-01,
+    2.445134137142996e00,
+    3.754408661907416e00,
+]
+
+
+def _tail(q: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.polyval(ACKLAM_C, q) / np.polyval([*ACKLAM_D, 1.0], q)
+
+
+def ppf(p: ArrayLike, dist: str) -> NDArray[np.float64]:
+    """Return the coordinates of the probabilities on the probability plot.
+
+    Examples:
+        >>> ppf([0.5], "norm").tolist()
+        [0.0]
+        >>> ppf([1 - np.exp(-1)], "weibull").round(12).tolist()
+        [0.0]
+    """
+    get_sigma_template(dist)
+    p = np.asarray(p, dtype=float)
+
+    if dist == "norm":
+        return norm_ppf(p)
+
+    return np.log(-np.log(1 - p))
+
+
+def to_cells(values: NDArray[np.float64]) -> list[float | str]:
+    """Return the values to write, with #N/A for NaN as `NA()` does."""
+    return ["=NA()" if np.isnan(v) else float(v) for v in values]
+
+
+def get_spill_data(
+    index: Index,
+    columns: list[str],
+    runs: Sequence[tuple[int, int]],
+    parent_columns: Sequence[int],
+    column: int,
+    dist: str | dict[str, str] = "norm",
+) -> DataFrame:
+    """Return the dynamic array formulas of a DistFrame.
+
+    The first row of each group has one formula per column that spills
+    down over the group, and the other cells are empty. The values are
+    the same as `get_formula_data`, except that hidden rows are counted.
+
+    Args:
+        index (Index): The index of the DistFrame.
+        columns (list of str): The names of the parent columns.
+        runs (list of tuple): The first and last rows of the groups.
+        parent_columns (list of int): The columns of the parent values.
+        column (int): The first value column of the DistFrame.
+        dist (str, dict): The distribution of each column.
+
+    Examples:
+        >>> df = get_spill_data(Index([0, 1]), ["a"], [(3, 4)], [2], 5)
+        >>> df.iloc[0, 0]
+        '=MMULT(--(SEQUENCE(2)>=SEQUENCE(1,2)),--($B$3:$B$4<>""))'
+        >>> df.iloc[0, 1]
+        '=IF($E$3#>0,SMALL($B$3:$B$4,$E$3#),NA())'
+        >>> df.iloc[0, 2]
+        '=IF($E$3#>0,NORM.S.INV($E$3#/(MAX($E$3#)+1)),NA())'
+        >>> df.iloc[1].to_list()
+        ['', '', '']
+    """
+    dist_func = get_dist_func(dist, columns)
+    runs = sorted(runs)
+
+    values = {}
+    for k, (name, pc) in enumerate(zip(columns, parent_columns, strict=True)):
+        p = index_to_column_name(pc)
+        c = index_to_column_name(column + 3 * k)
+        sigma = get_sigma_template(dist_func[name])
+        n, v, s = [], [], []
+
+        for first, last in runs:
+            length = last - first + 1
+            rng = f"${p}${first}:${p}${last}"
+            small = f"${c}${first}#"
+
+            n.append(SPILL_COUNTER.format(length=length, range=rng))
+            v.append(SPILL_SORTED_VALUE.format(range=rng, small=small))
+            s.append(sigma.format(small=small, end=f"MAX({small})"))
+
+            empty = [""] * (length - 1)
+            n.extend(empty)
+            v.extend(empty)
+            s.extend(empty)
+
+        values.update({f"{name}_n": n, f"{name}_v": v, f"{name}_s": s})
+
+    return DataFrame(values, index=index)
+
+
+def get_number_formats(sheet: Sheet, row: int, columns: Sequence[int]) -> list[str]:
+    """Return the number formats of the cells in the row.
+
+    The formats are read at once if all the cells in the span of the
+    columns have the same format.
+    """
+    if not len(columns):
+        return []
+
+    rng = sheet.range((row, min(columns)), (row, max(columns)))
+    if isinstance(fmt := rng.number_format, str):
+        return [fmt] * len(columns)
+
+    return [sheet.range(row, c).number_format for c in columns]
 
 
 def get_dist_func(dist: str | dict[str, str], columns: list[str]) -> dict[str, str]:
@@ -209,31 +535,42 @@ def get_dist_func(dist: str | dict[str, str], columns: list[str]) -> dict[str, s
     return dist
 
 
+COUNTER = "=AGGREGATE(3,1,{start}:{end})"
+SORTED_VALUE = "=IF({small}>0,AGGREGATE(15,1,{start}:{end},{small}),NA())"
+SIGMA_VALUE = {
+    "norm": "=IF({small}>0,NORM.S.INV({small}/({end}+1)),NA())",
+    "weibull": "=IF({small}>0,LN(-LN(1-{small}/({end}+1))),NA())",
+}
+
+SPILL_COUNTER = '=MMULT(--(SEQUENCE({length})>=SEQUENCE(1,{length})),--({range}<>""))'
+SPILL_SORTED_VALUE = "=IF({small}>0,SMALL({range},{small}),NA())"
+
+
+def get_sigma_template(dist: str) -> str:
+    if dist not in SIGMA_VALUE:
+        msg = f"unknown distribution: {dist}"
+        raise ValueError(msg)
+
+    return SIGMA_VALUE[dist]
+
+
 def counter(cell: Range) -> str:
     start = cell.get_address()
     end = cell.get_address(row_absolute=False)
-    return f"=AGGREGATE(3,1,{start}:{end})"
+    return COUNTER.format(start=start, end=end)
 
 
 def sorted_value(parent_cell: Range, cell: Range, length: int) -> str:
     start = parent_cell.get_address()
     end = parent_cell.offset(length - 1).get_address()
     small = cell.get_address(row_absolute=False)
-    return f"=IF({small}>0,AGGREGATE(15,1,{start}:{end},{small}),NA())"
+    return SORTED_VALUE.format(start=start, end=end, small=small)
 
 
 def sigma_value(cell: Range, length: int, dist: str) -> str:
     small = cell.get_address(row_absolute=False)
     end = cell.offset(length - 1).get_address()
-
-    if dist == "norm":
-        return f"=IF({small}>0,NORM.S.INV({small}/({end}+1)),NA())"
-
-    if dist == "weibull":
-        return f"=IF({small}>0,LN(-LN(1-{small}/({end}+1))),NA())"
-
-    msg = f"unknown distribution: {dist}"
-    raise ValueError(msg)
+    return get_sigma_template(dist).format(small=small, end=end)
 
 
 def set_formula(cell: Range, length: int, formula: str) -> None:
@@ -4,17 +4,20 @@ from functools import partial
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
+import pandas as pd
 from pandas import DataFrame, Index, MultiIndex, Series
 from xlwings import Range as RangeImpl
 
-from xlviews.core.formula import Func, aggregate
+from xlviews.core.address import index_to_column_name
+from xlviews.core.formula import Func, aggregate_grid, aggregate_grids
 from xlviews.core.range import Range
-from xlviews.core.range_collection import RangeCollection
 from xlviews.utils import iter_columns
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator, Sequence
 
+    from numpy.typing import NDArray
+
     from .sheet_frame import SheetFrame
 
 
@@ -52,6 +55,106 @@ def create_group_index(
     return dict(sorted(index.items()))
 
 
+def argsort_groups(a: Sequence[Any] | Series | DataFrame) -> NDArray[np.intp]:
+    """Return the indexer that stably sorts the rows by the group keys.
+
+    Rows with equal keys keep their original order, so that every group
+    becomes one contiguous block in the order of the sorted keys.
+
+    Examples:
+        >>> argsort_groups([2, 1, 2, 1, 3]).tolist()
+        [1, 3, 0, 2, 4]
+    """
+    df = a if isinstance(a, DataFrame) else DataFrame(a)
+    codes = [pd.factorize(df[c], sort=True)[0] for c in df.columns]
+    return np.lexsort(codes[::-1])
+
+
+def count_runs(index: dict[tuple[Any, ...], list[tuple[int, int]]]) -> int:
+    return sum(len(runs) for runs in index.values())
+
+
+def formula_length(runs: Sequence[tuple[int, int]], column: int) -> int:
+    """Return the length of the absolute address list of the runs.
+
+    Examples:
+        >>> formula_length([(3, 5), (8, 8)], 3)
+        14
+        >>> len("$C$3:$C$5,$C$8")
+        14
+    """
+    name = len(index_to_column_name(column)) + 2
+    length = len(runs) - 1
+
+    for start, end in runs:
+        length += name + len(str(start))
+        if start != end:
+            length += name + len(str(end)) + 1
+
+    return length
+
+
+class Fragmentation:
+    """The number of row runs and the address length before and after sorting.
+
+    Every run of a group becomes another range in its `RangeCollection`
+    and another reference in its `AGGREGATE` formula.
+    """
+
+    fragments: tuple[int, int]
+    length: tuple[int, int]
+
+    def __init__(
+        self,
+        before: dict[tuple[Any, ...], list[tuple[int, int]]],
+        after: dict[tuple[Any, ...], list[tuple[int, int]]],
+        column: int,
+    ) -> None:
+        def length(index: dict[tuple[Any, ...], list[tuple[int, int]]]) -> int:
+            return sum(formula_length(runs, column) for runs in index.values())
+
+        self.fragments = count_runs(before), count_runs(after)
+        self.length = length(before), length(after)
+
+    def __repr__(self) -> str:
+        cls = self.__class__.__name__
+        fragments = "->".join(map(str, self.fragments))
+        length = "->".join(map(str, self.length))
+        return f"<{cls} fragments={fragments} length={length}>"
+
+
+def sort_groups(
+    data: DataFrame,
+    by: str | list[str],
+    row: int,
+    column: int,
+) -> tuple[DataFrame, Fragmentation]:
+    """Stably sort the rows of the data so that every group is contiguous.
+
+    Args:
+        data (DataFrame): The data to be written to the sheet.
+        by (str, list of str): The index names to be grouped by.
+        row (int): The row of the first data row on the sheet.
+        column (int): The column used to measure the address length.
+
+    Returns:
+        The sorted data and the fragmentation before and after sorting.
+    """
+    by = list(iter_columns(data.index.names, by))
+    values = data.index.to_frame()[by]
+
+    before = create_group_index(values)
+    data = data.iloc[argsort_groups(values)]
+    after = create_group_index(data.index.to_frame()[by])
+
+    def offset(
+        index: dict[tuple[Any, ...], list[tuple[int, int]]],
+    ) -> dict[tuple[Any, ...], list[tuple[int, int]]]:
+        return {k: [(s + row, e + row) for s, e in v] for k, v in index.items()}
+
+    return data, Fragmentation(offset(before), offset(after), column)
+
+
 def groupby(
     sf: SheetFrame,
     by: str | list[str] | None,
@@ -130,18 +233,16 @@ class GroupBy:
             column = self.sf.column
             idx = [cs.index(c) + column for c in self.by]
 
-            agg = partial(
-                self._agg,
+            values = self._grid(
                 "first",
+                idx,
                 row_absolute=row_absolute,
                 column_absolute=column_absolute,
                 include_sheetname=include_sheetname,
                 external=external,
                 formula=formula,
             )
-
-            values = {c: agg(i) for c, i in zip(self.by, idx, strict=True)}
-            df = DataFrame(values)
+            df = DataFrame(values, columns=self.by)
 
         if len(self.by) == 1:
             return Index(df.iloc[:, 0], name=self.by[0])
@@ -158,6 +259,8 @@ class GroupBy:
         include_sheetname: bool = False,
         external: bool = False,
         formula: bool = False,
+        *,
+        n_jobs: int | None = None,
     ) -> DataFrame:
         if self.sf.columns.nlevels != 1:
             raise NotImplementedError
@@ -181,35 +284,38 @@ class GroupBy:
             formula=formula,
         )
 
-        agg = partial(
-            self._agg,
+        grids = partial(
+            self._grids,
             row_absolute=row_absolute,
             column_absolute=column_absolute,
             include_sheetname=include_sheetname,
             external=external,
             formula=formula,
+            n_jobs=n_jobs,
         )
 
         if isinstance(func, dict):
-            it = zip(func.values(), idx, strict=True)
-            values = np.array([list(agg(f, i)) for f, i in it]).T
+            specs = [(f, [i]) for f, i in zip(func.values(), idx, strict=True)]
+            values = np.column_stack([v[:, 0] for v in grids(specs)])
             return DataFrame(values, index=index, columns=columns)
 
         if func is None or isinstance(func, str | Range | RangeImpl):
-            values = np.array([list(agg(func, i)) for i in idx]).T
+            values = grids([(func, idx)])[0]
             return DataFrame(values, index=index, columns=columns)
 
-        values = np.array([list(agg(f, i)) for i in idx for f in func]).T
+        values = np.stack(grids([(f, idx) for f in func]), axis=2)
+        values = values.reshape(len(values), -1)
         columns_ = MultiIndex.from_tuples([(c, f) for c in columns for f in func])
         return DataFrame(values, index=index, columns=columns_)
 
-    def _agg(self, func: Func, column: int, **kwargs: Any) -> Iterator[str]:
-        if func == "first":
-            func = None
-            for row in self.values():
-                rng = Range((row[0][0], column), sheet=self.sf.sheet)
-                yield aggregate(func, rng, **kwargs)
-        else:
-            for row in self.values():
-                rng = RangeCollection(row, column, self.sf.sheet)
-                yield aggregate(func, rng, **kwargs)
+    def _grid(self, func: Func, columns: Sequence[int], **kwargs: Any) -> NDArray:
+        runs = list(self.values())
+        return aggregate_grid(func, runs, columns, sheet=self.sf.sheet, **kwargs)
+
+    def _grids(
+        self,
+        specs: Sequence[tuple[Func, Sequence[int]]],
+        **kwargs: Any,
+    ) -> list[NDArray]:
+        runs = list(self.values())
+        return aggregate_grids(specs, runs, sheet=self.sf.sheet, **kwargs)
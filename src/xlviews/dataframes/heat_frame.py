@@ -1,31 +1,49 @@
 from __future__ import annotations
 
+import warnings
+from functools import partial
 from typing import TYPE_CHECKING, Any, Literal, Self
 
+import numpy as np
 import pandas as pd
+import xlwings
 from pandas import DataFrame
+from xlwings import Range as RangeImpl
 
+from xlviews.core.facet import FacetIndex, take
 from xlviews.core.formula import aggregate
 from xlviews.core.range import Range
 from xlviews.dataframes.colorbar import Colorbar
-from xlviews.style import set_color_scale, set_font
+from xlviews.style import delete_color_scale, set_color_scale, set_font
+from xlviews.style_plan import StylePlan
 from xlviews.utils import suspend_screen_updates
 
 from .sheet_frame import SheetFrame
-from .style import set_heat_frame_style
+from .style import (
+    add_heat_frame_style,
+    bake_color_scale,
+    set_heat_frame_style,
+    to_numeric,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Hashable, Iterator, Sequence
 
+    from numpy.typing import NDArray
     from xlwings import Sheet
 
     from xlviews.colors import Color
 
 
+type Reduce = Literal["mean", "max", "min", "sum", "count"]
+
+
 class HeatFrame(SheetFrame):
     index: pd.Index[Any]
     columns: pd.Index[str]
     range: Range
+    source: DataFrame | None = None
+    tile: tuple[int, int] | None = None
 
     @suspend_screen_updates
     def __init__(
@@ -36,27 +54,53 @@ class HeatFrame(SheetFrame):
         sheet: Sheet | None = None,
         vmin: float | str | Range | None = None,
         vmax: float | str | Range | None = None,
+        *,
+        write: bool = True,
+        bake: bool = False,
     ) -> None:
         data = clean_data(data)
 
-        super().__init__(row, column, data, sheet)
+        super().__init__(row, column, data, sheet, write=write)
 
         self.columns = data.columns  # pyright: ignore[reportIncompatibleVariableOverride]
 
-        start = self.row + 1, self.column + 1
+        start = row + 1, column + 1
         end = start[0] + self.shape[0] - 1, start[1] + self.shape[1] - 1
         self.range = Range(start, end, self.sheet)
 
-        set_heat_frame_style(self)
-        self.set(vmin, vmax)
+        if write:
+            set_heat_frame_style(self)
+            self.set(vmin, vmax, bake=bake)
 
     def set(
         self,
         vmin: float | str | Range | None = None,
         vmax: float | str | Range | None = None,
+        *,
+        bake: bool = False,
     ) -> Self:
+        """Set the color scale of the values.
+
+        Args:
+            vmin: The value of the minimum color. The minimum of the values
+                if None.
+            vmax: The value of the maximum color. The maximum of the values
+                if None.
+            bake: Whether to fill the cells with static colors computed
+                from the current values instead of a conditional format,
+                which Excel reevaluates on every recalculation. The color
+                scale conditions of the range are deleted.
+        """
         rng = self.range
 
+        if bake:
+            delete_color_scale(rng)
+            values = rng.impl.options(ndim=2).value
+            vmin = resolve_limit(vmin, "min", self.sheet)
+            vmax = resolve_limit(vmax, "max", self.sheet)
+            bake_color_scale(rng, values, vmin, vmax)
+            return self
+
         if vmin is None:
             vmin = aggregate("min", rng)
         if vmax is None:
@@ -100,6 +144,86 @@ class HeatFrame(SheetFrame):
         cb.set(vmin, vmax, label, autofit)
         return cb
 
+    @classmethod
+    def tiled(
+        cls,
+        row: int,
+        column: int,
+        data: DataFrame,
+        tile: int | tuple[int, int],
+        func: Reduce = "mean",
+        sheet: Sheet | None = None,
+        vmin: float | str | Range | None = None,
+        vmax: float | str | Range | None = None,
+        *,
+        bake: bool = False,
+    ) -> Self:
+        """Create a HeatFrame of the matrix reduced over tiles.
+
+        Only the reduced matrix is written to the sheet, so that the
+        number of cells scales with the number of tiles. The function
+        and the tile size are written to the top-left cell, and the data
+        is kept in Python to create the detail view of a tile with
+        `detail`. The detail view is not linked in the workbook: it is
+        written when `detail` is called, and is not updated by selecting
+        a tile in Excel.
+
+        Args:
+            row (int): The row index of the top-left cell.
+            column (int): The column index of the top-left cell.
+            data (DataFrame): The numeric matrix to reduce.
+            tile (int, tuple of int): The number of rows and columns of
+                a tile. An int for square tiles.
+            func (str): The reduction over a tile: "mean", "max", "min",
+                "sum", or "count" of the values.
+            sheet (Sheet, optional): The sheet object.
+            vmin: The value of the minimum color.
+            vmax: The value of the maximum color.
+            bake (bool): Whether to fill the cells with static colors.
+        """
+        data = clean_data(data)
+        reduced = block_reduce(data, tile, func)
+
+        frame = cls(row, column, reduced, sheet, vmin, vmax, bake=bake)
+        frame.source = data
+        frame.tile = to_tile(tile)
+        frame.cell.value = "{} {}x{}".format(func, *frame.tile)
+        return frame
+
+    def detail(
+        self,
+        i: int,
+        j: int,
+        row: int,
+        column: int,
+        sheet: Sheet | None = None,
+        vmin: float | str | Range | None = None,
+        vmax: float | str | Range | None = None,
+        *,
+        bake: bool = False,
+    ) -> Self:
+        """Create a HeatFrame of a tile at full resolution.
+
+        Args:
+            i (int): The position of the tile in the rows of the frame.
+            j (int): The position of the tile in the columns of the frame.
+            row (int): The row index of the top-left cell of the detail.
+            column (int): The column index of the top-left cell of the detail.
+            sheet (Sheet, optional): The sheet object. The sheet of the
+                frame if None.
+            vmin: The value of the minimum color.
+            vmax: The value of the maximum color.
+            bake (bool): Whether to fill the cells with static colors.
+        """
+        if self.source is None or self.tile is None:
+            msg = "The frame is not tiled."
+            raise ValueError(msg)
+
+        kr, kc = self.tile
+        data = self.source.iloc[i * kr : (i + 1) * kr, j * kc : (j + 1) * kc]
+        sheet = sheet or self.sheet
+        return self.__class__(row, column, data, sheet, vmin, vmax, bake=bake)
+
     @classmethod
     def facet(
         cls,
@@ -109,11 +233,89 @@ class HeatFrame(SheetFrame):
         index: str | list[str] | None = None,
         columns: str | list[str] | None = None,
         padding: tuple[int, int] = (2, 1),
+        vmin: float | str | Range | None = None,
+        vmax: float | str | Range | None = None,
+        *,
+        bake: bool = False,
     ) -> Iterator[tuple[dict[Hashable, Any], Self]]:
-        for r, ikey in iterrows(data.index, index, row, padding[0] + 1):
-            for c, ckey in iterrows(data.columns, columns, column, padding[1] + 1):
-                sub = xs(data, ikey, ckey)
-                yield (ikey | ckey), cls(r, c, sub)
+        """Create the HeatFrames of the subsets of the data in a grid.
+
+        All the frames are rendered before the first one is yielded: the
+        values are written as one block, and the styles are applied as
+        one plan. The cells between the frames in the block are cleared.
+        """
+        yield from cls._facet(
+            row,
+            column,
+            data,
+            index,
+            columns,
+            padding,
+            vmin,
+            vmax,
+            bake=bake,
+        )
+
+    @classmethod
+    @suspend_screen_updates
+    def _facet(
+        cls,
+        row: int,
+        column: int,
+        data: DataFrame,
+        index: str | list[str] | None,
+        columns: str | list[str] | None,
+        padding: tuple[int, int],
+        vmin: float | str | Range | None,
+        vmax: float | str | Range | None,
+        *,
+        bake: bool = False,
+    ) -> list[tuple[dict[Hashable, Any], Self]]:
+        items = []
+        subs = []
+
+        rows = FacetIndex(data.index, index)
+        cols = FacetIndex(data.columns, columns)
+
+        for r, ikey, ii in iterrows(rows, row, padding[0] + 1):
+            df = take(data, ii, rows.levels, 0)
+
+            for c, ckey, ci in iterrows(cols, column, padding[1] + 1):
+                sub = clean_data(take(df, ci, cols.levels, 1))
+                items.append(((ikey | ckey), cls(r, c, sub, write=False)))
+                subs.append((r, c, sub))
+
+        if not items:
+            return items
+
+        frames = [frame for _, frame in items]
+        top, left, block = to_block(subs)
+        rng = xlwings.sheets.active.range(top, left).resize(*block.shape)
+        rng.value = block.tolist()
+
+        plan = StylePlan()
+        for frame in frames:
+            add_heat_frame_style(plan, frame)
+        plan.apply()
+
+        if not bake:
+            for frame in frames:
+                frame.set(vmin, vmax)
+            return items
+
+        values = rng.options(ndim=2).value
+        vmin = resolve_limit(vmin, "min", rng.sheet)
+        vmax = resolve_limit(vmax, "max", rng.sheet)
+
+        for frame in frames:
+            i, j = frame.row + 1 - top, frame.column + 1 - left
+            n, m = frame.shape
+            x = [row[j : j + m] for row in values[i : i + n]]
+            delete_color_scale(frame.range)
+            bake_color_scale(frame.range, x, vmin, vmax, plan)
+        plan.apply()
+
+        return items
 
     @classmethod
     def pair(
@@ -127,6 +329,10 @@ class HeatFrame(SheetFrame):
         padding: tuple[int, int] = (2, 1),
         value_name: str = "value",
         axis: Literal[0, 1] | None = None,
+        vmin: float | str | Range | None = None,
+        vmax: float | str | Range | None = None,
+        *,
+        bake: bool = False,
     ) -> Iterator[tuple[dict[Hashable, Any], Self]]:
         if values is None:
             values = data.columns.get_level_values(0).unique().to_list()
@@ -139,10 +345,24 @@ class HeatFrame(SheetFrame):
         nr = row
         nc = column
 
+        fi = FacetIndex(data.columns, 0)
+        facet = partial(
+            cls.facet,
+            index=index,
+            columns=columns,
+            padding=padding,
+            vmin=vmin,
+            vmax=vmax,
+            bake=bake,
+        )
+
         for value in values:
-            sub = xs(data, None, {0: value})
+            if (indices := fi.get({0: value})) is None:
+                raise KeyError(value)
 
-            for key, frame in cls.facet(row, column, sub, index, columns, padding):
+            sub = take(data, indices, [0], 1)
+
+            for key, frame in facet(row, column, sub):
                 yield {value_name: value} | key, frame
                 if axis == 1:
                     nc = max(nc, frame.column + frame.shape[1] + 1 + padding[1])
@@ -153,6 +373,91 @@ class HeatFrame(SheetFrame):
             row = nr
 
 
+def resolve_limit(
+    value: float | str | Range | RangeImpl | None,
+    func: Literal["min", "max"],
+    sheet: Sheet,
+) -> float | None:
+    """Return the limit of a color scale as a number.
+
+    A range is reduced to the minimum or maximum of its values in Python,
+    and a formula is evaluated by the sheet. None is returned as is.
+    """
+    if value is None or isinstance(value, int | float):
+        return value
+
+    if isinstance(value, Range | RangeImpl):
+        impl = value.impl if isinstance(value, Range) else value
+        x = to_numeric(impl.options(ndim=2).value)
+        return float(np.nanmin(x) if func == "min" else np.nanmax(x))
+
+    return float(sheet.api.Evaluate(value.removeprefix("=")))
+
+
+REDUCE = {"mean": np.nanmean, "max": np.nanmax, "min": np.nanmin, "sum": np.nansum}
+
+
+def to_tile(tile: int | tuple[int, int]) -> tuple[int, int]:
+    """Return the number of rows and columns of a tile.
+
+    Examples:
+        >>> to_tile(3)
+        (3, 3)
+        >>> to_tile((2, 0))
+        Traceback (most recent call last):
+        ...
+        ValueError: The tile size must be positive: (2, 0)
+    """
+    kr, kc = (tile, tile) if isinstance(tile, int) else tile
+
+    if kr <= 0 or kc <= 0:
+        msg = f"The tile size must be positive: {tile}"
+        raise ValueError(msg)
+
+    return kr, kc
+
+
+def block_reduce(
+    data: DataFrame,
+    tile: int | tuple[int, int],
+    func: Reduce = "mean",
+) -> DataFrame:
+    """Reduce the matrix over the tiles of the given size.
+
+    The matrix is padded with NaN to a multiple of the tile size. Each
+    tile is labeled by the first row and column labels in it. The missing
+    values are ignored, and a tile without values is NaN, or 0 for "sum"
+    and "count".
+
+    Examples:
+        >>> df = DataFrame(np.arange(20.0).reshape(4, 5))
+        >>> block_reduce(df, 2, "max")
+              0     2     4
+        0   6.0   8.0   9.0
+        2  16.0  18.0  19.0
+        >>> block_reduce(df, (4, 2), "count")
+           0  2  4
+        0  8  8  4
+    """
+    kr, kc = to_tile(tile)
+    n, m = data.shape
+    nr, nc = -(-n // kr), -(-m // kc)
+
+    x = np.full((nr * kr, nc * kc), np.nan)
+    x[:n, :m] = data.to_numpy(dtype=float, na_value=np.nan)
+    x = x.reshape(nr, kr, nc, kc).swapaxes(1, 2).reshape(nr, nc, kr * kc)
+
+    if func == "count":
+        values = np.count_nonzero(~np.isnan(x), axis=2)
+    else:
+        reduce = REDUCE[func]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            values = reduce(x, axis=2)
+
+    return DataFrame(values, index=data.index[::kr], columns=data.columns[::kc])
+
+
 def clean_data(data: DataFrame) -> DataFrame:
     data = data.copy()
 
@@ -167,39 +472,54 @@ def clean_data(data: DataFrame) -> DataFrame:
     return data
 
 
+def to_block(
+    frames: Sequence[tuple[int, int, DataFrame]],
+) -> tuple[int, int, NDArray[np.object_]]:
+    """Return the top-left cell and the values of the block of the frames.
+
+    Each frame is placed at its row and column with the header row and
+    the index column, as `SheetFrame` writes it. The missing values and
+    the cells not covered by any frame are None.
+
+    Examples:
+        >>> df = DataFrame([[1.0, 2.0], [3.0, None]], index=["a", "b"])
+        >>> df.columns = ["x", "y"]
+        >>> top, left, block = to_block([(2, 3, df), (2, 7, df.iloc[:1])])
+        >>> top, left
+        (2, 3)
+        >>> block.tolist()  # doctest: +NORMALIZE_WHITESPACE
+        [[None, 'x', 'y', None, None, 'x', 'y'],
+         ['a', 1.0, 2.0, None, 'a', 1.0, 2.0],
+         ['b', 3.0, None, None, None, None, None]]
+    """
+    top = min(r for r, _, _ in frames)
+    left = min(c for _, c, _ in frames)
+    bottom = max(r + len(df) for r, _, df in frames)
+    right = max(c + df.shape[1] for _, c, df in frames)
+
+    block = np.full((bottom - top + 1, right - left + 1), None, dtype=object)
+
+    for r, c, df in frames:
+        i, j = r - top, c - left
+        n, m = df.shape
+        values = df.astype(object).where(df.notna(), None)
+        block[i, j + 1 : j + m + 1] = df.columns.astype(object)
+        block[i + 1 : i + n + 1, j] = df.index.astype(object)
+        block[i + 1 : i + n + 1, j + 1 : j + m + 1] = values.to_numpy()
+
+    return top, left, block
+
+
 def iterrows(
-    index: pd.Index,
-    levels: int | str | Sequence[int | str] | None,
+    fi: FacetIndex,
     offset: int = 0,
     padding: int = 0,
-) -> Iterator[tuple[int, dict[Hashable, Any]]]:
-    if levels is None:
-        yield offset, {}
-        return
-
-    if isinstance(levels, int | str):
-        levels = [levels]
-
-    if levels:
-        values = {level: index.get_level_values(level) for level in levels}
-        it = DataFrame(values).drop_duplicates().iterrows()
-
-        for k, (i, s) in enumerate(it):
-            if not isinstance(i, int):
-                raise NotImplementedError
-
-            yield i + offset + k * padding, s.to_dict()
-
-
-def xs(
-    df: DataFrame,
-    index: dict[Hashable, Any] | None,
-    columns: dict[Hashable, Any] | None,
-) -> DataFrame:
-    if index:
-        df = df.xs(tuple(index.values()), 0, tuple(index.keys()))  # pyright: ignore[reportAssignmentType]
-
-    if columns:
-        df = df.xs(tuple(columns.values()), 1, tuple(columns.keys()))  # pyright: ignore[reportAssignmentType]
-
-    return df
+) -> Iterator[tuple[int, dict[Hashable, Any], NDArray[np.intp]]]:
+    """Yield the position, the key, and the rows of each facet.
+
+    The position of a facet is the first row of the facet shifted by the
+    offset and by the padding for each preceding facet.
+    """
+    for k, (key, indices) in enumerate(fi):
+        start = int(indices[0]) if len(indices) else 0
+        yield start + offset + k * padding, key, indices
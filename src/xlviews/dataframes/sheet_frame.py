@@ -19,10 +19,12 @@ from xlviews.core.address import index_to_column_name
 from xlviews.core.formula import Func, aggregate
 from xlviews.core.index import Index
 from xlviews.core.range import Range, iter_addresses
+from xlviews.format_rules import clear_rule_set
+from xlviews.format_state import clear_format_state
 from xlviews.style import set_alignment
 from xlviews.utils import suspend_screen_updates
 
-from .groupby import GroupBy
+from .groupby import Fragmentation, GroupBy, sort_groups
 from .style import set_frame_style, set_wide_column_style
 from .table import Table
 
@@ -40,6 +42,7 @@ class SheetFrame:
     index: pd.Index[Any]
     columns: Index
     table: Table | None = None
+    fragmentation: Fragmentation | None = None
 
     @suspend_screen_updates
     def __init__(
@@ -48,6 +51,9 @@ class SheetFrame:
         column: int,
         data: DataFrame,
         sheet: Sheet | None = None,
+        *,
+        sort_by: str | list[str] | None = None,
+        write: bool = True,
     ) -> None:
         """Create a DataFrame on an Excel sheet.
 
@@ -56,13 +62,28 @@ class SheetFrame:
             column (int): The column index of the top-left cell.
             data (DataFrame): The DataFrame to write to the sheet.
             sheet (Sheet, optional): The sheet object.
+            sort_by (str, list of str, optional): The index names to stably
+                sort the rows by before writing, so that every group is
+                one contiguous block. The reduction of row runs and address
+                length is stored in `fragmentation`.
+            write (bool): Whether to write the data to the sheet. False if
+                the caller writes it, e.g., together with other frames in
+                a single block.
         """
         self.sheet = sheet or xlwings.sheets.active
         self.cell = self.sheet.range(row, column)
 
+        if sort_by:
+            start = row + data.columns.nlevels
+            first = column + data.index.nlevels
+            data, self.fragmentation = sort_groups(data, sort_by, start, first)
+
         self.index = data.index
         self.columns = Index(data.columns)
 
+        if not write:
+            return
+
         self.cell.options(DataFrame).value = data
 
         if data.columns.nlevels > 1 and data.index.nlevels == 1:
@@ -522,6 +543,8 @@ class SheetFrame:
         include_sheetname: bool = False,
         external: bool = False,
         formula: bool = False,
+        *,
+        n_jobs: int | None = None,
     ) -> DataFrame:
         if isinstance(aggfunc, list):
             dfs = [
@@ -535,6 +558,7 @@ class SheetFrame:
                     include_sheetname,
                     external,
                     formula,
+                    n_jobs=n_jobs,
                 )
                 for f in aggfunc
             ]
@@ -569,6 +593,7 @@ class SheetFrame:
             include_sheetname=include_sheetname,
             external=external,
             formula=formula,
+            n_jobs=n_jobs,
         )
 
         return data.pivot_table(values, index, columns, aggfunc=lambda x: x)  # pyright: ignore[reportUnknownArgumentType, reportUnknownLambdaType]
@@ -699,6 +724,9 @@ def move(sf: SheetFrame, count: int, direction: str = "down", width: int = 0) ->
         Range: Original cell.
     """
 
+    clear_format_state(sf.sheet)
+    clear_rule_set(sf.sheet)
+
     match direction:
         case "down":
             return _move_down(sf, count)
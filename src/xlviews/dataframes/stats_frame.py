@@ -1,25 +1,37 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from datetime import date
+from difflib import SequenceMatcher
+from itertools import groupby
+from typing import TYPE_CHECKING, Any, Self
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
-from xlwings.constants import Direction
+from xlwings.constants import Direction, InsertFormatOrigin
 
 from xlviews.config import rcParams
 from xlviews.core.formula import AGG_FUNCS
-from xlviews.core.range_collection import RangeCollection
-from xlviews.style import set_font, set_number_format
+from xlviews.core.range import Range
+from xlviews.format_rules import clear_rule_set
+from xlviews.format_state import clear_format_state
+from xlviews.style_plan import StylePlan
 from xlviews.utils import iter_columns, suspend_screen_updates
 
 from .groupby import GroupBy
 from .sheet_frame import SheetFrame
 
 if TYPE_CHECKING:
-    from collections.abc import Hashable
+    from collections.abc import Hashable, Iterator, Sequence
 
 
 class StatsFrame(SheetFrame):
+    parent: SheetFrame
+    funcs: list[str]
+    by: list[str]
+    func_column_name: str
+    keys: list[tuple[Any, ...]]
+
     @suspend_screen_updates
     def __init__(
         self,
@@ -59,6 +71,12 @@ class StatsFrame(SheetFrame):
 
         super().__init__(row, column, data, parent.sheet)
 
+        self.parent = parent
+        self.funcs = funcs
+        self.by = by
+        self.func_column_name = func_column_name
+        self.keys = list(gp.keys())
+
         self.as_table(autofit=False, const_header=True)
         self.style()
 
@@ -70,6 +88,58 @@ class StatsFrame(SheetFrame):
             func = default if default in funcs else funcs[0]
             self.table.auto_filter(func_column_name, func)
 
+    @suspend_screen_updates
+    def refresh(self) -> Self:
+        """Update the statistics to the current rows of the parent SheetFrame.
+
+        Call this after the data and the index of the parent have changed.
+        The rows of the groups that appeared or vanished are inserted or
+        deleted, and only the rows whose formulas have changed are
+        rewritten. The table, the filter, and the styles of the other
+        rows are kept.
+        """
+        n = len(self.funcs)
+        start = self.row + self.columns.nlevels
+        keys = list(GroupBy(self.parent, self.by).keys())
+
+        if ops := diff_groups(self.keys, keys):
+            clear_format_state(self.sheet)
+            clear_rule_set(self.sheet)
+
+            for i, deleted, inserted in reversed(ops):
+                resize_rows(self, start + i * n, deleted * n, inserted * n)
+
+            self.parent.cell = self.parent.cell.offset()  # update cell
+
+        gp = GroupBy(self.parent, self.by)
+        data = get_frame(gp, self.funcs, self.func_column_name)
+        self.index = data.index
+        self.keys = keys
+
+        shape = len(data), self.width
+        rng = self.sheet.range(start, self.column).resize(*shape)
+        formulas = np.array(rng.formula, dtype=object).reshape(shape)
+        values = np.array(rng.options(ndim=2).value, dtype=object).reshape(shape)
+        is_formula = np.vectorize(lambda x: str(x).startswith("="), otypes=[bool])
+        old = np.where(is_formula(formulas), formulas, values)
+        new = data.reset_index().to_numpy(dtype=object)
+
+        norm = np.vectorize(normalize, otypes=[object])
+        changed = (norm(old) != norm(new)).any(axis=1)
+        for s, e in iter_runs(changed):
+            values = new[s : e + 1].tolist()
+            rng[s : e + 1, :].value = values
+
+        funcs = old[:, 0] != new[:, 0]
+        rows = [(s + start, e + start) for s, e in iter_runs(funcs)]
+        if rows:
+            set_style(self, self.parent, self.func_column_name, rows)
+
+        if self.table and self.table.api.ShowAutoFilter:
+            self.table.api.AutoFilter.ApplyFilter()
+
+        return self
+
 
 def get_func(func: str | list[str] | None) -> list[str]:
     if func is None:
@@ -128,36 +198,183 @@ def move_down(sf: SheetFrame, length: int) -> int:
     if has_header(sf):
         end += 1
 
+    clear_format_state(sf.sheet)
+    clear_rule_set(sf.sheet)
+
     rows = sf.sheet.api.Rows(f"{start}:{end}")
     rows.Insert(Shift=Direction.xlDown)
     sf.cell = sf.cell.offset()  # update cell
     return end - start + 1
 
 
-def set_style(sf: SheetFrame, parent: SheetFrame, func_column_name: str) -> None:
+def diff_groups(
+    old: Sequence[tuple[Any, ...]],
+    new: Sequence[tuple[Any, ...]],
+) -> list[tuple[int, int, int]]:
+    """Return the positions where the groups are deleted or inserted.
+
+    Each item is the position in the old groups, the number of the
+    deleted groups, and the number of the inserted groups.
+
+    Examples:
+        >>> diff_groups([("a",), ("b",), ("c",)], [("a",), ("c",), ("d",)])
+        [(1, 1, 0), (3, 0, 1)]
+    """
+    ops = SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+    return [(i1, i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in ops if tag != "equal"]
+
+
+def resize_rows(sf: StatsFrame, row: int, deleted: int, inserted: int) -> None:
+    """Replace the deleted rows of the table with the inserted empty rows.
+
+    Only the cells in the columns of the frame and its parent are deleted
+    or inserted, so that the parent below moves with them and the cells
+    beside them stay in place. The rows appended after the last row are
+    inserted above it instead, to stay inside the table.
+    """
+    column = min(sf.column, sf.parent.column)
+    end = max(sf.column + sf.width, sf.parent.column + sf.parent.width) - 1
+
+    def cells(start: int, n: int) -> Any:
+        return sf.sheet.range((start, column), (start + n - 1, end)).api
+
+    if deleted > inserted:
+        start = row + inserted
+        cells(start, deleted - inserted).Delete(Shift=Direction.xlUp)
+
+    elif inserted > deleted:
+        start = min(row + deleted, sf.row + len(sf))
+        cells(start, inserted - deleted).Insert(
+            Shift=Direction.xlDown,
+            CopyOrigin=InsertFormatOrigin.xlFormatFromRightOrBelow,
+        )
+
+
+def normalize(value: Any) -> Any:
+    """Return the value in a form comparable between Python and Excel.
+
+    Excel returns the numbers as floats, the dates as datetimes, and the
+    empty cells as None.
+
+    Examples:
+        >>> normalize(1), normalize(np.int64(2)), normalize(True), normalize(None)
+        (1.0, 2.0, True, '')
+        >>> normalize(date(2024, 1, 2))
+        Timestamp('2024-01-02 00:00:00')
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+
+    if isinstance(value, bool | np.bool_):
+        return bool(value)
+
+    if isinstance(value, int | float | np.number):
+        return float(value)
+
+    if isinstance(value, date):
+        return pd.Timestamp(value)
+
+    return value
+
+
+def iter_runs(mask: np.ndarray) -> Iterator[tuple[int, int]]:
+    """Yield the first and the last positions of the runs of True.
+
+    Examples:
+        >>> list(iter_runs(np.array([True, True, False, True])))
+        [(0, 1), (3, 3)]
+    """
+    edges = np.diff(np.r_[0, mask.astype(int), 0])
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    for start, end in zip(starts, ends, strict=True):
+        yield int(start), int(end)
+
+
+def clip(
+    runs: list[tuple[int, int]],
+    rows: Sequence[tuple[int, int]] | None,
+) -> list[tuple[int, int]]:
+    """Return the parts of the runs inside the rows.
+
+    Examples:
+        >>> clip([(3, 6), (9, 9)], [(5, 9)])
+        [(5, 6), (9, 9)]
+    """
+    if rows is None:
+        return runs
+
+    it = ((max(s, a), min(e, b)) for s, e in runs for a, b in rows)
+    return [(s, e) for s, e in it if s <= e]
+
+
+def iter_format_runs(formats: Sequence[str | None]) -> Iterator[tuple[int, int, str]]:
+    """Yield the first and the last positions and the format of each run.
+
+    A run is a sequence of the same format. The runs of None are skipped.
+
+    Examples:
+        >>> list(iter_format_runs([None, "0", "0", "0.0", None, "0"]))
+        [(1, 2, '0'), (3, 3, '0.0'), (5, 5, '0')]
+    """
+    start = 0
+    for fmt, group in groupby(formats):
+        end = start + len(list(group)) - 1
+        if fmt:
+            yield start, end, fmt
+        start = end + 1
+
+
+def set_style(
+    sf: SheetFrame,
+    parent: SheetFrame,
+    func_column_name: str,
+    rows: Sequence[tuple[int, int]] | None = None,
+) -> None:
+    """Set the number formats and fonts of the rows of each function.
+
+    The font of a run of rows spans all the columns, and a number format
+    spans the adjacent columns of the same format. The cells that share
+    the same number format, or the same font, are collected across the
+    functions, and each format is applied once to a multi-area range.
+    If the rows are given, only the cells in them are styled.
+    """
 
     def get_number_format(column: Hashable | None) -> str | None:
         if isinstance(column, str):
             return parent.get_number_format(column)
         return None
 
-    idx = [sf.column + i for i in range(sf.index.nlevels + len(sf.columns))]
+    first = sf.column
+    last = sf.column + sf.index.nlevels + len(sf.columns) - 1
     columns = (*parent.index.names, *parent.columns)
     formats = [None, *[get_number_format(column) for column in columns]]
 
-    for (func,), rows in sf.groupby(func_column_name).items():
-        for col, fmt in zip(idx, formats, strict=True):
-            rc = RangeCollection(rows, col, sf.sheet)
+    stats = rcParams.snapshot()["stats"]
+    plan = StylePlan()
+
+    for (func,), runs in sf.groupby(func_column_name).items():
+        color = stats.get(f"{func}.color")
+        italic = stats.get(f"{func}.italic")
+
+        if func in {"median", "min", "mean", "max", "std", "sum"}:
+            func_formats = formats
+        elif func == "soa":
+            func_formats = [None, *["0.0%"] * (len(formats) - 1)]
+        else:
+            func_formats = []
 
-            if func in {"median", "min", "mean", "max", "std", "sum"} and fmt:
-                set_number_format(rc, fmt)
+        for start, end in clip(runs, rows):
+            rng = Range((start, first), (end, last), sf.sheet)
+            plan.font(rng, color=color, italic=italic)
 
-            color = rcParams.get(f"stats.{func}.color")
-            italic = rcParams.get(f"stats.{func}.italic")
-            set_font(rc, color=color, italic=italic)
+            for a, b, fmt in iter_format_runs(func_formats):
+                rng = Range((start, first + a), (end, first + b), sf.sheet)
+                plan.number_format(rng, fmt)
 
-            if func == "soa" and col != idx[0]:
-                set_number_format(rc, "0.0%")
+    column = sf.get_loc(func_column_name)
+    start, end = sf.row + 1, sf.row + len(sf)
+    for s, e in clip([(start, end)], rows):
+        plan.font(Range((s, column), (e, column), sf.sheet), italic=True, layer=1)
 
-    rng = sf.get_range(func_column_name)
-    set_font(rng, italic=True)
+    plan.apply()
@@ -3,28 +3,36 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
+import pandas as pd
 import pywintypes
 from xlwings.constants import TableStyleElementType
 
+from xlviews.colors import rgb
 from xlviews.config import rcParams
+from xlviews.core.range import Range
 from xlviews.style import (
     EVEN_COLOR,
     ODD_COLOR,
     hide_succession,
     hide_unique,
-    set_alignment,
+    interpolate_color_scale,
     set_banding,
     set_border,
-    set_fill,
-    set_font,
+    set_font_api,
 )
+from xlviews.style_plan import StylePlan
 from xlviews.utils import iter_group_locs, suspend_screen_updates
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from numpy.typing import NDArray
     from pandas import Index
-    from xlwings import Range, Sheet
+    from xlwings import Book, Sheet
+    from xlwings import Range as RangeImpl
 
     from xlviews.colors import Color
 
@@ -33,31 +41,131 @@ if TYPE_CHECKING:
     from .table import Table
 
 
-def _set_style(
-    start: Range,
-    end: Range | None,
+FRAME_STYLE_NAMES = [
+    "index.name",
+    "index",
+    "columns.name",
+    "columns",
+    "values",
+    "wide-columns.name",
+    "wide-columns",
+]
+
+
+_style_versions: dict[tuple[str, str], int] = {}
+
+
+def get_style(book: Book, style_name: str) -> Any:
+    """Return the named cell style of the book, or None if missing."""
+    try:
+        return book.api.Styles(style_name)
+    except pywintypes.com_error:
+        return None
+
+
+def register_frame_style(book: Book, name: str, *, update: bool = False) -> str:
+    """Register the named cell style of a frame region in the book.
+
+    The style includes only the fill and the font from `rcParams`, so that
+    applying it keeps the number format, alignment and borders of the cells.
+    The version of `rcParams` the style is built with is cached by the full
+    name of the book, and the style is built again when `rcParams` has
+    changed since, or when the style is missing from the book, e.g., in a
+    new book of the same name. All the cells with the style are restyled
+    at once.
+
+    Args:
+        book: The book to register the style in.
+        name: The region name, e.g., "index" or "columns.name".
+        update: Whether to build the style again even if `rcParams` has
+            not changed since it was built.
+
+    Returns:
+        The name of the style in the book.
+    """
+    style_name = f"xlviews.{name}"
+    key = book.fullname, style_name
+    style = get_style(book, style_name)
+
+    if style is None:
+        style = book.api.Styles.Add(style_name)
+    elif not update and _style_versions.get(key) == rcParams.version:
+        return style_name
+
+    style.IncludeNumber = False
+    style.IncludeAlignment = False
+    style.IncludeBorder = False
+    style.IncludeProtection = False
+    style.IncludeFont = True
+    style.IncludePatterns = True
+
+    style.Interior.Color = rgb(rcParams[f"frame.{name}.fill.color"])
+    set_font_api(
+        style,
+        rcParams["frame.font.name"],
+        size=rcParams["frame.font.size"],
+        bold=rcParams[f"frame.{name}.font.bold"],
+        color=rcParams[f"frame.{name}.font.color"],
+    )
+
+    _style_versions[key] = rcParams.version
+    return style_name
+
+
+def register_frame_styles(book: Book, *, update: bool = False) -> list[str]:
+    """Register the named cell styles of all the frame regions in the book."""
+    return [register_frame_style(book, n, update=update) for n in FRAME_STYLE_NAMES]
+
+
+def _add_style(
+    plan: StylePlan,
+    rng: Range,
     name: str,
     *,
     border: bool = True,
     fill: bool = True,
     font: bool = True,
     font_size: int | None = None,
+    named_style: bool = False,
 ) -> None:
-    rng = start.sheet.range(start, end)
-
     if border:
         edge_color = rcParams["frame.border.color"]
         inside_color = rcParams["frame.border.inside.color"]
-        set_border(rng, edge_color=edge_color, inside_color=inside_color)
+        plan.border(rng, edge_color=edge_color, inside_color=inside_color)
+
+    if fill and font and named_style:
+        plan.style(rng, register_frame_style(rng.sheet.book, name))
+        if font_size:
+            plan.font(rng, size=font_size, layer=1)
+        return
 
     if fill:
-        set_fill(rng, color=rcParams[f"frame.{name}.fill.color"])
+        plan.fill(rng, color=rcParams[f"frame.{name}.fill.color"])
 
     if font:
         color = rcParams[f"frame.{name}.font.color"]
         bold = rcParams[f"frame.{name}.font.bold"]
         size = font_size or rcParams["frame.font.size"]
-        set_font(rng, color=color, bold=bold, size=size)
+        plan.font(rng, color=color, bold=bold, size=size)
+
+
+def _set_style(
+    start: RangeImpl,
+    end: RangeImpl | None,
+    name: str,
+    *,
+    border: bool = True,
+    fill: bool = True,
+    font: bool = True,
+    font_size: int | None = None,
+    named_style: bool = False,
+) -> None:
+    rng = Range.from_range(start.sheet.range(start, end))
+
+    plan = StylePlan()
+    kwargs = {"border": border, "fill": fill, "font": font, "font_size": font_size}
+    _add_style(plan, rng, name, named_style=named_style, **kwargs)
+    plan.apply()
 
 
 @suspend_screen_updates
@@ -71,6 +179,8 @@ def set_frame_style(
     alignment: str | None = "center",
     banding: bool = False,
     succession: bool = False,
+    named_style: bool = True,
+    plan: StylePlan | None = None,
 ) -> None:
     """Set style of SheetFrame.
 
@@ -83,65 +193,70 @@ def set_frame_style(
         alignment: The alignment of the frame.
         banding: Whether to draw the banding.
         succession: Whether to hide the succession of the index.
+        named_style: Whether to set the fill and font of each region by
+            the named cell style of the book. See `register_frame_style`.
+        plan: The style plan to record the border, fill, font and
+            alignment to. If given, the caller applies the plan, so that
+            the identical styles of several frames are set at once.
     """
-    cell = sf.cell
-    sheet = sf.sheet
+    row, column, sheet = sf.row, sf.column, sf.sheet
+
+    def region(r: int, c: int, re: int, ce: int) -> Range:
+        return Range((row + r, column + c), (row + re, column + ce), sheet)
+
+    apply = plan is None
+    if plan is None:
+        plan = StylePlan()
 
-    set_style = partial(
-        _set_style,
+    add_style = partial(
+        _add_style,
+        plan,
         border=border,
         fill=fill,
         font=font,
         font_size=font_size,
+        named_style=named_style,
     )
 
     index_nlevels = sf.index.nlevels
     columns_nlevels = sf.columns.nlevels
     length = len(sf)
 
-    end = cell.offset(columns_nlevels - 1, index_nlevels - 1)
+    top, left = columns_nlevels - 1, index_nlevels - 1
+    bottom, right = top + length, left + len(sf.columns)
+
+    rng = region(0, 0, top, left)
     if columns_nlevels > 1 and index_nlevels == 1:
-        set_style(cell, end, "columns.name")
+        add_style(rng, "columns.name")
     else:
-        set_style(cell, end, "index.name")
+        add_style(rng, "index.name")
 
-    start = cell.offset(columns_nlevels, 0)
-    end = cell.offset(columns_nlevels + length - 1, index_nlevels - 1)
-    set_style(start, end, "index")
+    add_style(region(top + 1, 0, bottom, left), "index")
 
     if succession:
-        rng = sheet.range(start.offset(1, 0), end)
-        hide_succession(rng)
-
-        start = cell.offset(columns_nlevels - 1, 0)
-        end = cell.offset(columns_nlevels - 1, index_nlevels - 1)
-        rng = sheet.range(start, end)
-        hide_unique(rng, length)
+        hide_succession(region(top + 2, 0, bottom, left))
+        hide_unique(region(top, 0, top, left), length)
 
-    width = len(sf.columns)
+    add_style(region(0, left + 1, top, right), "columns")
 
-    start = cell.offset(0, index_nlevels)
-    end = cell.offset(columns_nlevels - 1, index_nlevels + width - 1)
-    set_style(start, end, "columns")
-
-    start = cell.offset(columns_nlevels, index_nlevels)
-    end = cell.offset(columns_nlevels + length - 1, index_nlevels + width - 1)
-    set_style(start, end, "values")
-
-    rng = sheet.range(start, end)
+    rng = region(top + 1, left + 1, bottom, right)
+    add_style(rng, "values")
 
     if banding:
         set_banding(rng)
 
-    rng = sheet.range(cell, end)
+    rng = region(0, 0, bottom, right)
 
     if border:
         ew = rcParams["frame.border.weight"]
         ec = rcParams["frame.border.color"]
-        set_border(rng, edge_weight=ew, inside_weight=0, edge_color=ec)
+        plan.border(rng, edge_weight=ew, inside_weight=0, edge_color=ec, layer=1)
 
     if alignment:
-        set_alignment(rng, alignment)
+        plan.alignment(rng, alignment)
+
+    if apply:
+        plan.apply()
 
 
 def set_wide_column_style(sf: SheetFrame) -> None:
@@ -159,14 +274,14 @@ def set_wide_column_style(sf: SheetFrame) -> None:
         er = edge_weight if column == columns[-1] else 2
         edge_weight_tuple = (2, er, 2, 2)
         set_border(rng, edge_weight_tuple, inside_weight=1, edge_color=edge_color)
-        _set_style(rng, None, "wide-columns", border=False)
+        _set_style(rng, None, "wide-columns", border=False, named_style=True)
 
         rng = sf.sheet.range((sf.row - 1, loc[0]), (sf.row - 1, loc[1]))
 
         el = edge_weight if column == columns[0] else 2
         edge_weight_tuple = (el, edge_weight, edge_weight, 2)
         set_border(rng, edge_weight_tuple, inside_weight=0, edge_color=edge_color)
-        _set_style(rng, None, "wide-columns.name", border=False)
+        _set_style(rng, None, "wide-columns.name", border=False, named_style=True)
 
 
 def set_table_style(
@@ -197,9 +312,13 @@ def set_heat_frame_style(
     font: bool = True,
     font_size: int | None = None,
     alignment: str | None = "center",
+    plan: StylePlan | None = None,
 ) -> None:
     """Set style of SheetFrame.
 
+    The borders and merges of all the index and column groups are
+    collected first and applied as a few multi-area range operations.
+
     Args:
         sf: The SheetFrame object.
         border: Whether to draw the border.
@@ -207,66 +326,183 @@ def set_heat_frame_style(
         font: Whether to specify the font.
         font_size: The font size to specify directly.
         alignment: The alignment of the frame.
+        plan: The style plan to record the styles, merges and borders to.
+            If given, the caller applies the plan.
     """
-    cell = sf.cell
-    sheet = sf.sheet
+    apply = plan is None
+    if plan is None:
+        plan = StylePlan()
 
-    set_style = partial(
-        _set_style,
+    add_heat_frame_style(
+        plan,
+        sf,
         border=border,
         fill=fill,
         font=font,
         font_size=font_size,
+        alignment=alignment,
     )
 
-    index_nlevels = sf.index.nlevels
-    columns_nlevels = sf.columns.nlevels
-    length = len(sf)
+    if apply:
+        plan.apply()
 
-    start = cell.offset(columns_nlevels, 0)
-    end = cell.offset(columns_nlevels + length - 1, index_nlevels - 1)
-    set_style(start, end, "index")
 
-    width = len(sf.columns)
+def add_heat_frame_style(
+    plan: StylePlan,
+    sf: HeatFrame,
+    *,
+    border: bool = True,
+    fill: bool = True,
+    font: bool = True,
+    font_size: int | None = None,
+    alignment: str | None = "center",
+) -> None:
+    """Record the style of HeatFrame to the plan without applying it."""
+    row, column, sheet = sf.row, sf.column, sf.sheet
 
-    start = cell.offset(columns_nlevels - 1, index_nlevels)
-    end = cell.offset(columns_nlevels - 1, index_nlevels + width - 1)
-    set_style(start, end, "index")
+    def region(r: int, c: int, re: int, ce: int) -> Range:
+        return Range((row + r, column + c), (row + re, column + ce), sheet)
 
-    start = cell.offset(columns_nlevels, index_nlevels)
-    end = cell.offset(columns_nlevels + length - 1, index_nlevels + width - 1)
-    set_style(start, end, "values")
+    add_style = partial(
+        _add_style,
+        plan,
+        border=border,
+        fill=fill,
+        font=font,
+        font_size=font_size,
+    )
+
+    top, left = sf.columns.nlevels - 1, sf.index.nlevels - 1
+    bottom, right = top + len(sf), left + len(sf.columns)
 
-    rng = sheet.range(cell, end)
+    add_style(region(top + 1, 0, bottom, left), "index")
+    add_style(region(top, left + 1, top, right), "index")
+    add_style(region(top + 1, left + 1, bottom, right), "values")
 
     if alignment:
-        set_alignment(rng, alignment)
+        plan.alignment(region(0, 0, bottom, right), alignment)
 
-    _merge_index(sf.columns, sf.row, sf.column, 1, sf.sheet)
-    _merge_index(sf.index, sf.row, sf.column, 0, sf.sheet)
-    _set_heat_border(sf)
+    _merge_index(plan, sf.columns, row, column, 1, sheet)
+    _merge_index(plan, sf.index, row, column, 0, sheet)
+    _set_heat_border(plan, sf)
 
 
-def _merge_index(index: Index, row: int, column: int, axis: int, sheet: Sheet) -> None:
+def _merge_index(
+    plan: StylePlan,
+    index: Index,
+    row: int,
+    column: int,
+    axis: int,
+    sheet: Sheet,
+) -> None:
     for start, end in iter_group_locs(index):
         if start == end:
             continue
         if axis == 0:
-            sheet.range((row + start + 1, column), (row + end + 1, column)).merge()
+            rng = Range((row + start + 1, column), (row + end + 1, column), sheet)
         else:
-            sheet.range((row, column + start + 1), (row, column + end + 1)).merge()
+            rng = Range((row, column + start + 1), (row, column + end + 1), sheet)
+        plan.merge(rng, layer=1)
 
 
-def _set_heat_border(sf: HeatFrame) -> None:
+def _set_heat_border(plan: StylePlan, sf: HeatFrame) -> None:
     r = sf.row + 1
     c = sf.column + 1
 
     ec = rcParams["heat.border.color"]
 
-    for row in iter_group_locs(sf.index, offset=r):
-        for col in iter_group_locs(sf.columns, offset=c):
+    rows = list(iter_group_locs(sf.index, offset=r))
+    cols = list(iter_group_locs(sf.columns, offset=c))
+
+    for row in rows:
+        for col in cols:
             if row[0] == row[1] and col[0] == col[1]:
                 continue
 
-            rng = sf.sheet.range((row[0], col[0]), (row[1], col[1]))
-            set_border(rng, edge_weight=2, edge_color=ec, inside_weight=0)
+            rng = Range((row[0], col[0]), (row[1], col[1]), sf.sheet)
+            plan.border(rng, edge_weight=2, edge_color=ec, inside_weight=0, layer=2)
+
+
+def to_numeric(values: Any) -> NDArray[np.float64]:
+    """Return the cell values as floats, with NaN for empty or text cells.
+
+    Examples:
+        >>> to_numeric([[1, None], ["a", 2.5]]).tolist()
+        [[1.0, nan], [nan, 2.5]]
+    """
+    a = np.array(values, dtype=object)
+    return pd.to_numeric(a.ravel(), errors="coerce").astype(float).reshape(a.shape)
+
+
+def iter_color_runs(colors: NDArray[np.int64]) -> Iterator[tuple[int, int, int, int]]:
+    """Yield the row, the first and last columns, and the color of each run.
+
+    A run is a sequence of the same color in a row. The runs of missing
+    colors (-1) are skipped.
+
+    Examples:
+        >>> list(iter_color_runs(np.array([[1, 1, 2], [-1, 3, 3]])))
+        [(0, 0, 1, 1), (0, 2, 2, 2), (1, 1, 2, 3)]
+    """
+    if colors.size == 0:
+        return
+
+    n, m = colors.shape
+    start = np.ones((n, m), dtype=bool)
+    start[:, 1:] = colors[:, 1:] != colors[:, :-1]
+
+    rows, columns = np.nonzero(start)
+    ends = np.r_[columns[1:] - 1, m - 1]
+    ends[np.r_[rows[1:] != rows[:-1], True]] = m - 1
+
+    for r, s, e in zip(rows.tolist(), columns.tolist(), ends.tolist(), strict=True):
+        if (color := int(colors[r, s])) >= 0:
+            yield r, s, e, color
+
+
+def bake_color_scale(
+    rng: Range,
+    values: Any,
+    vmin: float | None = None,
+    vmax: float | None = None,
+    plan: StylePlan | None = None,
+) -> None:
+    """Fill the cells with the static colors of the three-color scale.
+
+    Unlike `set_color_scale`, the colors are not updated when the values
+    change, but Excel does not evaluate them on every recalculation. The
+    runs of the same color in a row are filled as one rectangle, and the
+    rectangles of the same color as one multi-area range. The fills are
+    not recorded in the format state, whose bookkeeping would cost more
+    than the writes of the many small runs.
+
+    Args:
+        rng: The range to fill.
+        values: The 2D values of the cells in the range.
+        vmin: The value of the minimum color. The minimum of the values
+            if None.
+        vmax: The value of the maximum color. The maximum of the values
+            if None.
+        plan: The style plan to record the fills to. If given, the caller
+            applies the plan.
+    """
+    x = to_numeric(values)
+
+    if np.isnan(x).all():
+        return
+
+    vmin = float(np.nanmin(x)) if vmin is None else vmin
+    vmax = float(np.nanmax(x)) if vmax is None else vmax
+    colors = interpolate_color_scale(x, vmin, vmax)
+
+    apply = plan is None
+    if plan is None:
+        plan = StylePlan()
+
+    for r, start, end, color in iter_color_runs(colors):
+        row, column = rng.row + r, rng.column
+        run = Range((row, column + start), (row, column + end), rng.sheet)
+        plan.fill(run, color, record=False)
+
+    if apply:
+        plan.apply()
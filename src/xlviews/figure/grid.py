@@ -62,16 +62,14 @@ class Grid:
         width = ax.chart.width
         height = ax.chart.height
 
-        axes: list[list[Axes]] = []
-        for r in range(nrows):
-            row: list[Axes] = []
-            for c in range(ncols):
-                if r == 0 and c == 0:
-                    row.append(ax)
-                else:
-                    new = ax.copy(left=left + c * width, top=top + r * height)
-                    row.append(new)
-            axes.append(row)
+        cells = [(r, c) for r in range(nrows) for c in range(ncols)][1:]
+        positions = [(left + c * width, top + r * height) for r, c in cells]
+        it = iter(ax.copies(positions))
+
+        axes = [
+            [ax if r == c == 0 else next(it) for c in range(ncols)]
+            for r in range(nrows)
+        ]
         self.axes = axes
 
     @property
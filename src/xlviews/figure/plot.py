@@ -7,6 +7,8 @@ from typing import TYPE_CHECKING, Any, Self
 import pandas as pd
 from pandas import DataFrame
 
+from xlviews.core.facet import FacetIndex, take
+
 from .palette import PaletteStyle, get_color_palette, get_marker_palette
 
 if TYPE_CHECKING:
@@ -39,16 +41,21 @@ class Plot:
         x: str | list[str],
         y: str | list[str],
         chart_type: int | None = None,
+        *,
+        downsample: int | None = None,
     ) -> Self:
         xs = x if isinstance(x, list) else [x]
         ys = y if isinstance(y, list) else [y]
 
+        items = []
         for x_, y_ in product(xs, ys):
             for idx, s in self.data.iterrows():
-                series = self.axes.add_series(s[x_], s[y_], chart_type=chart_type)
+                items.append((s[x_], s[y_], None))
                 index: tuple[Hashable, ...] = idx if isinstance(idx, tuple) else (idx,)  # pyright: ignore[reportUnknownVariableType]
                 self.index.append(index)
-                self.series_collection.append(series)
+
+        series = self.axes.add_series_batch(items, chart_type, downsample=downsample)
+        self.series_collection.extend(series)
 
         return self
 
@@ -58,6 +65,16 @@ class Plot:
         for index in self.index:
             yield dict(zip(names, index, strict=True))
 
+    @property
+    def writes(self) -> int:
+        """Return the number of the format properties written to the series."""
+        return sum(s.format.writes for s in self.series_collection)
+
+    @property
+    def skips(self) -> int:
+        """Return the number of the format writes skipped as already set."""
+        return sum(s.format.skips for s in self.series_collection)
+
     def set(
         self,
         label: Label | None = None,
@@ -95,20 +112,30 @@ class Plot:
         width = axes.chart.width
         height = axes.chart.height
 
-        for r, rkey in enumerate(iterrows(data.index, index)):
-            for c, ckey in enumerate(iterrows(data.index, columns)):
+        rows = FacetIndex(data.index, index)
+        cols = FacetIndex(data.index, columns)
+        cells = FacetIndex(data.index, [*rows.levels, *cols.levels] or None)
+
+        items = []
+        for r, rkey in enumerate(rows.keys):
+            for c, ckey in enumerate(cols.keys):
                 key = rkey | ckey
-                sub = xs(data, key)
+                indices = cells.get(key)
 
-                if len(sub) == 0:
+                if indices is None or len(indices) == 0:
                     continue
 
-                if r == 0 and c == 0:
-                    axes_ = axes
-                else:
-                    axes_ = axes.copy(left=left + c * width, top=top + r * height)
+                items.append((r, c, key, indices))
+
+        positions = [
+            (left + c * width, top + r * height) for r, c, *_ in items if r or c
+        ]
+        it = iter(axes.copies(positions))
 
-                yield key, cls(axes_, sub)
+        for r, c, key, indices in items:
+            sub = take(data, indices, cells.levels, drop_level=False)
+            axes_ = next(it) if r or c else axes
+            yield key, cls(axes_, sub)
 
 
 def get_label(label: Label, key: Mapping[Hashable | None, Hashable]) -> str:
@@ -120,23 +147,4 @@ def iterrows(
     index: pd.Index[Any],
     levels: str | list[str] | None,
 ) -> Iterator[dict[str, Any]]:
-    if levels is None:
-        yield {}
-        return
-
-    if isinstance(levels, str):
-        levels = [levels]
-
-    if levels:
-        values = {level: index.get_level_values(level) for level in levels}
-        it = DataFrame(values).drop_duplicates().iterrows()
-
-        for _, s in it:
-            yield s.to_dict()  # pyright: ignore[reportReturnType]
-
-
-def xs(df: DataFrame, index: dict[str, Any] | None) -> DataFrame:
-    if index:
-        df = df.xs(tuple(index.values()), 0, tuple(index.keys()), drop_level=False)  # pyright: ignore[reportAssignmentType]
-
-    return df
+    yield from FacetIndex(index, levels).keys  # pyright: ignore[reportReturnType]
@@ -0,0 +1,195 @@
+"""Track the conditional format rules installed by xlviews.
+
+A rule whose formulas do not depend on the position of the cells, such
+as the banding or a color scale between absolute references, is shared
+by all the ranges of a sheet with the same key: instead of adding new
+format conditions, the range is appended to the `AppliesTo` range of
+the existing ones. Rules with relative references are always added.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+import pywintypes
+import xlwings
+
+from xlviews.core.range import Range
+from xlviews.format_state import overlaps, sheet_key
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from xlwings import Range as RangeImpl
+    from xlwings import Sheet
+
+    from xlviews.format_state import SheetKey
+
+
+ABSOLUTE_REFERENCE = re.compile(r"\$[A-Z]{1,3}\$[0-9]+|\$[A-Z]{1,3}:\$[A-Z]{1,3}")
+RELATIVE_REFERENCE = re.compile(r"[A-Za-z_!]+\$?[0-9]+|\$?[A-Z]{1,3}:\$?[A-Z]{1,3}")
+
+
+def is_position_independent(formula: str) -> bool:
+    """Return True if the formula has no relative cell references.
+
+    Function calls without references, numbers, and absolute references
+    evaluate the same for every cell the rule applies to. A mixed
+    reference, such as `A$1` or `$A1`, is relative in one direction.
+
+    Examples:
+        >>> is_position_independent("=MOD(ROW(), 2)=0")
+        True
+        >>> is_position_independent("=($A$1 + AGGREGATE(4,7,$B$2:$C$9)) / 2")
+        True
+        >>> is_position_independent("=B3=B2")
+        False
+        >>> is_position_independent("=Sheet1!$A$1")
+        False
+        >>> is_position_independent("=A$1>0"), is_position_independent("=$A1>0")
+        (False, False)
+        >>> is_position_independent("=COUNT($A:$A)")
+        True
+        >>> is_position_independent("=COUNT(A:$A)")
+        False
+    """
+    return not RELATIVE_REFERENCE.search(ABSOLUTE_REFERENCE.sub("", formula))
+
+
+class Rule:
+    key: Hashable
+    ranges: list[Range]
+    conditions: list[Any]
+    union: Any
+    locs: set[tuple[int, int, int, int]]
+
+    def __init__(self, key: Hashable, rng: Range, conditions: list[Any]) -> None:
+        self.key = key
+        self.ranges = [rng]
+        self.conditions = conditions
+        self.union = rng.api
+        self.locs = {(rng.row, rng.column, rng.row_end, rng.column_end)}
+
+    def extend(self, rng: Range) -> bool:
+        """Apply the conditions to the range too. Return False on failure.
+
+        The `AppliesTo` range is kept as a running union, so that each
+        extension joins only the new range.
+        """
+        loc = rng.row, rng.column, rng.row_end, rng.column_end
+        if loc in self.locs:
+            return True
+
+        try:
+            union = rng.sheet.book.app.api.Union(self.union, rng.api)
+            for condition in self.conditions:
+                condition.ModifyAppliesToRange(union)
+        except pywintypes.com_error:
+            return False
+
+        self.union = union
+        self.ranges.append(rng)
+        self.locs.add(loc)
+        return True
+
+
+class RuleSet:
+    """The shared conditional format rules of a sheet."""
+
+    rules: dict[Hashable, Rule]
+    added: int
+    merged: int
+
+    def __init__(self) -> None:
+        self.rules = {}
+        self.added = 0
+        self.merged = 0
+
+    def __repr__(self) -> str:
+        cls = self.__class__.__name__
+        return f"<{cls} rules={len(self)} added={self.added} merged={self.merged}>"
+
+    def __len__(self) -> int:
+        return sum(len(rule.conditions) for rule in self.rules.values())
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.rules
+
+    def __getitem__(self, key: Hashable) -> Rule:
+        return self.rules[key]
+
+
+_rule_sets: dict[SheetKey, RuleSet] = {}
+
+
+def get_rule_set(sheet: Sheet | None = None) -> RuleSet:
+    """Return the shared conditional format rules of the sheet."""
+    key = sheet_key(sheet or xlwings.sheets.active)
+    return _rule_sets.setdefault(key, RuleSet())
+
+
+def clear_rule_set(sheet: Sheet | None = None) -> None:
+    """Forget the shared rules of the sheet, or of all sheets if None.
+
+    The conditions stay in the sheet, but new ranges are no longer
+    merged into them. Call this after moving cells, since the recorded
+    ranges no longer match the `AppliesTo` ranges.
+    """
+    if sheet is None:
+        _rule_sets.clear()
+    else:
+        _rule_sets.pop(sheet_key(sheet), None)
+
+
+def forget_rules(rng: Range) -> None:
+    """Forget the shared rules applied to any cell of the range.
+
+    Call this after removing the conditions from the range, since the
+    recorded ranges of the rules no longer match the `AppliesTo` ranges.
+    """
+    if not (rules := _rule_sets.get(sheet_key(rng.sheet))):
+        return
+
+    rect = rng.row, rng.column, rng.row_end, rng.column_end
+    for key, rule in list(rules.rules.items()):
+        if any(overlaps(loc, rect) for loc in rule.locs):
+            del rules.rules[key]
+
+
+def add_rule(
+    rng: Range | RangeImpl,
+    key: Hashable | None,
+    create: Callable[[Any], list[Any]],
+) -> list[Any]:
+    """Add the format conditions to the range, merging the rule if possible.
+
+    Args:
+        rng: The range to apply the conditions to.
+        key: The key of the rule. The ranges with the same key on a sheet
+            share the conditions. None for a rule that must not be
+            shared, e.g., with relative references.
+        create: The function to add the conditions to the range API.
+
+    Returns:
+        The format conditions applied to the range.
+    """
+    if key is None or not isinstance(rng, Range):
+        return create(rng.api)
+
+    rules = get_rule_set(rng.sheet)
+
+    if (rule := rules.rules.get(key)) and rule.extend(rng):
+        rules.merged += 1
+        return rule.conditions
+
+    conditions = create(rng.api)
+    rules.rules[key] = Rule(key, rng, conditions)
+    rules.added += 1
+    return conditions
+
+
+def count_rules(sheet: Sheet | None = None) -> int:
+    """Return the number of the conditional format rules in the sheet."""
+    sheet = sheet or xlwings.sheets.active
+    return sheet.api.Cells.FormatConditions.Count
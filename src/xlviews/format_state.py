@@ -0,0 +1,356 @@
+"""Track the format that xlviews has applied to the cells of a sheet.
+
+The style functions in `xlviews.style` consult the state of the sheet
+before writing a property and skip the write if every target rectangle
+already has the value. Only the writes through `Range` and
+`RangeCollection` are tracked: their coordinates are known without
+asking Excel. A write through an xlwings range invalidates the property
+on all sheets, since its rectangle is unknown.
+
+The states persist across calls, so that styling a frame twice, or
+styling the regions of a sheet by separate calls, skips the writes of
+the values already applied. They are keyed by the full name of the book,
+the name of the sheet, and its code name, so that a sheet deleted and
+added again under the same name usually gets a new state. Formats
+changed outside xlviews are not seen: call `clear_format_state` after
+changing the format of a sheet by other means, e.g., by clearing cells
+or inserting rows by hand.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import TYPE_CHECKING, Any
+
+import xlwings
+
+from xlviews.core.range import Range
+from xlviews.core.range_collection import RangeCollection
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from xlwings import Range as RangeImpl
+    from xlwings import Sheet
+
+type Rect = tuple[int, int, int, int]
+
+MISSING = object()
+
+# A named cell style sets the fill and the font of the cells.
+LINKED = {"style": ("fill", "font.")}
+
+# The rows and columns of a bucket of the rectangle index.
+BUCKET_SIZE = 16
+
+# The rectangles spanning more buckets are checked for every lookup.
+MAX_BUCKETS = 64
+
+# The updates of more rectangles are written without being recorded.
+MAX_RECTS = 1000
+
+
+def overlaps(a: Rect, b: Rect) -> bool:
+    """Return True if the rectangles share any cell.
+
+    Examples:
+        >>> overlaps((1, 1, 3, 3), (3, 3, 4, 4))
+        True
+        >>> overlaps((1, 1, 3, 3), (4, 1, 4, 3))
+        False
+    """
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def contains(a: Rect, b: Rect) -> bool:
+    """Return True if the rectangle a contains the rectangle b.
+
+    Examples:
+        >>> contains((1, 1, 3, 3), (2, 2, 3, 3))
+        True
+        >>> contains((1, 1, 3, 3), (2, 2, 4, 3))
+        False
+    """
+    return a[0] <= b[0] and b[2] <= a[2] and a[1] <= b[1] and b[3] <= a[3]
+
+
+def subtract(a: Rect, b: Rect) -> list[Rect]:
+    """Return the rectangles covering the cells of a outside of b.
+
+    Examples:
+        >>> subtract((1, 1, 4, 4), (2, 2, 3, 3))
+        [(1, 1, 1, 4), (4, 1, 4, 4), (2, 1, 3, 1), (2, 4, 3, 4)]
+        >>> subtract((1, 1, 2, 2), (1, 1, 3, 3))
+        []
+        >>> subtract((1, 1, 2, 2), (3, 3, 4, 4))
+        [(1, 1, 2, 2)]
+    """
+    if not overlaps(a, b):
+        return [a]
+
+    rects = []
+    if a[0] < b[0]:
+        rects.append((a[0], a[1], b[0] - 1, a[3]))
+    if b[2] < a[2]:
+        rects.append((b[2] + 1, a[1], a[2], a[3]))
+
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    if a[1] < b[1]:
+        rects.append((top, a[1], bottom, b[1] - 1))
+    if b[3] < a[3]:
+        rects.append((top, b[3] + 1, bottom, a[3]))
+
+    return rects
+
+
+def is_linked(a: str, b: str) -> bool:
+    for prop, prefixes in LINKED.items():
+        if a == prop and b.startswith(prefixes):
+            return True
+        if b == prop and a.startswith(prefixes):
+            return True
+
+    return False
+
+
+def get_buckets(rect: Rect) -> list[tuple[int, int]] | None:
+    """Return the buckets of the rectangle, or None if it spans too many.
+
+    Examples:
+        >>> get_buckets((1, 1, 20, 3))
+        [(0, 0), (1, 0)]
+    """
+    rows = range(rect[0] // BUCKET_SIZE, rect[2] // BUCKET_SIZE + 1)
+    columns = range(rect[1] // BUCKET_SIZE, rect[3] // BUCKET_SIZE + 1)
+    if len(rows) * len(columns) > MAX_BUCKETS:
+        return None
+
+    return [(r, c) for r in rows for c in columns]
+
+
+class RectIndex:
+    """The values of the rectangles of a property, bucketed by cells.
+
+    A rectangle is found by its exact key, or among the rectangles in
+    the bucket of its top-left cell. The rectangles spanning more than
+    `MAX_BUCKETS` buckets are kept aside and checked for every lookup.
+    """
+
+    values: dict[Rect, Any]
+    buckets: dict[tuple[int, int], set[Rect]]
+    large: set[Rect]
+
+    def __init__(self) -> None:
+        self.values = {}
+        self.buckets = {}
+        self.large = set()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def candidates(self, rect: Rect) -> set[Rect]:
+        """Return the rectangles that may overlap the rectangle."""
+        if (buckets := get_buckets(rect)) is None:
+            return set(self.values)
+
+        rects = set(self.large)
+        for b in buckets:
+            rects.update(self.buckets.get(b, ()))
+
+        return rects
+
+    def find(self, rect: Rect) -> Any:
+        """Return the value of the rectangle that contains the rectangle."""
+        if (value := self.values.get(rect, MISSING)) is not MISSING:
+            return value
+
+        cell = rect[0], rect[1], rect[0], rect[1]
+        for r in self.candidates(cell):
+            if contains(r, rect):
+                return self.values[r]
+
+        return MISSING
+
+    def add(self, rect: Rect, value: Any) -> None:
+        if rect not in self.values:
+            if (buckets := get_buckets(rect)) is None:
+                self.large.add(rect)
+            else:
+                for b in buckets:
+                    self.buckets.setdefault(b, set()).add(rect)
+
+        self.values[rect] = value
+
+    def remove(self, rect: Rect) -> None:
+        del self.values[rect]
+
+        if (buckets := get_buckets(rect)) is None:
+            self.large.discard(rect)
+        else:
+            for b in buckets:
+                self.buckets[b].discard(rect)
+
+    def remove_overlaps(self, rect: Rect) -> None:
+        for r in [r for r in self.candidates(rect) if overlaps(r, rect)]:
+            self.remove(r)
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.buckets.clear()
+        self.large.clear()
+
+
+class FormatState:
+    """The property values applied to the rectangles of a sheet.
+
+    The rectangles of one property never overlap: a write removes the
+    overlapping rectangles of the property before it is recorded. An
+    update of more than `MAX_RECTS` rectangles is written without being
+    recorded, to bound the cost of the bookkeeping.
+
+    Examples:
+        >>> state = FormatState()
+        >>> state.update("fill", [(2, 2, 5, 3)], 255)
+        True
+        >>> state.update("fill", [(3, 2, 4, 2)], 255)
+        False
+        >>> state.get("fill", (2, 3, 2, 3))
+        255
+        >>> state.update("fill", [(3, 2, 4, 2)], 0)
+        True
+        >>> state.get("fill", (2, 3, 2, 3)) is None
+        True
+    """
+
+    props: dict[str, RectIndex]
+    writes: int
+    skips: int
+
+    def __init__(self) -> None:
+        self.props = {}
+        self.writes = 0
+        self.skips = 0
+
+    def __repr__(self) -> str:
+        cls = self.__class__.__name__
+        return f"<{cls} writes={self.writes} skips={self.skips}>"
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self.props.values())
+
+    def __iter__(self) -> Iterator[tuple[str, Rect, Any]]:
+        for prop, index in self.props.items():
+            for rect, value in index.values.items():
+                yield prop, rect, value
+
+    def get(self, prop: str, rect: Rect, default: Any = None) -> Any:
+        """Return the value of the property applied to the whole rectangle."""
+        if (index := self.props.get(prop)) is None:
+            return default
+
+        value = index.find(rect)
+        return default if value is MISSING else value
+
+    def update(self, prop: str, rects: list[Rect], value: Any) -> bool:
+        """Record the value and return True if it has to be written."""
+        if len(rects) > MAX_RECTS:
+            for rect in rects:
+                self.invalidate(prop, rect)
+            self.writes += 1
+            return True
+
+        if all(self.get(prop, r, MISSING) == value for r in rects):
+            self.skips += 1
+            return False
+
+        for rect in rects:
+            self.invalidate(prop, rect)
+
+        index = self.props.setdefault(prop, RectIndex())
+        for rect in rects:
+            index.add(rect, value)
+
+        self.writes += 1
+        return True
+
+    def invalidate(self, prop: str, rect: Rect | None = None) -> None:
+        """Forget the property, and the linked ones, where it overlaps."""
+        for p, index in self.props.items():
+            if p != prop and not is_linked(p, prop):
+                continue
+
+            if rect is None:
+                index.clear()
+            else:
+                index.remove_overlaps(rect)
+
+    def clear(self) -> None:
+        self.props.clear()
+
+
+type SheetKey = tuple[str, str, str]
+
+_keys: dict[int, tuple[weakref.ref[Sheet], SheetKey]] = {}
+_states: dict[SheetKey, FormatState] = {}
+
+
+def sheet_key(sheet: Sheet) -> SheetKey:
+    """Return the full name of the book, the sheet name, and its code name.
+
+    The key is cached per sheet object, so that the ranges sharing a
+    sheet object cost no COM call. Nothing is written to the sheet.
+    """
+    ident = id(sheet)
+
+    if (item := _keys.get(ident)) and item[0]() is sheet:
+        return item[1]
+
+    key = sheet.book.fullname, sheet.name, sheet.api.CodeName
+    _keys[ident] = weakref.ref(sheet, lambda _: _keys.pop(ident, None)), key
+    return key
+
+
+def get_format_state(sheet: Sheet | None = None) -> FormatState:
+    """Return the format state of the sheet."""
+    key = sheet_key(sheet or xlwings.sheets.active)
+    return _states.setdefault(key, FormatState())
+
+
+def clear_format_state(sheet: Sheet | None = None) -> None:
+    """Forget the format applied to the sheet, or to all sheets if None."""
+    if sheet is None:
+        _keys.clear()
+        _states.clear()
+
+    elif state := _states.get(sheet_key(sheet)):
+        state.clear()
+
+
+def _iter_rects(rng: Range | RangeCollection) -> Iterator[Rect]:
+    ranges = [rng] if isinstance(rng, Range) else rng.ranges
+    for r in ranges:
+        yield r.row, r.column, r.row_end, r.column_end
+
+
+def needs_write(
+    rng: Range | RangeCollection | RangeImpl,
+    prop: str,
+    value: Any,
+) -> bool:
+    """Record the value of the property and return True if it has to be written."""
+    if not isinstance(rng, Range | RangeCollection):
+        for state in _states.values():
+            state.invalidate(prop)
+        return True
+
+    sheet = rng.sheet if isinstance(rng, Range) else rng.ranges[0].sheet
+    state = get_format_state(sheet)
+    return state.update(prop, list(_iter_rects(rng)), value)
+
+
+def invalidate_format(rng: Range | RangeCollection, prop: str) -> None:
+    """Forget the property where it is written without being recorded."""
+    sheet = rng.sheet if isinstance(rng, Range) else rng.ranges[0].sheet
+    if state := _states.get(sheet_key(sheet)):
+        for rect in _iter_rects(rng):
+            state.invalidate(prop, rect)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import xlwings
 from xlwings import Range as RangeImpl
 from xlwings import Sheet
@@ -17,14 +18,17 @@ from xlwings.constants import (
 from xlviews.colors import Color, rgb
 from xlviews.config import rcParams
 from xlviews.core.range import Range
+from xlviews.core.range_collection import RangeCollection
+from xlviews.format_rules import add_rule, forget_rules, is_position_independent
+from xlviews.format_state import invalidate_format, needs_write, subtract
 from xlviews.utils import constant
 
 if TYPE_CHECKING:
-    from .core.range_collection import RangeCollection
+    from numpy.typing import ArrayLike, NDArray
 
 
 def set_border_line(
-    rng: Range | RangeImpl,
+    rng: Range | RangeCollection | RangeImpl,
     index: str,
     weight: int = 2,
     color: Color = 0,
@@ -32,6 +36,9 @@ def set_border_line(
     if not weight:
         return
 
+    if not needs_write(rng, f"border.{index}", (weight, rgb(color))):
+        return
+
     borders = rng.api.Borders
     border = borders(getattr(BordersIndex, index))
     border.LineStyle = LineStyle.xlContinuous
@@ -52,16 +59,16 @@ def set_border_edge(
     sheet = rng.sheet
     start, end = rng[0], rng[-1]
 
-    left = sheet.range((start.row, start.column - 1), (end.row, start.column))
+    left = Range((start.row, start.column - 1), (end.row, start.column), sheet)
     set_border_line(left, "xlInsideVertical", weight=wl, color=color)
 
-    right = sheet.range((start.row, end.column), (end.row, end.column + 1))
+    right = Range((start.row, end.column), (end.row, end.column + 1), sheet)
     set_border_line(right, "xlInsideVertical", weight=wr, color=color)
 
-    top = sheet.range((start.row - 1, start.column), (start.row, end.column))
+    top = Range((start.row - 1, start.column), (start.row, end.column), sheet)
     set_border_line(top, "xlInsideHorizontal", weight=wt, color=color)
 
-    bottom = sheet.range((end.row, start.column), (end.row + 1, end.column))
+    bottom = Range((end.row, start.column), (end.row + 1, end.column), sheet)
     set_border_line(bottom, "xlInsideHorizontal", weight=wb, color=color)
 
 
@@ -91,9 +98,24 @@ def set_border(
 def set_fill(
     rng: Range | RangeCollection | RangeImpl,
     color: Color | None = None,
+    *,
+    record: bool = True,
 ) -> None:
-    if color is not None:
-        rng.api.Interior.Color = rgb(color)
+    """Fill the range with the color.
+
+    If `record` is False, the fill is written without being recorded in
+    the format state, e.g., for the many small runs of a baked color
+    scale that are never written again with the same color.
+    """
+    if color is None:
+        return
+
+    if not record and not isinstance(rng, RangeImpl):
+        invalidate_format(rng, "fill")
+    elif not needs_write(rng, "fill", rgb(color)):
+        return
+
+    rng.api.Interior.Color = rgb(color)
 
 
 def set_font_api(
@@ -128,7 +150,18 @@ def set_font(
     color: Color | None = None,
 ) -> None:
     name = name or rcParams["frame.font.name"]
-    set_font_api(rng.api, name, size=size, bold=bold, italic=italic, color=color)
+    color = None if color is None else rgb(color)
+
+    values = {"name": name, "size": size, "bold": bold, "italic": italic}
+    values["color"] = color
+
+    def needs(key: str, value: Any) -> bool:
+        return value is not None and needs_write(rng, f"font.{key}", value)
+
+    kwargs = {k: v for k, v in values.items() if needs(k, v)}
+
+    if kwargs:
+        set_font_api(rng.api, **kwargs)
 
 
 def set_alignment(
@@ -136,15 +169,23 @@ def set_alignment(
     horizontal_alignment: str | None = None,
     vertical_alignment: str | None = None,
 ) -> None:
-    if horizontal_alignment:
-        rng.api.HorizontalAlignment = constant(horizontal_alignment)
+    h, v = horizontal_alignment, vertical_alignment
+
+    if h and needs_write(rng, "alignment.horizontal", h):
+        rng.api.HorizontalAlignment = constant(h)
 
-    if vertical_alignment:
-        rng.api.VerticalAlignment = constant(vertical_alignment)
+    if v and needs_write(rng, "alignment.vertical", v):
+        rng.api.VerticalAlignment = constant(v)
 
 
 def set_number_format(rng: Range | RangeCollection | RangeImpl, fmt: str) -> None:
-    rng.api.NumberFormat = fmt
+    if needs_write(rng, "number_format", fmt):
+        rng.api.NumberFormat = fmt
+
+
+def set_named_style(rng: Range | RangeCollection | RangeImpl, name: str) -> None:
+    if needs_write(rng, "style", name):
+        rng.api.Style = name
 
 
 EVEN_COLOR = rgb(240, 250, 255)
@@ -157,7 +198,7 @@ def set_banding(
     even_color: Color = EVEN_COLOR,
     odd_color: Color = ODD_COLOR,
 ) -> None:
-    def banding(mod: int, color: int) -> None:
+    def banding(add: Any, mod: int, color: int) -> Any:
         formula = f"=MOD(ROW(), 2)={mod}" if axis == 0 else f"=MOD(COLUMN(), 2)={mod}"
         condition = add(Type=FormatConditionType.xlExpression, Formula1=formula)
 
@@ -169,10 +210,14 @@ def set_banding(
         interior.Color = color
         interior.TintAndShade = 0
 
-    add = rng.api.FormatConditions.Add
+        return condition
+
+    def create(api: Any) -> list[Any]:
+        add = api.FormatConditions.Add
+        return [banding(add, 0, rgb(odd_color)), banding(add, 1, rgb(even_color))]
 
-    banding(0, rgb(odd_color))
-    banding(1, rgb(even_color))
+    key = ("banding", axis, rgb(even_color), rgb(odd_color))
+    add_rule(rng, key, create)
 
 
 SUCCESSION_COLOR = rgb(200, 200, 200)
@@ -242,14 +287,24 @@ def set_color_condition(
     values: list[str],
     colors: list[int],
 ) -> None:
-    condition = rng.api.FormatConditions.AddColorScale(len(values))
-    condition.SetFirstPriority()
+    def create(api: Any) -> list[Any]:
+        condition = api.FormatConditions.AddColorScale(len(values))
+        condition.SetFirstPriority()
+
+        for k, (value, color) in enumerate(zip(values, colors, strict=True)):
+            criteria = condition.ColorScaleCriteria(k + 1)
+            criteria.Type = ConditionValueTypes.xlConditionValueNumber
+            criteria.Value = value
+            criteria.FormatColor.Color = color
+
+        return [condition]
 
-    for k, (value, color) in enumerate(zip(values, colors, strict=True)):
-        criteria = condition.ColorScaleCriteria(k + 1)
-        criteria.Type = ConditionValueTypes.xlConditionValueNumber
-        criteria.Value = value
-        criteria.FormatColor.Color = color
+    if all(is_position_independent(str(v)) for v in values):
+        key = ("color_scale", *values, *colors)
+    else:
+        key = None
+
+    add_rule(rng, key, create)
 
 
 def set_color_scale(
@@ -264,6 +319,77 @@ def set_color_scale(
         vmax = vmax.get_address()
 
     values = [f"={vmin}", f"=({vmin} + {vmax}) / 2", f"={vmax}"]
-    colors = [rgb(130, 130, 255), rgb(80, 185, 80), rgb(255, 130, 130)]
+    set_color_condition(rng, values, list(COLOR_SCALE))
+
+
+def delete_color_scale(rng: Range) -> None:
+    """Delete the color scale conditions from the cells of the range.
+
+    A color scale that also applies outside the range is kept there by
+    shrinking its `AppliesTo` range to the remaining cells.
+    """
+    rect = rng.row, rng.column, rng.row_end, rng.column_end
+    conditions = rng.api.FormatConditions
+
+    for k in range(conditions.Count, 0, -1):
+        condition = conditions.Item(k)
+        if condition.Type != FormatConditionType.xlColorScale:
+            continue
+
+        areas = condition.AppliesTo.Areas
+        rects = []
+        for i in range(1, areas.Count + 1):
+            area = areas.Item(i)
+            row, column = area.Row, area.Column
+            row_end = row + area.Rows.Count - 1
+            column_end = column + area.Columns.Count - 1
+            rects.extend(subtract((row, column, row_end, column_end), rect))
+
+        if rects:
+            ranges = [Range(r[:2], r[2:], rng.sheet) for r in rects]
+            condition.ModifyAppliesToRange(RangeCollection.from_ranges(ranges).api)
+        else:
+            condition.Delete()
+
+    forget_rules(rng)
+
+
+COLOR_SCALE = (rgb(130, 130, 255), rgb(80, 185, 80), rgb(255, 130, 130))
+
+
+def interpolate_color_scale(
+    values: ArrayLike,
+    vmin: float,
+    vmax: float,
+    colors: tuple[int, int, int] = COLOR_SCALE,
+) -> NDArray[np.int64]:
+    """Return the colors of the values in the three-color scale.
+
+    The channels are interpolated linearly between the colors at vmin,
+    the midpoint, and vmax, as the color scale of `set_color_scale`.
+    The values outside the limits get the color of the nearest limit.
+    The missing values get -1.
+
+    Examples:
+        >>> interpolate_color_scale([0, 5, 10, 20, float("nan")], 0, 10).tolist()
+        [16745090, 5290320, 8553215, 8553215, -1]
+        >>> [rgb(130, 130, 255), rgb(80, 185, 80), rgb(255, 130, 130)]
+        [16745090, 5290320, 8553215]
+    """
+    x = np.asarray(values, dtype=float)
+    stops = np.array([[(c >> s) & 255 for s in (0, 8, 16)] for c in colors], float)
+
+    if vmin > vmax:
+        vmin, vmax, stops = vmax, vmin, stops[::-1]
+
+    xp = [vmin, (vmin + vmax) / 2, vmax]
+    isnan = np.isnan(x)
+
+    if vmin == vmax:
+        channels = [np.full(x.shape, stops[1, k]) for k in range(3)]
+    else:
+        x = np.where(isnan, vmin, x)
+        channels = [np.interp(x, xp, stops[:, k]) for k in range(3)]
 
-    set_color_condition(rng, values, colors)
+    r, g, b = (np.rint(c).astype(np.int64) for c in channels)
+    return np.where(isnan, -1, r + g * 256 + b * 256 * 256)
@@ -0,0 +1,229 @@
+"""Collect style operations and apply identical ones to union ranges."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from xlwings import Range as RangeImpl
+
+from xlviews.colors import Color, rgb
+from xlviews.config import rcParams
+from xlviews.core.range import Range
+from xlviews.core.range_collection import RangeCollection
+from xlviews.style import (
+    set_alignment,
+    set_border_line,
+    set_fill,
+    set_font,
+    set_named_style,
+    set_number_format,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+type Key = tuple[Any, ...]
+
+
+class StylePlan:
+    """A plan of style operations grouped by their property values.
+
+    Every operation is recorded with the rectangle it applies to, and
+    the same rectangle is recorded only once per operation. When
+    the plan is applied, the rectangles of the operations with identical
+    property values are merged into one multi-area range, so that each
+    group costs a single set of COM calls regardless of its size.
+
+    Operations are applied layer by layer in ascending order. Within a
+    layer, the rectangles of different groups must not conflict: a later
+    layer is used to override the result of an earlier one, e.g., the
+    outer border of a frame drawn over the borders of its regions.
+    """
+
+    layers: dict[int, dict[Key, dict[tuple[int, ...], Range]]]
+
+    def __init__(self) -> None:
+        self.layers = {}
+
+    def __len__(self) -> int:
+        return sum(len(groups) for groups in self.layers.values())
+
+    def __repr__(self) -> str:
+        cls = self.__class__.__name__
+        n = sum(len(rs) for groups in self.layers.values() for rs in groups.values())
+        return f"<{cls} groups={len(self)} ranges={n}>"
+
+    def __iter__(self) -> Iterator[tuple[Key, RangeCollection]]:
+        for layer in sorted(self.layers):
+            for key, ranges in self.layers[layer].items():
+                sheets: dict[int, list[Range]] = {}
+                for loc, rng in ranges.items():
+                    sheets.setdefault(loc[0], []).append(rng)
+
+                for rs in sheets.values():
+                    yield key, RangeCollection.from_ranges(rs)
+
+    def add(self, key: Key, rng: Range | RangeImpl, layer: int = 0) -> None:
+        if isinstance(rng, RangeImpl):
+            rng = Range.from_range(rng)
+
+        loc = id(rng.sheet), rng.row, rng.column, rng.row_end, rng.column_end
+        groups = self.layers.setdefault(layer, {})
+        groups.setdefault(key, {}).setdefault(loc, rng)
+
+    def fill(
+        self,
+        rng: Range | RangeImpl,
+        color: Color | None = None,
+        layer: int = 0,
+        *,
+        record: bool = True,
+    ) -> None:
+        if color is not None:
+            self.add(("fill", rgb(color), record), rng, layer)
+
+    def font(
+        self,
+        rng: Range | RangeImpl,
+        name: str | None = None,
+        *,
+        size: float | None = None,
+        bold: bool | None = None,
+        italic: bool | None = None,
+        color: Color | None = None,
+        layer: int = 0,
+    ) -> None:
+        name = name or rcParams["frame.font.name"]
+        color = None if color is None else rgb(color)
+        self.add(("font", name, size, bold, italic, color), rng, layer)
+
+    def alignment(
+        self,
+        rng: Range | RangeImpl,
+        horizontal_alignment: str | None = None,
+        vertical_alignment: str | None = None,
+        layer: int = 0,
+    ) -> None:
+        if horizontal_alignment or vertical_alignment:
+            key = ("alignment", horizontal_alignment, vertical_alignment)
+            self.add(key, rng, layer)
+
+    def style(self, rng: Range | RangeImpl, name: str, layer: int = 0) -> None:
+        self.add(("style", name), rng, layer)
+
+    def merge(self, rng: Range | RangeImpl, layer: int = 0) -> None:
+        self.add(("merge",), rng, layer)
+
+    def number_format(self, rng: Range | RangeImpl, fmt: str, layer: int = 0) -> None:
+        self.add(("number_format", fmt), rng, layer)
+
+    def border_line(
+        self,
+        rng: Range | RangeImpl,
+        index: str,
+        weight: int = 2,
+        color: Color = 0,
+        layer: int = 0,
+    ) -> None:
+        if isinstance(rng, RangeImpl):
+            rng = Range.from_range(rng)
+
+        if not weight:
+            return
+
+        if index == "xlInsideVertical" and rng.column == rng.column_end:
+            return
+
+        if index == "xlInsideHorizontal" and rng.row == rng.row_end:
+            return
+
+        self.add(("border", index, weight, rgb(color)), rng, layer)
+
+    def border_edge(
+        self,
+        rng: Range | RangeImpl,
+        weight: int | tuple[int, int, int, int] = 3,
+        color: Color = 0,
+        layer: int = 0,
+    ) -> None:
+        """Record the edges as the inside lines of the adjacent strips.
+
+        The same decomposition as `set_border_edge`: the shared edge of
+        two neighbouring rectangles becomes the same strip line, so that
+        it is drawn only once.
+        """
+        if isinstance(rng, RangeImpl):
+            rng = Range.from_range(rng)
+
+        if isinstance(weight, int):
+            wl = wr = wt = wb = weight
+        else:
+            wl, wr, wt, wb = weight
+
+        r, c, re, ce = rng.row, rng.column, rng.row_end, rng.column_end
+        sheet = rng.sheet
+
+        left = Range((r, c - 1), (re, c), sheet)
+        self.border_line(left, "xlInsideVertical", wl, color, layer)
+
+        right = Range((r, ce), (re, ce + 1), sheet)
+        self.border_line(right, "xlInsideVertical", wr, color, layer)
+
+        top = Range((r - 1, c), (r, ce), sheet)
+        self.border_line(top, "xlInsideHorizontal", wt, color, layer)
+
+        bottom = Range((re, c), (re + 1, ce), sheet)
+        self.border_line(bottom, "xlInsideHorizontal", wb, color, layer)
+
+    def border_inside(
+        self,
+        rng: Range | RangeImpl,
+        weight: int = 1,
+        color: Color = 0,
+        layer: int = 0,
+    ) -> None:
+        self.border_line(rng, "xlInsideVertical", weight, color, layer)
+        self.border_line(rng, "xlInsideHorizontal", weight, color, layer)
+
+    def border(
+        self,
+        rng: Range | RangeImpl,
+        edge_weight: int | tuple[int, int, int, int] = 2,
+        inside_weight: int = 1,
+        edge_color: Color = 0,
+        inside_color: Color = 0,
+        layer: int = 0,
+    ) -> None:
+        if edge_weight:
+            self.border_edge(rng, edge_weight, edge_color, layer)
+
+        if inside_weight:
+            self.border_inside(rng, inside_weight, inside_color, layer)
+
+    def apply(self) -> None:
+        """Apply the groups of the plan and clear it."""
+        for key, rc in self:
+            apply_style(key, rc)
+
+        self.layers.clear()
+
+
+def apply_style(key: Key, rc: RangeCollection) -> None:
+    match key:
+        case ("fill", color, record):
+            set_fill(rc, color, record=record)
+        case ("font", name, size, bold, italic, color):
+            set_font(rc, name, size=size, bold=bold, italic=italic, color=color)
+        case ("alignment", horizontal, vertical):
+            set_alignment(rc, horizontal, vertical)
+        case ("style", name):
+            set_named_style(rc, name)
+        case ("merge",):
+            rc.api.Merge()
+        case ("number_format", fmt):
+            set_number_format(rc, fmt)
+        case ("border", index, weight, color):
+            set_border_line(rc, index, weight, color)
+        case _:
+            msg = f"Invalid style key: {key}"
+            raise ValueError(msg)
@@ -7,6 +7,8 @@ import pytest
 from pandas import DataFrame
 
 from xlviews.core.address import index_to_column_name
+from xlviews.core.formula import aggregate, aggregate_grid
+from xlviews.core.range_collection import RangeCollection
 from xlviews.dataframes.groupby import GroupBy
 from xlviews.dataframes.sheet_frame import SheetFrame
 from xlviews.testing import is_app_available
@@ -100,3 +102,36 @@ def test_groupby_agg(
     x = benchmark(lambda: sf.groupby(columns).agg(["sum", "count"]))
     assert isinstance(x, DataFrame)
     assert x.shape == (len(sf), 2 * (shape[1] - 10))
+
+
+@pytest.fixture(scope="module")
+def runs():
+    return [[(k, k + 1), (k + 100000, k + 100002)] for k in range(0, 30000, 3)]
+
+
+def test_aggregate_loop(benchmark: BenchmarkFixture, sheet: Sheet, runs):
+    def agg():
+        it = (RangeCollection(r, c, sheet) for c in range(2, 12) for r in runs)
+        return [aggregate("sum", rng) for rng in it]
+
+    x = benchmark(agg)
+    assert len(x) == 10 * len(runs)
+
+
+def test_aggregate_grid(benchmark: BenchmarkFixture, sheet: Sheet, runs):
+    x = benchmark(lambda: aggregate_grid("sum", runs, range(2, 12), sheet=sheet))
+    assert x.shape == (len(runs), 10)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2, 4, 8, 16])
+def test_aggregate_grid_n_jobs(
+    benchmark: BenchmarkFixture,
+    sheet: Sheet,
+    runs,
+    n_jobs: int,
+):
+    def agg():
+        return aggregate_grid("sum", runs, range(2, 502), sheet=sheet, n_jobs=n_jobs)
+
+    x = benchmark.pedantic(agg, rounds=3)
+    assert x.shape == (len(runs), 500)
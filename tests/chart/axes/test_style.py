@@ -199,3 +199,17 @@ def test_legend_none(sheet: Sheet):
     ax.add_series(x, z)
     ax.legend()
     assert ax.chart.api[1].HasLegend is False
+
+
+def test_legend_metrics_cache(ax2: Axes):
+    ax2.legend(loc=None)
+    legend = ax2.chart.api[1].Legend
+    width, height = legend.Width, legend.Height
+
+    ax3 = ax2.copy(left=400, top=10)
+    for s in ax2.series_collection:
+        ax3.add_series(s.x, s.y, label=s.label)
+    ax3.legend(loc=None)
+    legend = ax3.chart.api[1].Legend
+    assert legend.Width == width
+    assert legend.Height == height
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from xlwings.constants import ChartType
+
+from xlviews.chart.axes import Axes
+from xlviews.testing import is_app_available
+
+if TYPE_CHECKING:
+    from xlwings import Sheet
+
+pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
+
+
+@pytest.fixture(scope="module")
+def ax(sheet_module: Sheet):
+    sheet_module.range("A1").value = [[1, 4, 7], [2, 5, 8], [3, 6, 9]]
+    return Axes(300, 10, sheet=sheet_module)
+
+
+def test_add_series_batch(ax: Axes):
+    name = ax.sheet.name
+    items = [
+        (f"{name}!$A$1:$A$3", f"{name}!$B$1:$B$3", "b"),
+        (f"{name}!$A$1:$A$3", f"{name}!$C$1:$C$3", "c"),
+        ([1, 2], [3, 4], "d"),
+    ]
+    series = ax.add_series_batch(items)
+    assert [s.label for s in series] == ["b", "c", "d"]
+    assert series[0].y == (4, 5, 6)
+    assert series[1].y == (7, 8, 9)
+    assert series[2].y == (3, 4)
+    assert ax.series_collection[-3:] == series
+
+
+def test_add_series_batch_combination(sheet: Sheet):
+    sheet.range("A1").value = [[1, 4, 7], [2, 5, 8], [3, 6, 9]]
+    ax = Axes(300, 10, chart_type=ChartType.xlXYScatter, sheet=sheet)
+    ax.add_series(f"{sheet.name}!$A$1:$A$3", chart_type=ChartType.xlColumnClustered)
+
+    name = sheet.name
+    items = [
+        (f"{name}!$A$1:$A$3", f"{name}!$B$1:$B$3", "b"),
+        (f"{name}!$A$1:$A$3", f"{name}!$C$1:$C$3", "c"),
+    ]
+    series = ax.add_series_batch(items)
+    assert [s.api.PlotOrder for s in series] == [1, 2]
+    assert [s.label for s in series] == ["b", "c"]
+    assert series[1].y == (7, 8, 9)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from xlwings.constants import ChartType
+
+from xlviews.chart.axes import Axes
+from xlviews.chart.downsample import HELPER_SHEET_NAME, clear_helper_sheet
+from xlviews.core.range import Range
+from xlviews.testing import is_app_available
+
+if TYPE_CHECKING:
+    from xlwings import Sheet
+
+pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
+
+
+@pytest.fixture(scope="module")
+def xy(sheet_module: Sheet):
+    x = np.linspace(0, 10, 5000)
+    sheet_module.range("A1").value = np.column_stack([x, np.sin(x)])
+    x = Range((1, 1), (5000, 1), sheet_module)
+    y = Range((1, 2), (5000, 2), sheet_module)
+    return x, y
+
+
+@pytest.mark.parametrize(
+    "chart_type",
+    [ChartType.xlXYScatterLines, ChartType.xlXYScatter],
+)
+def test_downsample(sheet_module: Sheet, xy: tuple[Range, Range], chart_type: int):
+    ax = Axes(300, 10, chart_type=chart_type, sheet=sheet_module)
+    s = ax.add_series(*xy, downsample=100)
+    assert len(s.y) <= 100
+    assert HELPER_SHEET_NAME in s.api.Formula
+    assert sheet_module.book.sheets[HELPER_SHEET_NAME].visible is False
+
+
+def test_downsample_small(sheet_module: Sheet, xy: tuple[Range, Range]):
+    ax = Axes(300, 10, sheet=sheet_module)
+    s = ax.add_series(*xy, downsample=10000)
+    assert len(s.y) == 5000
+
+
+def test_downsample_reuse_block(sheet_module: Sheet, xy: tuple[Range, Range]):
+    ax = Axes(300, 10, sheet=sheet_module)
+    s = ax.add_series(*xy, downsample=100)
+    helper = sheet_module.book.sheets[HELPER_SHEET_NAME]
+    n = helper.used_range.columns.count
+
+    s.api.Delete()
+    s = ax.add_series(*xy, downsample=50)
+    assert len(s.y) <= 50
+    assert helper.used_range.columns.count == n
+
+
+def test_clear_helper_sheet(sheet_module: Sheet, xy: tuple[Range, Range]):
+    ax = Axes(300, 10, sheet=sheet_module)
+    ax.add_series(*xy, downsample=100)
+    clear_helper_sheet(sheet_module.book)
+    helper = sheet_module.book.sheets[HELPER_SHEET_NAME]
+    assert helper.range("A1").value is None
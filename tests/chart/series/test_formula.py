@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import pywintypes
+
+from xlviews.chart.series import Series
+
+
+class SeriesApi:
+    def __init__(self, *, reject: bool = False) -> None:
+        self.PlotOrder = 2
+        self.ChartType = -4169
+        self.reject = reject
+        self.formulas: list[str] = []
+
+    @property
+    def Formula(self) -> str:  # noqa: N802
+        return self.formulas[-1]
+
+    @Formula.setter
+    def Formula(self, formula: str) -> None:  # noqa: N802
+        if self.reject:
+            raise pywintypes.com_error
+        self.formulas.append(formula)
+
+
+def create_axes(api: SeriesApi) -> Any:
+    collection = SimpleNamespace(NewSeries=lambda: api, Count=0)
+    chart = SimpleNamespace(SeriesCollection=lambda: collection)
+    return SimpleNamespace(chart=SimpleNamespace(api=[None, chart]))
+
+
+@pytest.mark.parametrize("reject", [False, True])
+def test_formula(reject: bool):
+    api = SeriesApi(reject=reject)
+    x, y = "Sheet1!$A$1:$A$3", "Sheet1!$B$1:$B$3"
+    Series(create_axes(api), x, y, "a", -4169, formula=True)
+
+    if reject:
+        assert api.formulas == []
+        assert (api.Name, api.XValues, api.Values) == ("a", x, y)
+    else:
+        assert api.formulas == [f'=SERIES("a",{x},{y},2)']
+        assert not hasattr(api, "Name")
+
+
+def test_formula_values():
+    api = SeriesApi()
+    Series(create_axes(api), [1, 2], [3, 4], "a", -4169, formula=True)
+    assert api.formulas == []
+    assert (api.Name, api.XValues, api.Values) == ("a", [1, 2], [3, 4])
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from xlviews.chart.downsample import downsample, grid_bin, lttb
+
+
+@pytest.fixture(scope="module")
+def xy():
+    x = np.linspace(0, 20, 10000)
+    return x, np.sin(x) * np.exp(-x / 10)
+
+
+@pytest.mark.parametrize("n", [3, 10, 100, 1000])
+def test_lttb_size(xy, n: int):
+    index = lttb(*xy, n)
+    assert len(index) == n
+    assert index[0] == 0
+    assert index[-1] == len(xy[0]) - 1
+    assert np.all(np.diff(index) > 0)
+
+
+def test_lttb_envelope(xy):
+    x, y = xy
+    index = lttb(x, y, 200)
+    assert y[index].max() == pytest.approx(y.max(), abs=1e-3)
+    assert y[index].min() == pytest.approx(y.min(), abs=1e-3)
+
+
+def test_lttb_small(xy):
+    x, y = xy
+    assert lttb(x[:5], y[:5], 10).tolist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("n", [5, 20, 104, 1000])
+def test_grid_bin_size(n: int):
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=(2, 10000))
+    index = grid_bin(x, y, n)
+    assert len(index) <= n
+    assert x.argmax() in index
+    assert y.argmin() in index
+
+
+def test_downsample_grid():
+    x = np.r_[np.arange(100.0), np.nan]
+    y = np.r_[np.arange(100.0), 1]
+    index = downsample(x, y, 10, "grid")
+    assert 100 not in index
+    assert len(index) <= 10
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from xlviews.chart.axes import MAX_LEGEND_METRICS, get_legend_metrics
+from xlviews.config import rcParams
+
+
+@dataclass
+class Entry:
+    Width: float
+    Height: float
+
+
+@dataclass
+class Legend:
+    entries: list[Entry] = field(default_factory=list)
+    calls: int = 0
+
+    def LegendEntries(self) -> list[Entry]:  # noqa: N802
+        self.calls += 1
+        return self.entries
+
+
+def test_legend_metrics():
+    legend = Legend([Entry(30, 10), Entry(50, 12)])
+    assert get_legend_metrics(legend, ("a",)) == (50, 22)
+    assert get_legend_metrics(legend, ("a",)) == (50, 22)
+    assert legend.calls == 1
+
+
+def test_legend_metrics_version():
+    legend = Legend([Entry(30, 10)])
+    get_legend_metrics(legend, ("b",))
+    size = rcParams["chart.legend.font.size"]
+    rcParams["chart.legend.font.size"] = size
+    get_legend_metrics(legend, ("b",))
+    assert legend.calls == 2
+
+
+def test_legend_metrics_bounded():
+    legend = Legend([Entry(30, 10)])
+    for k in range(MAX_LEGEND_METRICS + 1):
+        get_legend_metrics(legend, ("c", k))
+    get_legend_metrics(legend, ("c", 0))
+    assert legend.calls == MAX_LEGEND_METRICS + 2
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytest
+
+from xlviews.chart.axes import chart_position
+from xlviews.chart.occupancy import Occupancy, clear_occupancy, get_occupancy
+from xlviews.config import rcParams
+
+
+@dataclass
+class Book:
+    name: str = "Book1"
+
+    @property
+    def fullname(self) -> str:
+        return self.name
+
+
+@dataclass
+class Chart:
+    left: float
+    top: float
+    width: float = 100
+    height: float = 50
+
+    @property
+    def api(self) -> list[Any]:
+        return [self, None]
+
+    def __getattr__(self, name: str) -> float:
+        return getattr(self, name.lower())
+
+
+@dataclass
+class Sheet:
+    name: str
+    book: Book = field(default_factory=Book)
+    charts: list[Chart] = field(default_factory=list)
+    CodeName: str = "Sheet1"
+
+    @property
+    def api(self) -> Sheet:
+        return self
+
+    def ChartObjects(self, index: int | None = None) -> Any:  # noqa: N802
+        return self if index is None else self.charts[index - 1]
+
+    @property
+    def Count(self) -> int:  # noqa: N802
+        return len(self.charts)
+
+
+@pytest.fixture
+def sheet():
+    yield Sheet("Sheet1")
+    clear_occupancy()
+
+
+def add(sheet: Sheet, left: float, top: float) -> None:
+    occ = get_occupancy(sheet)  # pyright: ignore[reportArgumentType]
+    chart = Chart(left, top)
+    sheet.charts.append(chart)
+    occ.add((left, top, left + chart.width, top + chart.height))
+
+
+def test_empty(sheet: Sheet):
+    assert not get_occupancy(sheet)  # pyright: ignore[reportArgumentType]
+
+
+def test_read_charts(sheet: Sheet):
+    sheet.charts.extend([Chart(10, 20), Chart(300, 5)])
+    occ = get_occupancy(sheet)  # pyright: ignore[reportArgumentType]
+    assert occ.rects == {0: (10, 20, 110, 70), 1: (300, 5, 400, 55)}
+
+
+def test_read_charts_deleted(sheet: Sheet):
+    add(sheet, 10, 20)
+    add(sheet, 110, 20)
+    sheet.charts.pop(0)
+    occ = get_occupancy(sheet)  # pyright: ignore[reportArgumentType]
+    assert list(occ.rects.values()) == [(110, 20, 210, 70)]
+
+
+def test_read_charts_moved(sheet: Sheet):
+    add(sheet, 10, 20)
+    add(sheet, 110, 20)
+    sheet.charts[-1].top = 100
+    occ = get_occupancy(sheet)  # pyright: ignore[reportArgumentType]
+    assert occ.last == (110, 100, 210, 150)
+
+
+def test_read_charts_replaced(sheet: Sheet):
+    add(sheet, 10, 20)
+    sheet.charts[0] = Chart(50, 60)
+    occ = get_occupancy(sheet)  # pyright: ignore[reportArgumentType]
+    assert list(occ.rects.values()) == [(50, 60, 150, 110)]
+
+
+def test_move_keeps_order():
+    occ = Occupancy()
+    a = occ.add((0, 0, 10, 10))
+    occ.add((10, 0, 20, 10))
+    occ.move(a, (0, 10, 10, 20))
+    assert occ.last == (10, 0, 20, 10)
+    assert occ.bottom == 20
+
+
+@pytest.mark.parametrize(
+    ("left", "top", "expected"),
+    [
+        (None, None, (210, 20)),
+        (None, 0, (210, 20)),
+        (0, None, (10, 70)),
+        (0, 100, (10, 100)),
+        (200, 0, (200, 20)),
+        (5, 6, (5, 6)),
+    ],
+)
+def test_chart_position(sheet: Sheet, left, top, expected):
+    add(sheet, 10, 20)
+    add(sheet, 110, 20)
+    assert chart_position(sheet, left, top) == expected  # pyright: ignore[reportArgumentType]
+
+
+def test_chart_position_empty(sheet: Sheet):
+    expected = rcParams["chart.left"], rcParams["chart.top"]
+    assert chart_position(sheet, None, None) == expected  # pyright: ignore[reportArgumentType]
+
+
+def test_chart_position_occupancy():
+    occ = Occupancy()
+    occ.add((10, 20, 110, 70))
+    assert chart_position(None, None, None, occ) == (110, 20)  # pyright: ignore[reportArgumentType]
+
+
+def test_read_charts_rounded(sheet: Sheet):
+    add(sheet, 10, 20)
+    sheet.charts[-1].left = 10.5
+    occ = get_occupancy(sheet)  # pyright: ignore[reportArgumentType]
+    assert occ.last == (10, 20, 110, 70)
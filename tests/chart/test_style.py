@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from xlviews.chart.style import get_line_style, get_marker_style
+from xlviews.chart.style import get_line_formats, get_line_style, get_marker_style
+from xlviews.config import rcParams
 
 
 def test_marker_style_int():
@@ -9,3 +10,10 @@ def test_marker_style_int():
 
 def test_line_style_int():
     assert get_line_style(1) == 1
+
+
+def test_line_formats():
+    weight = rcParams["chart.gridlines.weight"]
+    rcParams["chart.gridlines.weight"] = 2
+    assert get_line_formats()["gridlines"][1] == 2
+    rcParams["chart.gridlines.weight"] = weight
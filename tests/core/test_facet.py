@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas import DataFrame
+
+from xlviews.core.facet import FacetIndex, take
+
+
+@pytest.fixture(scope="module")
+def df():
+    values = {"a": [2, 2, 1, 1, 2], "b": [1, 2, 1, 2, 3], "c": range(5)}
+    return DataFrame(values).set_index(["a", "b"])
+
+
+def test_keys(df: DataFrame):
+    fi = FacetIndex(df.index, "a")
+    assert fi.keys == [{"a": 2}, {"a": 1}]
+
+
+def test_indices(df: DataFrame):
+    fi = FacetIndex(df.index, "a")
+    assert [i.tolist() for i in fi.indices] == [[0, 1, 4], [2, 3]]
+
+
+def test_multi(df: DataFrame):
+    fi = FacetIndex(df.index, ["a", "b"])
+    assert len(fi) == 5
+    assert fi.keys[2] == {"a": 1, "b": 1}
+
+
+def test_none(df: DataFrame):
+    fi = FacetIndex(df.index, None)
+    assert fi.keys == [{}]
+    assert fi.indices[0].tolist() == [0, 1, 2, 3, 4]
+    assert fi.get({}) is fi.indices[0]
+
+
+def test_empty(df: DataFrame):
+    assert len(FacetIndex(df.index, [])) == 0
+
+
+def test_get(df: DataFrame):
+    fi = FacetIndex(df.index, "a")
+    assert fi.get({"a": 1, "b": 2}).tolist() == [2, 3]  # pyright: ignore[reportOptionalMemberAccess]
+    assert fi.get({"a": 3}) is None
+
+
+def test_nan():
+    index = pd.MultiIndex.from_arrays([[1.0, np.nan, 1.0], [1, 2, 3]])
+    fi = FacetIndex(index, 0)
+    assert fi.indices[1].tolist() == [1]
+
+
+@pytest.mark.parametrize("key", [1, 2])
+def test_take(df: DataFrame, key: int):
+    fi = FacetIndex(df.index, "a")
+    sub = take(df, fi.get({"a": key}), ["a"])  # pyright: ignore[reportArgumentType]
+    pd.testing.assert_frame_equal(sub, df.xs(key, level="a"))
+
+
+def test_take_keep_level(df: DataFrame):
+    fi = FacetIndex(df.index, "a")
+    sub = take(df, fi.indices[1], ["a"], drop_level=False)
+    assert sub.index.names == ["a", "b"]
+
+
+def test_take_columns(df: DataFrame):
+    x = df.T
+    fi = FacetIndex(x.columns, "b")
+    sub = take(x, fi.indices[0], ["b"], axis=1)
+    pd.testing.assert_frame_equal(sub, x.xs(1, axis=1, level="b"))
@@ -8,8 +8,15 @@ from pandas import DataFrame
 from xlwings import Range as RangeImpl
 from xlwings import Sheet
 
-from xlviews.core.formula import NONCONST_VALUE, aggregate, const
+from xlviews.core.formula import (
+    NONCONST_VALUE,
+    aggregate,
+    aggregate_grid,
+    aggregate_grids,
+    const,
+)
 from xlviews.core.range import Range
+from xlviews.core.range_collection import RangeCollection
 from xlviews.testing import is_app_available
 
 pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
@@ -148,3 +155,60 @@ def test_aggregate_range(ranges: list[Range], func: str, value: float, cls: Cls)
 def test_aggreate_func_invalid():
     with pytest.raises(ValueError, match="Invalid aggregate function: sin"):
         aggregate("sin", "A1:A10")
+
+
+RUNS = [[(3, 4)], [(5, 5), (8, 9)], [(6, 7), (10, 10), (12, 15)]]
+
+
+@pytest.mark.parametrize("func", [None, "sum", "soa", "first"])
+@pytest.mark.parametrize("formula", [False, True])
+def test_aggregate_grid(sheet_module: Sheet, func: str | None, formula: bool):
+    x = aggregate_grid(func, RUNS, [2, 28], formula=formula, sheet=sheet_module)
+    assert x.shape == (3, 2)
+
+    for runs, row in zip(RUNS, x, strict=True):
+        for column, value in zip([2, 28], row, strict=True):
+            if func == "first":
+                rng = Range((runs[0][0], column), sheet=sheet_module)
+                y = aggregate(None, rng, formula=formula)
+            else:
+                rng = RangeCollection(runs, column, sheet_module)
+                y = aggregate(func, rng, formula=formula)
+            assert value == y
+
+
+def test_aggregate_grid_range(sheet_module: Sheet):
+    ref = Range((1, 1), sheet=sheet_module)
+    x = aggregate_grid(ref, RUNS, [3], include_sheetname=True, sheet=sheet_module)
+    rng = RangeCollection(RUNS[2], 3, sheet_module)
+    assert x[2, 0] == aggregate(ref, rng, include_sheetname=True)
+
+
+def test_aggregate_grid_invalid():
+    with pytest.raises(ValueError, match="Invalid aggregate function: sin"):
+        aggregate_grid("sin", RUNS, [2])
+
+
+def test_aggregate_grid_n_jobs(sheet_module: Sheet):
+    kwargs = {"include_sheetname": True, "sheet": sheet_module}
+    x = aggregate_grid("mean", RUNS, range(2, 12), **kwargs)
+    y = aggregate_grid("mean", RUNS, range(2, 12), n_jobs=3, **kwargs)
+    np.testing.assert_array_equal(x, y)
+
+
+def test_aggregate_grids_n_jobs(sheet_module: Sheet):
+    ref = Range((1, 1), sheet=sheet_module)
+    specs = [("mean", [2]), ("max", range(3, 8)), (ref, [8, 9]), ("sum", [])]
+    kwargs = {"include_sheetname": True, "sheet": sheet_module}
+    xs = aggregate_grids(specs, RUNS, **kwargs)
+    ys = aggregate_grids(specs, RUNS, n_jobs=4, **kwargs)
+    assert [x.shape for x in xs] == [(len(RUNS), n) for n in [1, 5, 2, 0]]
+    for (func, columns), x, y in zip(specs, xs, ys, strict=True):
+        np.testing.assert_array_equal(x, y)
+        np.testing.assert_array_equal(x, aggregate_grid(func, RUNS, columns, **kwargs))
+
+
+@pytest.mark.parametrize("func", ["first", "max", None])
+def test_aggregate_grid_empty(func: str | None):
+    x = aggregate_grid(func, [], [2, 3])
+    assert x.shape == (0, 2)
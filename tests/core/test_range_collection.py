@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from xlviews.core.range import Range
 from xlviews.core.range_collection import RangeCollection
 from xlviews.testing import is_app_available
 
@@ -70,3 +71,17 @@ def test_range_collection_repr(sheet_module: Sheet):
 def test_iter_ranges_error(sheet_module: Sheet):
     with pytest.raises(TypeError):
         RangeCollection((1, 2), (3, 4), sheet_module)
+
+
+def test_range_collection_from_ranges(sheet_module: Sheet):
+    ranges = [Range((2, 3), (4, 5), sheet_module), Range((8, 1), sheet=sheet_module)]
+    rc = RangeCollection.from_ranges(ranges)
+    assert rc.get_address() == "$C$2:$E$4,$A$8"
+    assert rc.api.Address == "$C$2:$E$4,$A$8"
+
+
+def test_range_collection_api_long(sheet_module: Sheet):
+    rc = RangeCollection([(r, r) for r in range(1000, 1200, 2)], 30, sheet_module)
+    assert len(rc.get_address()) > 255
+    assert rc.api.Areas.Count == 100
+    assert rc.api.Areas(100).Address == "$AD$1198"
@@ -7,11 +7,10 @@ import pytest
 from pandas import Index, MultiIndex
 from scipy.stats import norm
 
-from xlviews.dataframes.dist_frame import get_init_data, select_index
+from xlviews.dataframes.dist_frame import DistFrame, get_formula_data, select_index
 from xlviews.testing import is_app_available
 
 if TYPE_CHECKING:
-    from xlviews.dataframes.dist_frame import DistFrame
     from xlviews.dataframes.sheet_frame import SheetFrame
 
 pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
@@ -51,8 +50,10 @@ def test_select_index_multi_none():
     assert x.equals(Index([0, 1]))
 
 
-def test_init_data(sf_parent: SheetFrame):
-    df = get_init_data(sf_parent.index, ["a", "b"])
+def test_formula_data(sf_parent: SheetFrame):
+    runs = list(sf_parent.groupby(["x", "y"]).values())
+    runs = [run[0] for run in runs]
+    df = get_formula_data(sf_parent.index, ["a", "b"], runs, [4, 5], 9)
     c = ["a_n", "a_v", "a_s", "b_n", "b_v", "b_s"]
     assert df.columns.to_list() == c
     assert df.index.names == ["x", "y"]
@@ -94,3 +95,8 @@ def test_value(sf: DistFrame, cell: str, value: float):
     v = sf.sheet[cell].value
     assert v is not None
     np.testing.assert_allclose(v, value)
+
+
+def test_invalid_mode(sf_parent: SheetFrame):
+    with pytest.raises(ValueError, match="Invalid mode: statics"):
+        DistFrame(sf_parent, ["a"], by=["x", "y"], mode="statics")  # pyright: ignore[reportArgumentType]
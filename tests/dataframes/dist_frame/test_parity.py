@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from xlviews.dataframes.dist_frame import DistFrame
+from xlviews.testing import is_app_available
+from xlviews.testing.dist_frame import Parent
+
+if TYPE_CHECKING:
+    from xlwings import Sheet
+
+pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
+
+
+@pytest.mark.parametrize("mode", ["static", "spill"])
+@pytest.mark.parametrize("dist", ["norm", "weibull"])
+@pytest.mark.parametrize("by", [["x", "y"], "x", None])
+def test_parity(sheet: Sheet, mode: str, dist: str, by: list[str] | str | None):
+    fc = Parent(sheet, 3, 2)
+    expected = DistFrame(fc.sf, by=by, dist=dist).value.astype(float)
+    actual = DistFrame(fc.sf, by=by, dist=dist, mode=mode).value.astype(float)
+    np.testing.assert_allclose(actual, expected, rtol=1e-8)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from pandas import DataFrame
+from scipy.stats import norm
+
+from xlviews.dataframes.dist_frame import get_static_data, norm_ppf, ppf
+from xlviews.testing.dist_frame import Parent
+
+
+@pytest.fixture(scope="module")
+def df():
+    values = Parent.dataframe()
+    runs = [(0, 4), (5, 8), (9, 11), (12, 13)]
+    return get_static_data(values.index, values, runs)
+
+
+@pytest.mark.parametrize(
+    ("column", "row", "value"),
+    [
+        ("a_n", 0, 1),
+        ("a_v", 0, 1),
+        ("a_n", 3, 4),
+        ("a_v", 3, 4),
+        ("a_n", 13, 2),
+        ("a_v", 13, 2),
+        ("a_v", 9, 1),
+        ("a_v", 10, 2),
+        ("a_v", 11, 3),
+        ("b_n", 9, 1),
+        ("b_n", 10, 2),
+        ("b_n", 11, 2),
+        ("a_s", 0, norm.ppf(1 / 6)),
+        ("b_s", 1, norm.ppf(2 / 6)),
+        ("a_s", 2, norm.ppf(3 / 6)),
+        ("b_s", 3, norm.ppf(4 / 6)),
+        ("a_s", 4, norm.ppf(5 / 6)),
+        ("a_s", 9, norm.ppf(1 / 4)),
+        ("a_s", 10, norm.ppf(2 / 4)),
+        ("a_s", 11, norm.ppf(3 / 4)),
+        ("b_s", 9, norm.ppf(1 / 3)),
+        ("b_s", 10, norm.ppf(2 / 3)),
+        ("b_s", 11, norm.ppf(2 / 3)),
+        ("b_s", 12, norm.ppf(1 / 3)),
+        ("a_s", 13, norm.ppf(2 / 3)),
+    ],
+)
+def test_value(df: DataFrame, column: str, row: int, value: float):
+    np.testing.assert_allclose(df[column].iloc[row], value)
+
+
+def test_index(df: DataFrame):
+    assert df.index.names == ["x", "y"]
+    assert len(df) == 14
+
+
+def test_na():
+    values = DataFrame({"a": [None, 2, 1]})
+    df = get_static_data(values.index, values, [(0, 2)])
+    assert df["a_n"].to_list() == [0, 1, 2]
+    assert df["a_v"].to_list() == ["=NA()", 1, 2]
+    assert df["a_s"].iloc[0] == "=NA()"
+
+
+def test_norm_ppf():
+    p = np.linspace(0, 1, 10001)[1:-1]
+    np.testing.assert_allclose(norm_ppf(p), norm.ppf(p), rtol=1.2e-9)
+
+
+def test_norm_ppf_limit():
+    assert norm_ppf([0, 1, -1, np.nan]).tolist()[:2] == [-np.inf, np.inf]
+    assert np.isnan(norm_ppf([-1, np.nan])).all()
+
+
+def test_ppf_weibull():
+    p = np.array([0.1, 0.5, 0.9])
+    np.testing.assert_allclose(ppf(p, "weibull"), np.log(-np.log(1 - p)))
+
+
+def test_ppf_error():
+    with pytest.raises(ValueError, match="unknown distribution"):
+        ppf([0.5], "unknown")
@@ -4,7 +4,9 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 import pytest
+from xlwings.constants import FormatConditionType
 
+from xlviews.colors import rgb
 from xlviews.testing import is_app_available
 from xlviews.testing.heat_frame.base import Base
 from xlviews.testing.sheet_frame.pivot import Base as BaseParent
@@ -84,3 +86,25 @@ def test_number_format(sf: HeatFrame):
     sf.number_format("0.00")
     assert sf.sheet.range("H4").api.NumberFormatLocal == "0.00"
     assert sf.sheet.range("K8").api.NumberFormatLocal == "0.00"
+
+
+@pytest.mark.parametrize(
+    ("cell", "color"),
+    [("H3", (130, 130, 255)), ("K8", (255, 130, 130)), ("J5", (118, 173, 91))],
+)
+def test_bake(sf: HeatFrame, cell: str, color: tuple[int, int, int]):
+    sf.set(bake=True)
+    assert sf.sheet.range(cell).api.Interior.Color == rgb(color)
+
+
+def count_color_scales(sf: HeatFrame) -> int:
+    conditions = sf.range.api.FormatConditions
+    types = [conditions.Item(k).Type for k in range(1, conditions.Count + 1)]
+    return types.count(FormatConditionType.xlColorScale)
+
+
+def test_bake_deletes_color_scale(sf: HeatFrame):
+    sf.set()
+    assert count_color_scales(sf) == 1
+    sf.set(bake=True)
+    assert count_color_scales(sf) == 0
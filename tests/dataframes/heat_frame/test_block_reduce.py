@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from pandas import DataFrame
+
+from xlviews.dataframes.heat_frame import block_reduce
+
+
+@pytest.fixture(scope="module")
+def df():
+    x = np.arange(30.0).reshape(5, 6)
+    x[0, 0] = np.nan
+    return DataFrame(x, index=list("abcde"), columns=list("pqrstu"))
+
+
+def test_shape(df: DataFrame):
+    assert block_reduce(df, 2).shape == (3, 3)
+
+
+def test_labels(df: DataFrame):
+    r = block_reduce(df, (2, 3))
+    assert r.index.to_list() == ["a", "c", "e"]
+    assert r.columns.to_list() == ["p", "s"]
+
+
+@pytest.mark.parametrize(
+    ("func", "value"),
+    [("mean", 14 / 3), ("max", 7), ("min", 1), ("sum", 14), ("count", 3)],
+)
+def test_func(df: DataFrame, func, value: float):
+    assert block_reduce(df, 2, func).iloc[0, 0] == pytest.approx(value)
+
+
+def test_padding(df: DataFrame):
+    r = block_reduce(df, 2, "count")
+    assert r.iloc[2].to_list() == [2, 2, 2]
+
+
+def test_empty_tile():
+    df = DataFrame([[np.nan, 1.0]])
+    r = block_reduce(df, 1, "mean")
+    assert np.isnan(r.iloc[0, 0])
+    assert r.iloc[0, 1] == 1
+
+
+@pytest.mark.parametrize("tile", [0, -1, (2, 0), (0, 3)])
+def test_invalid_tile(df: DataFrame, tile: int | tuple[int, int]):
+    with pytest.raises(ValueError, match="The tile size must be positive"):
+        block_reduce(df, tile)
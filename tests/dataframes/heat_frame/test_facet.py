@@ -43,3 +43,12 @@ def hfs(sf: SheetFrame):
 )
 def test_value(hfs: list[HeatFrame], i: int, v: int | None):
     assert hfs[i].cell.offset(1, 1).value == v
+
+
+def test_len(hfs: list[HeatFrame]):
+    assert len(hfs) == 6
+
+
+@pytest.mark.parametrize("i", range(6))
+def test_corner(hfs: list[HeatFrame], i: int):
+    assert hfs[i].cell.value is None
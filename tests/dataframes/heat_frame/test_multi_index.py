@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING
 import numpy as np
 import pytest
 
+from xlviews.colors import rgb
+from xlviews.config import rcParams
 from xlviews.testing import is_app_available
 from xlviews.testing.heat_frame.base import MultiIndex, MultiIndexParent
 
@@ -63,3 +65,21 @@ def test_columns_from_sf(sf: HeatFrame):
 )
 def test_values(sf: HeatFrame, i: int, value: int):
     assert sf.sheet.range(f"W{i}:AA{i}").value == value
+
+
+@pytest.mark.parametrize(
+    ("cell", "address"),
+    [("V3", "$V$3:$V$8"), ("V21", "$V$21:$V$26"), ("W2", "$W$2:$Z$2")],
+)
+def test_merge(sf: HeatFrame, cell: str, address: str):
+    assert sf.sheet[cell].api.MergeArea.Address == address
+
+
+@pytest.mark.parametrize(
+    ("strip", "index"),
+    [("Z3:AA8", 11), ("AD3:AE8", 11), ("W8:Z9", 12), ("AA14:AD15", 12)],
+)
+def test_heat_border(sf: HeatFrame, strip: str, index: int):
+    border = sf.sheet[strip].api.Borders(index)
+    assert border.Color == rgb(rcParams["heat.border.color"])
+    assert border.Weight == 2
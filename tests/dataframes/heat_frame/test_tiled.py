@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from pandas import DataFrame
+
+from xlviews.dataframes.heat_frame import HeatFrame
+from xlviews.testing import is_app_available
+
+if TYPE_CHECKING:
+    from xlwings import Sheet
+
+pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
+
+
+@pytest.fixture(scope="module")
+def sf(sheet_module: Sheet):
+    df = DataFrame(np.arange(48.0).reshape(6, 8))
+    return HeatFrame.tiled(2, 2, df, (3, 4), "max", sheet_module)
+
+
+def test_shape(sf: HeatFrame):
+    assert sf.shape == (2, 2)
+    assert sf.tile == (3, 4)
+
+
+def test_header(sf: HeatFrame):
+    assert sf.cell.value == "max 3x4"
+
+
+def test_values(sf: HeatFrame):
+    assert sf.range.value == [[19, 23], [43, 47]]
+
+
+def test_detail(sf: HeatFrame):
+    detail = sf.detail(1, 0, 2, 7)
+    assert detail.shape == (3, 4)
+    assert detail.range.value[0] == [24, 25, 26, 27]
+    assert detail.index.to_list() == [3, 4, 5]
+
+
+def test_detail_not_tiled(sf: HeatFrame):
+    detail = sf.detail(0, 0, 8, 2)
+    with pytest.raises(ValueError, match="not tiled"):
+        detail.detail(0, 0, 2, 14)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pandas import DataFrame
+
+from xlviews.dataframes.dist_frame import DistFrame
+from xlviews.dataframes.sheet_frame import SheetFrame
+from xlviews.testing import is_app_available
+
+if TYPE_CHECKING:
+    from xlwings import Sheet
+
+pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
+
+
+@pytest.fixture(scope="module")
+def df():
+    df = DataFrame(
+        {
+            "x": [1, 2, 1, 2, 1, 2],
+            "y": [3, 3, 4, 3, 3, 4],
+            "a": [1, 2, 3, 4, 5, 6],
+        },
+    )
+    return df.set_index(["x", "y"])
+
+
+@pytest.fixture(scope="module")
+def sf(df: DataFrame, sheet_module: Sheet):
+    return SheetFrame(2, 2, df, sheet_module, sort_by=["x", "y"])
+
+
+def test_value(sf: SheetFrame):
+    assert sf.value["a"].to_list() == [1, 5, 3, 2, 4, 6]
+
+
+def test_index(sf: SheetFrame):
+    assert sf.index.to_list() == [(1, 3), (1, 3), (1, 4), (2, 3), (2, 3), (2, 4)]
+
+
+def test_groupby(sf: SheetFrame):
+    assert all(len(v) == 1 for v in sf.groupby(["x", "y"]).values())
+
+
+def test_fragmentation(sf: SheetFrame):
+    assert sf.fragmentation
+    assert sf.fragmentation.fragments == (6, 4)
+    assert sf.fragmentation.length[0] > sf.fragmentation.length[1]
+
+
+def test_fragmentation_none(df: DataFrame, sheet_module: Sheet):
+    sf = SheetFrame(2, 6, df, sheet_module)
+    assert sf.fragmentation is None
+
+
+def test_dist_frame(df: DataFrame, sheet_module: Sheet):
+    sf = SheetFrame(10, 2, df, sheet_module, sort_by=":y")
+    dist = DistFrame(sf, "a", by=["x", "y"])
+    assert dist.sheet["H11"].value == 1
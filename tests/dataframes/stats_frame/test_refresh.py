@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from pandas import DataFrame
+
+from xlviews.dataframes.groupby import GroupBy
+from xlviews.dataframes.stats_frame import StatsFrame, get_frame
+from xlviews.testing import is_app_available
+from xlviews.testing.stats_frame import Parent
+
+if TYPE_CHECKING:
+    from xlwings import Sheet
+
+pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
+
+
+def update(sf: StatsFrame, x: list[str]) -> None:
+    parent = sf.parent
+    df = parent.value.reset_index()
+    df["x"] = x
+    df = df.set_index(["x", "y", "z"])
+    parent.cell.options(DataFrame).value = df
+    parent.index = df.index
+
+
+def replace(sf: StatsFrame, df: DataFrame) -> None:
+    parent = sf.parent
+    parent.expand().impl.clear_contents()
+    parent.cell.options(DataFrame).value = df
+    parent.index = df.index
+
+    if parent.table:
+        parent.table.api.Resize(parent.expand().api)
+
+
+def formulas(sf: StatsFrame) -> list[list[str]]:
+    rng = sf.sheet.range(sf.row + 1, sf.column).resize(len(sf), sf.width)
+    return np.array(rng.formula).tolist()
+
+
+def expected(sf: StatsFrame) -> list[list[str]]:
+    data = get_frame(GroupBy(sf.parent, sf.by), sf.funcs, sf.func_column_name)
+    return data.reset_index().to_numpy(dtype=str).tolist()
+
+
+@pytest.mark.parametrize(
+    "x",
+    [
+        ["a"] * 8 + ["b"] * 8 + ["c"] * 4,
+        ["b"] * 20,
+        ["a"] * 4 + ["b"] * 4 + ["c"] * 8 + ["d"] * 4,
+    ],
+)
+def test_refresh(sheet: Sheet, x: list[str]):
+    fc = Parent(sheet, 3, 3, table=True)
+    sf = StatsFrame(fc.sf, ["count", "mean"], by=":y")
+    row = sf.parent.row
+
+    update(sf, x)
+    sf.refresh()
+
+    assert formulas(sf) == expected(sf)
+    assert sf.parent.row == row + (len(sf) - 8)
+    assert sf.table
+    assert sf.table.api.ListRows.Count == len(sf)
+
+
+def test_refresh_unchanged(sheet: Sheet):
+    fc = Parent(sheet, 3, 3, table=True)
+    sf = StatsFrame(fc.sf, ["count", "mean"], by=":y")
+    values = formulas(sf)
+
+    sf.refresh()
+
+    assert formulas(sf) == values
+
+
+def test_refresh_keeps_cells_beside(sheet: Sheet):
+    fc = Parent(sheet, 3, 3, table=True)
+    sf = StatsFrame(fc.sf, ["count", "mean"], by=":y")
+    cell = sheet.range(sf.row + 2, sf.column + sf.width + 2)
+    cell.value = "beside"
+
+    update(sf, ["b"] * 20)
+    sf.refresh()
+
+    assert cell.value == "beside"
+
+
+def create_data(x: list[str], y: list[str]) -> DataFrame:
+    n = len(x)
+    df = DataFrame({"x": x, "y": y, "z": range(1, n + 1), "a": range(n)})
+    df["b"] = df["a"] * 2
+    df["c"] = df["a"] * 3.0
+    return df.set_index(["x", "y", "z"])
+
+
+@pytest.mark.parametrize(
+    ("x", "y", "n"),
+    [
+        (["a"] * 8 + ["b"] * 8 + ["c"] * 14, (["c"] * 5 + ["d"] * 5) * 3, 6),
+        (["a"] * 6, ["c"] * 3 + ["d"] * 3, 2),
+        (["b"] * 8 + ["c"] * 4, ["c"] * 4 + ["d"] * 4 + ["c"] * 4, 3),
+    ],
+    ids=["grow", "shrink", "replace"],
+)
+def test_refresh_resize(sheet: Sheet, x: list[str], y: list[str], n: int):
+    fc = Parent(sheet, 3, 3, table=True)
+    sf = StatsFrame(fc.sf, ["count", "mean"], by=":y")
+    row = sf.parent.row
+
+    df = create_data(x, y)
+    replace(sf, df)
+    sf.refresh()
+
+    assert len(sf) == 2 * n
+    assert formulas(sf) == expected(sf)
+    assert sf.parent.row == row + (len(sf) - 8)
+    assert sf.table
+    assert sf.table.api.ListRows.Count == len(sf)
+
+    value = sf.parent.value
+    np.testing.assert_array_equal(value.to_numpy(), df.to_numpy())
+    assert sf.parent.table
+    assert sf.parent.table.api.ListRows.Count == len(df)
+    assert sheet.range(sf.parent.row + len(df) + 1, sf.parent.column).value is None
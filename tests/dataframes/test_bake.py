@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from xlviews.core.range import Range
+from xlviews.dataframes.style import bake_color_scale, iter_color_runs
+from xlviews.style import interpolate_color_scale
+from xlviews.style_plan import StylePlan
+
+
+@dataclass
+class Book:
+    name: str = "Book1"
+
+
+@dataclass
+class Sheet:
+    name: str = "Sheet1"
+    book: Book = field(default_factory=Book)
+
+
+def test_bake_color_scale_plan_size():
+    values = np.random.default_rng(0).random((150, 150))
+    rng = Range((2, 2), (151, 151), Sheet())  # pyright: ignore[reportArgumentType]
+    plan = StylePlan()
+
+    bake_color_scale(rng, values, plan=plan)
+
+    keys = [key for key, _ in plan]
+    assert all(key[0] == "fill" and key[2] is False for key in keys)
+
+    colors = interpolate_color_scale(values, values.min(), values.max())
+    runs = list(iter_color_runs(colors))
+    assert len(plan) == len(np.unique(colors))
+    assert sum(len(rc) for _, rc in plan) == len(runs)
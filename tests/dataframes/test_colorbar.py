@@ -33,6 +33,16 @@ def test_colorbar_vertical(rng: Range, sheet_module: Sheet):
     assert sheet_module.range((1, 6)).column_width == 1
 
 
+def test_colorbar_ticks(rng: Range, sheet_module: Sheet):
+    cb = Colorbar(2, 9, 6, sheet=sheet_module)
+    cb.set(vmin=rng, vmax=rng)
+
+    ticks = sheet_module.range((3, 9), (6, 9))
+    assert ticks.value == pytest.approx([3.4, 2.8, 2.2, 1.6])
+    assert ticks.api.Font.Size == 4
+    assert ticks.number_format == "0"
+
+
 def test_colorbar_horizontal(rng: Range, sheet_module: Sheet):
     cb = Colorbar(2, 7, 10, orientation="horizontal", sheet=sheet_module)
     cb.set(vmin=rng, vmax=rng, label="T", autofit=True)
@@ -6,7 +6,14 @@ import numpy as np
 import pytest
 from pandas import DataFrame, Series
 
-from xlviews.dataframes.groupby import GroupBy, create_group_index, to_dict
+from xlviews.dataframes.groupby import (
+    GroupBy,
+    argsort_groups,
+    create_group_index,
+    formula_length,
+    sort_groups,
+    to_dict,
+)
 from xlviews.dataframes.sheet_frame import SheetFrame
 from xlviews.testing import is_app_available
 
@@ -57,6 +64,28 @@ def test_create_group_index_dataframe(func: Callable[..., Any]):
     assert index[3, 4] == [(2, 3), (5, 6)]
 
 
+def test_argsort_groups():
+    values = [[1, 2], [3, 4], [1, 2], [3, 4], [1, 2]]
+    assert argsort_groups(values).tolist() == [0, 2, 4, 1, 3]
+
+
+@pytest.mark.parametrize(
+    ("runs", "column", "expected"),
+    [([(3, 3)], 1, "$A$3"), ([(3, 5), (8, 9)], 27, "$AA$3:$AA$5,$AA$8:$AA$9")],
+)
+def test_formula_length(runs: list[tuple[int, int]], column: int, expected: str):
+    assert formula_length(runs, column) == len(expected)
+
+
+def test_sort_groups():
+    df = DataFrame({"x": [1, 2, 1, 2, 1], "a": range(5)}).set_index("x")
+    data, fr = sort_groups(df, "x", 3, 3)
+    assert data["a"].to_list() == [0, 2, 4, 1, 3]
+    assert fr.fragments == (5, 2)
+    assert fr.length == (len("$C$3,$C$5,$C$7") + len("$C$4,$C$6"), 2 * 9)
+    assert repr(fr) == "<Fragmentation fragments=5->2 length=23->18>"
+
+
 @pytest.fixture(scope="module")
 def sf(sheet_module: Sheet):
     a = ["c"] * 10
@@ -2,22 +2,30 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
 import pytest
 from pandas import DataFrame, MultiIndex
 
 from xlviews.colors import rgb
 from xlviews.config import rcParams
+from xlviews.core.range import Range
 from xlviews.dataframes.sheet_frame import SheetFrame
 from xlviews.dataframes.style import (
     _set_style,
+    _style_versions,
+    bake_color_scale,
+    register_frame_style,
+    register_frame_styles,
     set_frame_style,
     set_table_style,
     set_wide_column_style,
 )
+from xlviews.format_state import get_format_state
+from xlviews.style import interpolate_color_scale
 from xlviews.testing import is_app_available
 
 if TYPE_CHECKING:
-    from xlwings import Sheet
+    from xlwings import App, Sheet
 
 # pyright: reportPrivateUsage=false
 
@@ -162,3 +170,105 @@ def test_table_style(sheet_module: Sheet):
     assert table
     set_table_style(table)
     assert table.sheet.book.api.TableStyles("xlviews")
+
+
+def test_frame_style_named(sf_basic: SheetFrame):
+    assert sf_basic.sheet["B2"].api.Style.Name == "xlviews.index.name"
+    assert sf_basic.sheet["D5"].api.Style.Name == "xlviews.values"
+
+
+def test_frame_style_not_named(sheet: Sheet):
+    df = DataFrame({"a": [1, 2], "b": [3, 4]})
+    sf = SheetFrame(2, 2, data=df, sheet=sheet)
+    set_frame_style(sf, named_style=False)
+    assert sheet["D4"].api.Style.Name == "Normal"
+    c = rgb(rcParams["frame.values.fill.color"])
+    assert sheet["D4"].api.Interior.Color == c
+
+
+def test_frame_style_named_number_format(sheet: Sheet):
+    df = DataFrame({"a": [1.2, 2.3], "b": [3.4, 4.5]})
+    sf = SheetFrame(2, 2, data=df, sheet=sheet)
+    sf.number_format("0.000")
+    set_frame_style(sf)
+    assert sheet["D4"].api.NumberFormat == "0.000"
+
+
+def test_register_frame_styles(sheet: Sheet):
+    names = register_frame_styles(sheet.book)
+    assert names[0] == "xlviews.index.name"
+    assert sheet.book.api.Styles("xlviews.wide-columns").Name == names[-1]
+
+
+def test_register_frame_style_update(sheet: Sheet):
+    df = DataFrame({"a": [1, 2], "b": [3, 4]})
+    sf = SheetFrame(2, 2, data=df, sheet=sheet)
+    set_frame_style(sf)
+
+    color = rcParams["frame.values.fill.color"]
+    rcParams["frame.values.fill.color"] = "#ff0000"
+
+    try:
+        register_frame_style(sheet.book, "values")
+        assert sheet["D4"].api.Interior.Color == rgb("#ff0000")
+        sheet.book.api.Styles("xlviews.values").Interior.Color = rgb(color)
+        register_frame_style(sheet.book, "values")
+        assert sheet["D4"].api.Interior.Color == rgb(color)
+        register_frame_style(sheet.book, "values", update=True)
+        assert sheet["D4"].api.Interior.Color == rgb("#ff0000")
+    finally:
+        rcParams["frame.values.fill.color"] = color
+        register_frame_style(sheet.book, "values")
+
+
+def test_register_frame_style_missing(app: App):
+    book = app.books.add()
+
+    try:
+        _style_versions[book.fullname, "xlviews.values"] = rcParams.version
+        register_frame_style(book, "values")
+        assert book.api.Styles("xlviews.values").Name == "xlviews.values"
+    finally:
+        book.close()
+
+
+def test_frame_style_refreshed_after_rcparams_change(sheet: Sheet):
+    df = DataFrame({"a": [1, 2], "b": [3, 4]})
+    sf = SheetFrame(2, 2, data=df, sheet=sheet)
+    set_frame_style(sf)
+
+    color = rcParams["frame.values.fill.color"]
+    rcParams["frame.values.fill.color"] = "#00ff00"
+
+    try:
+        set_frame_style(sf)
+        assert sheet["D4"].api.Interior.Color == rgb("#00ff00")
+    finally:
+        rcParams["frame.values.fill.color"] = color
+        register_frame_style(sheet.book, "values")
+
+
+def test_frame_style_twice(sheet: Sheet):
+    df = DataFrame({"a": [1, 2], "b": [3, 4]})
+    sf = SheetFrame(2, 2, data=df, sheet=sheet)
+    set_frame_style(sf)
+
+    state = get_format_state(sheet)
+    writes = state.writes
+    assert state.get("style", (3, 3, 4, 4)) == "xlviews.values"
+
+    set_frame_style(sf)
+    assert state.writes == writes
+    assert state.skips
+
+
+def test_bake_color_scale_size(sheet: Sheet):
+    values = np.random.default_rng(0).random((150, 150))
+    rng = Range((2, 2), (151, 151), sheet)
+
+    colors = interpolate_color_scale(values, values.min(), values.max())
+    bake_color_scale(rng, values)
+
+    assert sheet["B2"].api.Interior.Color == colors[0, 0]
+    assert sheet["EU151"].api.Interior.Color == colors[-1, -1]
+    assert len(get_format_state(sheet)) == 0
@@ -114,3 +114,22 @@ def test_grid_getitem_error(grid: Grid):
 def test_grid_iter(grid: Grid):
     assert next(iter(grid))[-1].chart.left == 390
     assert next(iter(grid))[-1].chart.top == 40
+
+
+def test_grid_copies_settings(sheet: Sheet):
+    ax = Axes(left=30, top=40, width=120, height=150, sheet=sheet, has_legend=False)
+    grid = Grid(ax, 2, 2)
+    copy = grid[1, 1]
+    assert copy.chart is not ax.chart
+    assert copy.chart.width == 120
+    assert copy.chart.height == 150
+    assert copy.chart.api[1].HasLegend is False
+    assert copy.series_collection == []
+
+
+def test_grid_copies_with_series(sheet: Sheet):
+    ax = Axes(left=30, top=40, sheet=sheet)
+    ax.add_series([1, 2, 3], [4, 5, 6])
+    grid = Grid(ax, 1, 2)
+    assert grid[0, 1].chart.api[1].SeriesCollection().Count == 0
+    assert grid[0, 1].chart.left == ax.chart.left + ax.chart.width
@@ -104,3 +104,13 @@ def test_plot_multi_index(ax: Axes, sf: SheetFrame):
     s = p.series_collection[3]
     assert s.label == "t,200"
     assert s.api.MarkerStyle == MarkerStyle.xlMarkerStyleTriangle
+
+
+def test_plot_set_skips(ax: Axes, sf: SheetFrame):
+    data = sf.groupby("b").agg(include_sheetname=True)
+    p = Plot(ax, data).add("x", "y", ChartType.xlXYScatterLines)
+    p.set(marker="o", color="red", alpha=0.5)
+    writes = p.writes
+    p.set(marker="o", color="red", alpha=0.5)
+    assert p.writes == writes
+    assert p.skips > 0
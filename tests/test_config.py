@@ -30,3 +30,62 @@ def test_rcparams_get():
 
 def test_rcparams_get_default():
     assert rcParams.get("invalid", "default") == "default"
+
+
+def test_rcparams_section():
+    assert rcParams["chart.title"] == {"font": {"size": 9, "bold": True}}
+
+
+def test_rcparams_version():
+    version = rcParams.version
+    rcParams["chart.width"] = 200
+    assert rcParams.version == version + 1
+
+
+def test_rcparams_section_in_place():
+    version = rcParams.version
+    rcParams.params["chart"]["width"] = 100
+    assert rcParams.version == version + 1
+    assert rcParams["chart.width"] == 100
+
+    rcParams["chart"]["width"] = 200
+    assert rcParams.version == version + 2
+    assert rcParams["chart.width"] == 200
+
+
+def test_snapshot():
+    s = rcParams.snapshot()
+    assert s is rcParams.snapshot()
+    assert s["chart"]["width"] == 200
+    assert s["frame"]["wide-columns"]["border"]["weight"] == 2
+    assert s["frame.wide-columns.border.weight"] == 2
+    assert s["stats"].get("count.italic") is None
+    assert "title" in s["chart"]
+
+
+def test_snapshot_mapping_methods():
+    s = rcParams.snapshot()
+    assert callable(s.values)
+    assert set(s.keys()) == set(rcParams.params)
+
+
+def test_snapshot_version():
+    s = rcParams.snapshot()
+    rcParams["chart.width"] = 100
+    assert s["chart.width"] == 200
+    assert rcParams.snapshot()["chart.width"] == 100
+    rcParams["chart.width"] = 200
+
+
+def test_snapshot_in_place():
+    s = rcParams.snapshot()
+    rcParams["chart"]["width"] = 100
+    assert s["chart.width"] == 200
+    assert rcParams.snapshot()["chart.width"] == 100
+    rcParams["chart"]["width"] = 200
+
+
+def test_snapshot_frozen():
+    s = rcParams.snapshot()
+    with pytest.raises(AttributeError, match="Snapshot is frozen"):
+        s.chart = None
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from xlviews.core.range import Range
+from xlviews.format_rules import count_rules, get_rule_set
+from xlviews.style import (
+    delete_color_scale,
+    hide_unique,
+    set_banding,
+    set_color_scale,
+)
+from xlviews.testing import is_app_available
+
+if TYPE_CHECKING:
+    from xlwings import Sheet
+
+pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
+
+
+def test_banding_merged(sheet: Sheet):
+    for column in [2, 6, 10]:
+        set_banding(Range((3, column), (10, column + 2), sheet))
+
+    assert count_rules(sheet) == 2
+    rules = get_rule_set(sheet)
+    assert len(rules) == 2
+    assert rules.added == 1
+    assert rules.merged == 2
+
+    applies_to = sheet["B3"].api.FormatConditions(1).AppliesTo.Address
+    assert applies_to == "$B$3:$D$10,$F$3:$H$10,$J$3:$L$10"
+
+
+def test_banding_merged_many(sheet: Sheet):
+    for row in range(3, 63, 3):
+        set_banding(Range((row, 2), (row + 1, 4), sheet))
+
+    rules = get_rule_set(sheet)
+    assert rules.merged == 19
+    assert count_rules(sheet) == 2
+
+    applies_to = sheet["B3"].api.FormatConditions(1).AppliesTo
+    assert applies_to.Areas.Count == 20
+    assert applies_to.Address.endswith("$B$60:$D$61")
+
+
+def test_banding_axis(sheet: Sheet):
+    set_banding(Range((3, 2), (10, 4), sheet))
+    set_banding(Range((3, 6), (10, 8), sheet), axis=1)
+    assert count_rules(sheet) == 4
+
+
+def test_banding_same_range(sheet: Sheet):
+    set_banding(Range((3, 2), (10, 4), sheet))
+    set_banding(Range((3, 2), (10, 4), sheet))
+    assert count_rules(sheet) == 2
+
+
+def test_color_scale_merged(sheet: Sheet):
+    vmin, vmax = Range((1, 1), sheet=sheet), Range((2, 1), sheet=sheet)
+    set_color_scale(Range((3, 2), (5, 4), sheet), vmin, vmax)
+    set_color_scale(Range((3, 6), (5, 8), sheet), vmin, vmax)
+    set_color_scale(Range((3, 10), (5, 12), sheet), 0, 10)
+    assert count_rules(sheet) == 2
+
+
+def test_color_scale_relative(sheet: Sheet):
+    set_color_scale(Range((3, 2), (5, 4), sheet), "A1", "A2")
+    set_color_scale(Range((3, 6), (5, 8), sheet), "A1", "A2")
+    assert count_rules(sheet) == 2
+    assert len(get_rule_set(sheet)) == 0
+
+
+def test_hide_unique_not_merged(sheet: Sheet):
+    hide_unique(Range((3, 2), sheet=sheet), 4)
+    hide_unique(Range((3, 6), sheet=sheet), 4)
+    assert count_rules(sheet) == 2
+
+
+def test_delete_color_scale(sheet: Sheet):
+    set_color_scale(Range((3, 2), (5, 4), sheet), 0, 10)
+    set_banding(Range((3, 2), (5, 4), sheet))
+    delete_color_scale(Range((3, 2), (5, 4), sheet))
+    assert count_rules(sheet) == 2
+
+
+def test_delete_color_scale_shared(sheet: Sheet):
+    set_color_scale(Range((3, 2), (5, 4), sheet), 0, 10)
+    set_color_scale(Range((3, 6), (5, 8), sheet), 0, 10)
+    delete_color_scale(Range((3, 2), (5, 4), sheet))
+
+    assert count_rules(sheet) == 1
+    assert sheet["B3"].api.FormatConditions.Count == 0
+    applies_to = sheet["F3"].api.FormatConditions(1).AppliesTo.Address
+    assert applies_to == "$F$3:$H$5"
+    assert len(get_rule_set(sheet)) == 0
+
+
+def test_delete_color_scale_part(sheet: Sheet):
+    set_color_scale(Range((3, 2), (5, 4), sheet), 0, 10)
+    delete_color_scale(Range((4, 3), sheet=sheet))
+
+    assert count_rules(sheet) == 1
+    applies_to = sheet["B3"].api.FormatConditions(1).AppliesTo.Address
+    assert applies_to == "$B$3:$D$3,$B$5:$D$5,$B$4,$D$4"
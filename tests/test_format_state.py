@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import pytest
+
+from xlviews.core.range import Range
+from xlviews.core.range_collection import RangeCollection
+from xlviews.format_state import (
+    BUCKET_SIZE,
+    MAX_RECTS,
+    FormatState,
+    RectIndex,
+    clear_format_state,
+    get_format_state,
+    needs_write,
+    sheet_key,
+)
+
+
+@dataclass
+class Book:
+    name: str = "Book1"
+
+    @property
+    def fullname(self) -> str:
+        return self.name
+
+
+@dataclass
+class Sheet:
+    name: str
+    book: Book = field(default_factory=Book)
+    CodeName: str = "Sheet1"
+
+    @property
+    def api(self) -> Sheet:
+        return self
+
+
+@pytest.fixture
+def sheet():
+    yield Sheet("Sheet1")
+    clear_format_state()
+
+
+def test_get_contained():
+    state = FormatState()
+    state.update("fill", [(2, 2, 10, 5)], 255)
+    assert state.get("fill", (3, 3, 4, 4)) == 255
+    assert state.get("fill", (3, 3, 11, 4)) is None
+    assert state.get("font.bold", (3, 3, 4, 4)) is None
+
+
+def test_update_skip():
+    state = FormatState()
+    assert state.update("fill", [(2, 2, 3, 3), (5, 2, 6, 3)], 255)
+    assert not state.update("fill", [(2, 2, 3, 3), (5, 2, 5, 3)], 255)
+    assert state.update("fill", [(2, 2, 3, 3), (4, 2, 5, 3)], 255)
+    assert repr(state) == "<FormatState writes=2 skips=1>"
+
+
+def test_update_overlap():
+    state = FormatState()
+    state.update("fill", [(2, 2, 5, 5)], 255)
+    state.update("fill", [(5, 5, 6, 6)], 0)
+    assert list(state) == [("fill", (5, 5, 6, 6), 0)]
+
+
+def test_linked_style():
+    state = FormatState()
+    state.update("fill", [(2, 2, 5, 5)], 255)
+    state.update("font.bold", [(2, 2, 5, 5)], value=True)
+    state.update("number_format", [(2, 2, 5, 5)], "0.0")
+    state.update("style", [(3, 3, 3, 3)], "xlviews.values")
+    assert len(state) == 2
+    state.update("fill", [(3, 3, 3, 3)], 0)
+    assert state.get("style", (3, 3, 3, 3)) is None
+
+
+def test_needs_write_range(sheet: Sheet):
+    rng = Range((2, 2), (4, 4), sheet=sheet)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+    assert not needs_write(rng, "fill", 255)
+    assert needs_write(rng, "fill", 0)
+
+    state = get_format_state(sheet)  # pyright: ignore[reportArgumentType]
+    assert state.get("fill", (3, 3, 3, 3)) == 0
+
+
+def test_needs_write_range_collection(sheet: Sheet):
+    rc = RangeCollection([(2, 3), (6, 8)], 4, sheet)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rc, "number_format", "0%")
+    assert not needs_write(Range((7, 4), sheet=sheet), "number_format", "0%")  # pyright: ignore[reportArgumentType]
+
+
+def test_needs_write_other_sheet_object(sheet: Sheet):
+    rng = Range((2, 2), (4, 4), sheet=sheet)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+    rng = Range((2, 2), (4, 4), sheet=Sheet("Sheet1"))  # pyright: ignore[reportArgumentType]
+    assert not needs_write(rng, "fill", 255)
+    rng = Range((2, 2), (4, 4), sheet=Sheet("Sheet2"))  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+
+
+def test_needs_write_new_sheet_of_same_name(sheet: Sheet):
+    rng = Range((2, 2), (4, 4), sheet=sheet)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+    new = Sheet("Sheet1", CodeName="Sheet4")
+    assert sheet_key(new) != sheet_key(sheet)  # pyright: ignore[reportArgumentType]
+    rng = Range((2, 2), (4, 4), sheet=new)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+
+
+def test_needs_write_across_calls(sheet: Sheet):
+    rng = Range((2, 2), (4, 4), sheet=sheet)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+    state = get_format_state(sheet)  # pyright: ignore[reportArgumentType]
+    assert not needs_write(Range((3, 3), sheet=sheet), "fill", 255)  # pyright: ignore[reportArgumentType]
+    assert (state.writes, state.skips) == (1, 1)
+
+
+def test_needs_write_unknown_range(sheet: Sheet):
+    rng = Range((2, 2), (4, 4), sheet=sheet)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+    assert needs_write("B2:D4", "fill", 255)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+
+
+def test_clear_format_state(sheet: Sheet):
+    rng = Range((2, 2), (4, 4), sheet=sheet)  # pyright: ignore[reportArgumentType]
+    needs_write(rng, "fill", 255)
+    clear_format_state(sheet)  # pyright: ignore[reportArgumentType]
+    assert needs_write(rng, "fill", 255)
+
+
+def test_update_many_cells():
+    state = FormatState()
+    rects = [(r, c, r, c) for r in range(200) for c in range(100)]
+
+    for value in range(2):
+        for i in range(0, len(rects), 100):
+            state.update("fill", rects[i : i + 100], value)
+
+    assert len(state) == len(rects)
+    assert (state.writes, state.skips) == (400, 0)
+
+
+def test_rect_index_candidates():
+    index = RectIndex()
+    for r in range(200):
+        for c in range(100):
+            index.add((r, c, r, c), 0)
+
+    assert len(index.candidates((50, 50, 50, 50))) <= BUCKET_SIZE**2
+
+
+def test_update_large_is_not_recorded():
+    state = FormatState()
+    rects = [(r, 1, r, 1) for r in range(MAX_RECTS + 1)]
+    assert state.update("fill", rects, 255)
+    assert state.update("fill", rects, 255)
+    assert len(state) == 0
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pandas import DataFrame
+
+from xlviews.colors import rgb
+from xlviews.config import rcParams
+from xlviews.core.range import Range
+from xlviews.dataframes.sheet_frame import SheetFrame
+from xlviews.dataframes.style import set_frame_style
+from xlviews.style_plan import StylePlan
+from xlviews.testing import is_app_available
+
+if TYPE_CHECKING:
+    from xlwings import Sheet
+
+pytestmark = pytest.mark.skipif(not is_app_available(), reason="Excel not installed")
+
+
+def test_fill(sheet: Sheet):
+    plan = StylePlan()
+    plan.fill(Range((2, 2), (3, 3), sheet), "red")
+    plan.fill(Range((6, 2), (7, 3), sheet), "red")
+    plan.fill(Range((2, 6), (3, 7), sheet), "blue")
+    assert len(plan) == 2
+    assert repr(plan) == "<StylePlan groups=2 ranges=3>"
+
+    plan.apply()
+    assert len(plan) == 0
+    assert sheet["C7"].api.Interior.Color == rgb("red")
+    assert sheet["G3"].api.Interior.Color == rgb("blue")
+
+
+def test_font(sheet: Sheet):
+    plan = StylePlan()
+    plan.font(sheet["B2:C3"], size=20, bold=True, color="red")
+    plan.font(sheet["E5"], size=20, bold=True, color="red")
+    assert len(plan) == 1
+
+    plan.apply()
+    for cell in ["C3", "E5"]:
+        font = sheet[cell].api.Font
+        assert font.Name == rcParams["frame.font.name"]
+        assert font.Size == 20
+        assert font.Bold == 1
+        assert font.Color == rgb("red")
+
+
+def test_border_shared_edge(sheet: Sheet):
+    plan = StylePlan()
+    plan.border(Range((3, 3), (5, 4), sheet), inside_weight=0, edge_color="red")
+    plan.border(Range((3, 5), (5, 6), sheet), inside_weight=0, edge_color="red")
+    assert len(plan) == 2
+
+    plan.apply()
+    assert sheet["B3:C5"].api.Borders(11).Weight == 2
+    assert sheet["D3:E5"].api.Borders(11).Weight == 2
+    assert sheet["F3:G5"].api.Borders(11).Color == rgb("red")
+    assert sheet["C5:F6"].api.Borders(12).Weight == 2
+
+
+def test_layer(sheet: Sheet):
+    plan = StylePlan()
+    plan.border(Range((3, 3), (5, 5), sheet), edge_weight=4, inside_weight=0, layer=1)
+    plan.border(Range((3, 3), (5, 5), sheet), edge_weight=2, inside_weight=1)
+    plan.apply()
+    assert sheet["B3:C5"].api.Borders(11).Weight == 4
+    assert sheet["C3:E5"].api.Borders(11).Weight == 1
+
+
+def test_invalid_key(sheet: Sheet):
+    plan = StylePlan()
+    plan.add(("unknown",), Range((2, 2), sheet=sheet))
+    with pytest.raises(ValueError, match="Invalid style key"):
+        plan.apply()
+
+
+def test_set_frame_style_shared_plan(sheet: Sheet):
+    df = DataFrame({"a": [1, 2, 3, 4], "b": [5, 6, 7, 8]})
+    sfs = [SheetFrame(2, c, data=df, sheet=sheet) for c in [2, 7, 12]]
+
+    plan = StylePlan()
+    set_frame_style(sfs[0], plan=plan)
+    n = len(plan)
+
+    for sf in sfs[1:]:
+        set_frame_style(sf, plan=plan)
+
+    assert len(plan) == n
+    plan.apply()
+
+    for cell in ["C2", "H2", "M2"]:
+        c = rgb(rcParams["frame.columns.fill.color"])
+        assert sheet[cell].api.Interior.Color == c
+
+    for cell in ["B6", "G6", "L6"]:
+        c = rgb(rcParams["frame.index.fill.color"])
+        assert sheet[cell].api.Interior.Color == c